@@ -0,0 +1,175 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+from auth import get_current_user
+from fastapi import Depends, HTTPException, status
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTIONS
+from settings import (
+    ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ADMISSION_RETRY_AFTER_SECONDS,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+)
+
+
+class TokenBucket:
+    """Até ``burst`` requisições de uma vez, repostas a ``rate`` por segundo."""
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Consome um token; sem token, retorna os segundos até o próximo."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Um token bucket por API key, criado no primeiro uso da chave."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._buckets: Dict[int, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key_id: int, rate: float, burst: int) -> float:
+        """Retorna 0 se a requisição pode seguir ou a espera em segundos."""
+        if rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = self.clock()
+            bucket = self._buckets.get(key_id)
+            if bucket is None or (bucket.rate, bucket.burst) != (rate, max(burst, 1)):
+                # Limites alterados na tabela: recria o bucket sem ganhar tokens
+                tokens = bucket.tokens if bucket else None
+                bucket = TokenBucket(rate, burst, now)
+                if tokens is not None:
+                    bucket.tokens = min(tokens, bucket.burst)
+                self._buckets[key_id] = bucket
+            return bucket.take(now)
+
+
+def _grant(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ConcurrencyLimiter:
+    """Limita as requisições atendidas ao mesmo tempo à capacidade do pool.
+
+    Sem vaga, a requisição espera até ``timeout`` segundos no event loop (sem
+    prender uma thread do threadpool); assim o excesso é recusado logo em vez
+    de esperar na fila do pool. Uma vaga liberada passa direto para a
+    requisição que espera há mais tempo.
+    """
+
+    def __init__(self, capacity: int, timeout: float):
+        self.capacity = capacity
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight < self.capacity:
+                self.in_flight += 1
+                return True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        except BaseException:
+            if self._withdraw(waiter):
+                self.release()
+            raise
+        return self._withdraw(waiter)
+
+    def _withdraw(self, waiter: asyncio.Future) -> bool:
+        """Sai da fila; True se a vaga já tinha sido passada a ``waiter``."""
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                return False
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.get_loop().call_soon_threadsafe(_grant, waiter)
+                    return
+                except RuntimeError:
+                    # Event loop já encerrado: a vaga vai para o próximo
+                    continue
+            self.in_flight -= 1
+
+
+rate_limiter = RateLimiter()
+concurrency_limiter = ConcurrencyLimiter(
+    ADMISSION_MAX_CONCURRENCY or DB_POOL_SIZE + DB_MAX_OVERFLOW,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
+ADMISSION_IN_FLIGHT.set_function(lambda: [((), concurrency_limiter.in_flight)])
+
+
+def rate_limit(current_user: dict = Depends(get_current_user)) -> dict:
+    """Aplica o limite de requisições da API key (429)."""
+    retry_after = rate_limiter.acquire(
+        current_user["api_key_id"],
+        current_user["rate_limit_per_second"],
+        current_user["rate_limit_burst"],
+    )
+    if retry_after:
+        ADMISSION_REJECTIONS.inc(reason="rate_limit")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Limite de requisições da API key excedido",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+    return current_user
+
+
+async def concurrency_slot():
+    """Reserva uma vaga do limite de concorrência global (503)."""
+    if not await concurrency_limiter.acquire():
+        ADMISSION_REJECTIONS.inc(reason="overload")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor sobrecarregado, tente novamente",
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    try:
+        yield
+    finally:
+        concurrency_limiter.release()
+
+
+async def admission_control(
+    slot: None = Depends(concurrency_slot),
+    current_user: dict = Depends(rate_limit),
+) -> dict:
+    """Aplica o limite de concorrência global (503) e o da API key (429).
+
+    A vaga é reservada antes da autenticação: a consulta da API key fora do
+    cache usa uma conexão do pool, que a vaga existe para limitar.
+    """
+    return current_user
@@ -1,14 +1,22 @@
 import hashlib
-from typing import Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
 
 from db import SessionLocal
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from metrics import observe_phase
 from models.data import ApiKey, User
+from settings import AUTH_CACHE_TTL_SECONDS, RATE_LIMIT_BURST, RATE_LIMIT_PER_SECOND
 from sqlalchemy.orm import Session
 
 security = HTTPBearer()
 
+# Chaves já validadas: hash -> (expira em, usuário autenticado)
+_auth_cache: Dict[str, Tuple[float, dict]] = {}
+_auth_cache_lock = threading.Lock()
+
 
 def get_db():
     db = SessionLocal()
@@ -18,6 +26,11 @@ def get_db():
         db.close()
 
 
+def clear_auth_cache() -> None:
+    with _auth_cache_lock:
+        _auth_cache.clear()
+
+
 def verify_api_key(api_key: str, db: Session) -> Optional[ApiKey]:
 
     key_hash = hashlib.sha256(api_key.encode()).hexdigest()
@@ -34,25 +47,50 @@ def verify_api_key(api_key: str, db: Session) -> Optional[ApiKey]:
     return db_api_key
 
 
+def _authenticate(api_key: str, db: Session) -> Optional[dict]:
+    key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+    now = time.monotonic()
+    with _auth_cache_lock:
+        cached = _auth_cache.get(key_hash)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    with observe_phase("auth_lookup"):
+        db_api_key = verify_api_key(api_key, db)
+    if not db_api_key:
+        return None
+
+    rate = db_api_key.rate_limit_per_second
+    burst = db_api_key.rate_limit_burst
+    current_user = {
+        "api_key": api_key,
+        "api_key_id": db_api_key.id,
+        "user_id": db_api_key.user_id,
+        "username": db_api_key.user.username,
+        "authenticated": True,
+        "rate_limit_per_second": RATE_LIMIT_PER_SECOND if rate is None else rate,
+        "rate_limit_burst": RATE_LIMIT_BURST if burst is None else burst,
+    }
+
+    if AUTH_CACHE_TTL_SECONDS > 0:
+        with _auth_cache_lock:
+            _auth_cache[key_hash] = (now + AUTH_CACHE_TTL_SECONDS, current_user)
+
+    return current_user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ):
 
-    api_key = credentials.credentials
-    db_api_key = verify_api_key(api_key, db)
+    current_user = _authenticate(credentials.credentials, db)
 
-    if not db_api_key:
+    if not current_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="API Key inválida ou inativa",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return {
-        "api_key": api_key,
-        "api_key_id": db_api_key.id,
-        "user_id": db_api_key.user_id,
-        "username": db_api_key.user.username,
-        "authenticated": True,
-    }
+    return current_user
@@ -0,0 +1,395 @@
+"""Benchmark dos endpoints /api/v1/data/ e /api/v1/data/fields.
+
+Percorre uma matriz de tamanhos de base, tamanhos de página, projeções de
+``fields`` e profundidades de página, medindo percentis de latência e
+vazão. Por padrão roda em processo (transporte ASGI do httpx) contra o
+banco configurado em DB_*_SOURCE; com ``--base-url`` mede um servidor já
+em execução.
+
+Uso:
+    uv run python -m benchmarks.bench_api --api-key $API_KEY \\
+        --seed-days 30,365 --output results.json --baseline baseline.json
+
+``--seed-days`` popula (com models.seed_data) os dias que faltam a partir
+de ``--start-date`` antes de cada tamanho; sem ele a base atual é usada.
+Com ``--baseline`` o processo termina com código 1 se alguma métrica
+acompanhada piorar mais que ``--threshold`` em relação ao baseline ou se
+algum caso do baseline não for medido.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DATA_PATH = "/api/v1/data/"
+FIELDS_PATH = "/api/v1/data/fields"
+PAGE_DEPTHS = ("first", "middle", "last")
+RATE_LIMITED = (
+    "A API respondeu 429: a API key tem limite de requisições e o benchmark "
+    "mediria as recusas. Use uma chave sem limite "
+    "(python -m models.create_api_key <user_id> benchmark --rate-limit 0)"
+)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], wall_seconds: float) -> Dict[str, float]:
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "requests": len(latencies_ms),
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 3),
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p90_ms": round(percentile(latencies_ms, 90), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "max_ms": round(max(latencies_ms), 3),
+        "throughput_rps": round(len(latencies_ms) / wall_seconds, 2),
+    }
+
+
+def check_response(response: httpx.Response) -> None:
+    """``raise_for_status`` que encerra o benchmark ao primeiro 429."""
+    if response.status_code == 429:
+        raise SystemExit(RATE_LIMITED)
+    response.raise_for_status()
+
+
+def case_name(endpoint: str, **params: Any) -> str:
+    parts = [endpoint] + [f"{key}={value}" for key, value in params.items()]
+    return "|".join(parts)
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    path: str,
+    params: Dict[str, Any],
+    requests: int,
+    warmup: int,
+) -> Dict[str, float]:
+    for _ in range(warmup):
+        check_response(await client.get(path, params=params))
+
+    latencies = []
+    wall_start = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        latencies.append(time.perf_counter() - start)
+        check_response(response)
+    return summarize(latencies, time.perf_counter() - wall_start)
+
+
+def page_for_depth(depth: str, total_pages: int) -> int:
+    if depth == "first" or total_pages <= 1:
+        return 1
+    if depth == "middle":
+        return max(total_pages // 2, 1)
+    return total_pages
+
+
+async def run_matrix(
+    client: httpx.AsyncClient,
+    data_size: int,
+    window: Dict[str, str],
+    page_sizes: List[int],
+    projections: List[str],
+    depths: List[str],
+    requests: int,
+    warmup: int,
+) -> List[Dict[str, Any]]:
+    # O caso é identificado só pelos parâmetros da requisição; as linhas da
+    # janela entram como metadado, para comparar execuções da mesma janela
+    results = []
+    window_name = f"{window['start_ts']}..{window['end_ts']}" if window else "all"
+
+    for page_size in page_sizes:
+        for fields in projections:
+            params = {**window, "page_size": page_size}
+            if fields:
+                params["fields"] = fields
+
+            first_page = await client.get(DATA_PATH, params={**params, "page": 1})
+            check_response(first_page)
+            total_pages = first_page.json()["paging"]["total_pages"]
+
+            for depth in depths:
+                page = page_for_depth(depth, total_pages)
+                name = case_name(
+                    DATA_PATH,
+                    window=window_name,
+                    page_size=page_size,
+                    fields=fields or "all",
+                    page=depth,
+                )
+                stats = await measure(
+                    client, DATA_PATH, {**params, "page": page}, requests, warmup
+                )
+                results.append(
+                    {"case": name, "rows": data_size, "page": page, **stats}
+                )
+                print(f"{name}: p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms")
+
+    return results
+
+
+def compare_to_baseline(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    metrics: List[str],
+    threshold: float,
+) -> List[str]:
+    """Lista as métricas que pioraram mais que ``threshold`` (0.2 = 20%).
+
+    Métricas de latência pioram quando sobem; throughput_rps quando cai.
+    Casos do baseline que não foram medidos nesta execução também entram na
+    lista, para que uma mudança de parâmetros não passe como "sem regressão".
+    """
+    baseline_by_case = {entry["case"]: entry for entry in baseline}
+    measured = {entry["case"] for entry in results}
+    regressions = [
+        f"{case}: ausente nesta execução"
+        for case in baseline_by_case
+        if case not in measured
+    ]
+
+    for entry in results:
+        reference = baseline_by_case.get(entry["case"])
+        if reference is None:
+            continue
+
+        for metric in metrics:
+            current, previous = entry.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+
+            if metric == "throughput_rps":
+                change = (previous - current) / previous
+            else:
+                change = (current - previous) / previous
+
+            if change > threshold:
+                regressions.append(
+                    f"{entry['case']}: {metric} {previous} -> {current} "
+                    f"({change:+.0%})"
+                )
+
+    return regressions
+
+
+def _seed(start_day: date, seeded_days: int, target_days: int, seed: int) -> None:
+    from models.seed_data import seed_data
+
+    seed_data(
+        start_day + timedelta(days=seeded_days),
+        target_days - seeded_days,
+        seed=seed,
+        replace=True,
+    )
+
+
+def _client(base_url: Optional[str], api_key: str, accept_encoding: str):
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Accept-Encoding": accept_encoding,
+    }
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, headers=headers, timeout=60.0)
+
+    from main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers=headers,
+        timeout=60.0,
+    )
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    page_sizes = [int(size) for size in args.page_sizes.split(",")]
+    projections = args.fields.split(";")
+    depths = args.depths.split(",")
+    sizes = [int(days) for days in args.seed_days.split(",")] if args.seed_days else []
+
+    results = []
+    seeded_days = 0
+    async with _client(args.base_url, args.api_key, args.accept_encoding) as client:
+        # /fields não depende da base: medido uma vez por execução
+        name = case_name(FIELDS_PATH)
+        stats = await measure(client, FIELDS_PATH, {}, args.requests, args.warmup)
+        results.append({"case": name, **stats})
+        print(f"{name}: p50 {stats['p50_ms']} ms")
+
+        for days in sizes or [None]:
+            if days is not None:
+                _seed(args.start_date, seeded_days, days, args.seed)
+                seeded_days = days
+                window = {
+                    "start_ts": datetime.combine(
+                        args.start_date, datetime.min.time()
+                    ).isoformat(),
+                    "end_ts": datetime.combine(
+                        args.start_date + timedelta(days=days), datetime.min.time()
+                    ).isoformat(),
+                }
+            else:
+                window = {}
+
+            probe = await client.get(DATA_PATH, params={**window, "page_size": 1})
+            check_response(probe)
+            data_size = probe.json()["paging"]["total_items"]
+            print(f"Base com {data_size} linhas na janela medida")
+
+            results.extend(
+                await run_matrix(
+                    client,
+                    data_size,
+                    window,
+                    page_sizes,
+                    projections,
+                    depths,
+                    args.requests,
+                    args.warmup,
+                )
+            )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mede latência e vazão dos endpoints de dados."
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        help="URL de um servidor em execução (padrão: app em processo via ASGI)",
+    )
+    parser.add_argument(
+        "--api-key",
+        type=str,
+        default=os.getenv("API_KEY"),
+        help="API Key sem limite de requisições usada nas medições "
+        "(padrão: variável API_KEY)",
+    )
+    parser.add_argument(
+        "--seed-days",
+        type=str,
+        help="Tamanhos da base em dias, crescentes e separados por vírgula "
+        "(ex.: 30,365). Popula o banco com models.seed_data antes de cada um",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=date.fromisoformat,
+        default=date(2020, 1, 1),
+        help="Primeiro dia da base sintética (padrão: 2020-01-01)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Semente do gerador (padrão: 42)"
+    )
+    parser.add_argument(
+        "--page-sizes",
+        type=str,
+        default="25,100,1000",
+        help="Tamanhos de página separados por vírgula (padrão: 25,100,1000)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default=";wind_speed;wind_speed,power,ambient_temperature",
+        help="Projeções separadas por ';' (vazio = todos os campos)",
+    )
+    parser.add_argument(
+        "--depths",
+        type=str,
+        default=",".join(PAGE_DEPTHS),
+        help="Profundidades de página: first, middle, last (padrão: todas)",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Requisições por caso (padrão: 50)"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=5, help="Aquecimento por caso (padrão: 5)"
+    )
+    parser.add_argument(
+        "--accept-encoding",
+        type=str,
+        default="identity",
+        help="Accept-Encoding enviado (padrão: identity, sem compressão)",
+    )
+    parser.add_argument(
+        "--output", type=str, help="Arquivo JSON para gravar os resultados"
+    )
+    parser.add_argument(
+        "--baseline", type=str, help="Resultados anteriores (JSON) para comparação"
+    )
+    parser.add_argument(
+        "--metrics",
+        type=str,
+        default="p50_ms,p99_ms,throughput_rps",
+        help="Métricas comparadas com o baseline "
+        "(padrão: p50_ms,p99_ms,throughput_rps)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Piora máxima tolerada em relação ao baseline (padrão: 0.2 = 20%%)",
+    )
+
+    args = parser.parse_args()
+    if not args.api_key:
+        parser.error("Informe --api-key ou defina API_KEY")
+
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "mode": "http" if args.base_url else "asgi",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "accept_encoding": args.accept_encoding,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+        regressions = compare_to_baseline(
+            results, baseline, args.metrics.split(","), args.threshold
+        )
+        baseline_by_case = {entry["case"]: entry for entry in baseline}
+        for entry in results:
+            reference = baseline_by_case.get(entry["case"])
+            if reference is None:
+                print(f"Aviso: {entry['case']} não está no baseline")
+            elif reference.get("rows") != entry.get("rows"):
+                print(
+                    f"Aviso: {entry['case']} mediu {entry.get('rows')} linhas, "
+                    f"o baseline {reference.get('rows')}"
+                )
+        if regressions:
+            print("Regressões em relação ao baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline")
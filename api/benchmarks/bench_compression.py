@@ -0,0 +1,144 @@
+"""Benchmark de compressão das páginas de /api/v1/data/.
+
+Mede, para cada tamanho de página e codificação disponível, os bytes
+transferidos e o custo de CPU para comprimir (API) e descomprimir (ETL).
+
+Uso:
+    uv run python -m benchmarks.bench_compression --page-sizes 25,100,1000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from dtos.data import DataResponseSchema, DataSchema, PagingSchema
+from response_compression import (
+    available_encodings,
+    brotli,
+    compress_body,
+    zstandard,
+)
+
+
+def build_page(page_size: int, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    wind_speed = 8.0
+
+    rows = []
+    for i in range(page_size):
+        wind_speed = max(0.0, wind_speed + rng.gauss(0, 0.3))
+        rows.append(
+            DataSchema(
+                ts=start - timedelta(minutes=i),
+                wind_speed=round(wind_speed, 3),
+                power=round(min(2000.0, 1.5 * wind_speed**3), 3),
+                ambient_temperature=round(20 + rng.gauss(0, 0.5), 3),
+            )
+        )
+
+    page = DataResponseSchema(
+        data=rows,
+        paging=PagingSchema(
+            page=1,
+            total_pages=10,
+            items_per_page=page_size,
+            total_items=page_size * 10,
+            has_next=True,
+        ),
+    )
+    return page.model_dump_json(exclude_none=True).encode()
+
+
+def _decompressor(encoding: str) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        return gzip.decompress
+    if encoding == "br":
+        return brotli.decompress
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompress
+    raise ValueError(f"Codificação não suportada: {encoding}")
+
+
+def _cpu_ms(func: Callable[[], object], repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        func()
+    return (time.process_time() - start) * 1000 / repeat
+
+
+def run(page_sizes: List[int], repeat: int) -> List[Dict]:
+    results = []
+    for page_size in page_sizes:
+        body = build_page(page_size)
+        results.append(
+            {
+                "page_size": page_size,
+                "encoding": "identity",
+                "bytes": len(body),
+                "ratio": 1.0,
+                "compress_cpu_ms": 0.0,
+                "decompress_cpu_ms": 0.0,
+            }
+        )
+
+        for encoding in available_encodings():
+            compressed = compress_body(body, encoding)
+            decompress = _decompressor(encoding)
+            results.append(
+                {
+                    "page_size": page_size,
+                    "encoding": encoding,
+                    "bytes": len(compressed),
+                    "ratio": round(len(body) / len(compressed), 2),
+                    "compress_cpu_ms": round(
+                        _cpu_ms(lambda: compress_body(body, encoding), repeat), 4
+                    ),
+                    "decompress_cpu_ms": round(
+                        _cpu_ms(lambda: decompress(compressed), repeat), 4
+                    ),
+                }
+            )
+    return results
+
+
+def print_table(results: List[Dict]) -> None:
+    header = f"{'page_size':>9} {'encoding':>9} {'bytes':>10} {'ratio':>7} {'comp ms':>9} {'decomp ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['page_size']:>9} {r['encoding']:>9} {r['bytes']:>10} {r['ratio']:>7} "
+            f"{r['compress_cpu_ms']:>9} {r['decompress_cpu_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mede bytes e CPU da compressão das páginas de dados."
+    )
+    parser.add_argument(
+        "--page-sizes",
+        type=str,
+        default="25,100,500,1000",
+        help="Tamanhos de página separados por vírgula (padrão: 25,100,500,1000)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=50, help="Repetições por medição (padrão: 50)"
+    )
+    parser.add_argument(
+        "--output", type=str, help="Arquivo JSON para gravar os resultados"
+    )
+
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.page_sizes.split(",")], args.repeat)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
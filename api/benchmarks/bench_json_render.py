@@ -0,0 +1,148 @@
+"""Benchmark da serialização das páginas de /api/v1/data/.
+
+Compara, para cada tamanho de página e projeção de ``fields``, o caminho
+atual (linhas como objetos Python, ``to_dto`` e ``model_dump_json``) com o
+JSON montado pelo PostgreSQL (``DataService.get_data_page_json``). Mede a
+latência (parede) e a CPU do processo da API, que é o que a renderização no
+banco economiza, e confere se os dois corpos têm o mesmo conteúdo. Roda em
+processo contra o banco configurado em DB_*_SOURCE, que precisa ser
+PostgreSQL.
+
+Uso:
+    uv run python -m benchmarks.bench_json_render --page-sizes 100,1000 \\
+        --fields "all;power;wind_speed,power" --output results.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from db import SessionLocal
+from services import DataService
+
+
+def _normalize(body: bytes) -> dict:
+    # O PostgreSQL e o pydantic formatam frações de segundo de forma diferente
+    page = json.loads(body)
+    for row in page["data"]:
+        row["ts"] = datetime.fromisoformat(row["ts"])
+    return page
+
+
+def _measure(render: Callable[[], bytes], repeat: int) -> Dict[str, float]:
+    wall_ms = []
+    cpu_ms = []
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        render()
+        cpu_ms.append((time.process_time() - cpu_start) * 1000)
+        wall_ms.append((time.perf_counter() - wall_start) * 1000)
+    return {
+        "wall_p50_ms": round(statistics.median(wall_ms), 3),
+        "wall_mean_ms": round(statistics.fmean(wall_ms), 3),
+        "cpu_mean_ms": round(statistics.fmean(cpu_ms), 3),
+    }
+
+
+def run(page_sizes: List[int], fields_options: List[Optional[str]], repeat: int):
+    session = SessionLocal()
+    try:
+        service = DataService(session)
+        if service._dialect != "postgresql":
+            raise SystemExit("O benchmark requer PostgreSQL em DB_*_SOURCE")
+
+        results = []
+        for page_size in page_sizes:
+            for fields in fields_options:
+
+                def python_render() -> bytes:
+                    page = service.get_data_with_pagination(
+                        fields=fields, page_size=page_size
+                    )
+                    return page.model_dump_json(exclude_none=True).encode()
+
+                def database_render() -> bytes:
+                    return service.get_data_page_json(
+                        fields=fields, page_size=page_size
+                    )[0]
+
+                python_body = python_render()
+                database_body = database_render()
+                if _normalize(python_body) != _normalize(database_body):
+                    raise SystemExit(
+                        f"Corpos diferentes (page_size={page_size}, fields={fields})"
+                    )
+
+                for renderer, render, body in (
+                    ("python", python_render, python_body),
+                    ("database", database_render, database_body),
+                ):
+                    results.append(
+                        {
+                            "page_size": page_size,
+                            "fields": fields or "all",
+                            "renderer": renderer,
+                            "bytes": len(body),
+                            **_measure(render, repeat),
+                        }
+                    )
+        return results
+    finally:
+        session.close()
+
+
+def print_table(results: List[Dict]) -> None:
+    header = (
+        f"{'page_size':>9} {'fields':>16} {'renderer':>9} {'bytes':>9} "
+        f"{'p50 ms':>9} {'mean ms':>9} {'cpu ms':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['page_size']:>9} {r['fields']:>16} {r['renderer']:>9} "
+            f"{r['bytes']:>9} {r['wall_p50_ms']:>9} {r['wall_mean_ms']:>9} "
+            f"{r['cpu_mean_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara a serialização das páginas em Python e no PostgreSQL."
+    )
+    parser.add_argument(
+        "--page-sizes",
+        type=str,
+        default="25,100,1000",
+        help="Tamanhos de página separados por vírgula (padrão: 25,100,1000)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="all;power",
+        help="Projeções de fields separadas por ponto e vírgula; 'all' para "
+        "todos os campos (padrão: all;power)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=30, help="Repetições por medição (padrão: 30)"
+    )
+    parser.add_argument(
+        "--output", type=str, help="Arquivo JSON para gravar os resultados"
+    )
+
+    args = parser.parse_args()
+
+    results = run(
+        [int(size) for size in args.page_sizes.split(",")],
+        [None if fields == "all" else fields for fields in args.fields.split(";")],
+        args.repeat,
+    )
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,571 @@
+"""Teste de carga da API com mix realista de requisições autenticadas.
+
+As requisições chegam em taxa fixa (processo de Poisson) em degraus de
+RPS crescentes; em paralelo, ``--crawlers`` usuários fechados simulam o
+ETL paginando janelas inteiras. Para cada degrau são reportados vazão
+obtida, percentis de latência por tipo de requisição, taxa de erro e a
+pressão no pool de conexões (lida do /metrics antes e depois do degrau,
+que requer METRICS_ENABLED=true no servidor).
+O ponto de saturação é o primeiro degrau em que a vazão fica abaixo de
+95% do alvo, o p99 passa do ``--slo-ms`` ou a taxa de erro passa de 1%.
+
+Uso:
+    uv run python -m benchmarks.load_test --base-url http://localhost:8000 \\
+        --api-key $API_KEY --rps 10,25,50,100 --crawlers 2 \\
+        --label uvicorn-1-worker --output uvicorn-1.json
+
+    uv run python -m benchmarks.load_test --compare uvicorn-1.json gunicorn-4.json
+
+A API key precisa estar sem limite de requisições (``rate_limit = 0``):
+ao primeiro 429 o teste é interrompido, já que mediria as recusas do
+limite da chave e não a capacidade do servidor.
+
+Rode um servidor por configuração (workers, tamanho do pool, compressão)
+e compare os JSONs com ``--compare``.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+DATA_PATH = "/api/v1/data/"
+FIELDS_PATH = "/api/v1/data/fields"
+AVAILABILITY_PATH = "/api/v1/data/availability"
+METRICS_PATH = "/metrics"
+CRAWLER = "crawler"
+RATE_LIMITED = (
+    "A API respondeu 429: a API key tem limite de requisições e o teste "
+    "mediria as recusas. Use uma chave sem limite "
+    "(python -m models.create_api_key <user_id> load-test --rate-limit 0)"
+)
+
+FIELD_CHOICES = [
+    None,
+    "wind_speed",
+    "power",
+    "wind_speed,power",
+    "wind_speed,power,ambient_temperature",
+]
+
+# Pesos de cada tipo de requisição por mix
+MIXES: Dict[str, Dict[str, float]] = {
+    "default": {
+        "recent": 0.45,
+        "historical": 0.30,
+        "deep_page": 0.10,
+        "fields": 0.10,
+        "availability": 0.05,
+    },
+    "dashboard": {"recent": 0.80, "fields": 0.15, "availability": 0.05},
+    "historical": {"historical": 0.60, "deep_page": 0.40},
+}
+
+POOL_METRIC = re.compile(
+    r"^(db_pool_checkout_wait_seconds_(?:sum|count)"
+    r'|db_pool_connections\{state="(?:size|checked_out|overflow|max_overflow)"\})'
+    r"\s+(\S+)$",
+    re.MULTILINE,
+)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass
+class StageStats:
+    target_rps: float
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    dropped: int = 0
+    completed: int = 0
+    crawler_completed: int = 0
+    crawler_errors: int = 0
+    pool_checked_out: List[float] = field(default_factory=list)
+
+    def record(self, kind: str, seconds: float, status: str) -> None:
+        self.latencies.setdefault(kind, []).append(seconds * 1000)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        failed = not status.startswith("2") and status != "304"
+
+        # Os crawlers são fechados: entram nos percentis por tipo, mas não na
+        # vazão e na taxa de erro do tráfego em taxa fixa
+        if kind == CRAWLER:
+            self.crawler_completed += 1
+            self.crawler_errors += failed
+        else:
+            self.completed += 1
+            self.errors += failed
+
+
+class Workload:
+    """Gera os parâmetros das requisições a partir da janela disponível."""
+
+    def __init__(
+        self,
+        min_ts: datetime,
+        max_ts: datetime,
+        mix: Dict[str, float],
+        rng: random.Random,
+    ):
+        self.min_ts = min_ts
+        self.max_ts = max_ts
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.rng = rng
+
+    def random_day(self) -> Tuple[datetime, datetime]:
+        span_days = max((self.max_ts - self.min_ts).days, 1)
+        start = self.min_ts + timedelta(days=self.rng.randrange(span_days))
+        return start, start + timedelta(days=1)
+
+    def next_request(self) -> Tuple[str, str, Dict[str, Any]]:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        fields = self.rng.choice(FIELD_CHOICES)
+        params: Dict[str, Any] = {"fields": fields} if fields else {}
+
+        if kind == "fields":
+            return kind, FIELDS_PATH, {}
+        if kind == "availability":
+            return kind, AVAILABILITY_PATH, {"granularity": "day"}
+
+        if kind == "recent":
+            params.update(
+                start_ts=(self.max_ts - timedelta(hours=6)).isoformat(),
+                end_ts=self.max_ts.isoformat(),
+                page_size=self.rng.choice((25, 100)),
+            )
+        else:
+            start, end = self.random_day()
+            params.update(
+                start_ts=start.isoformat(),
+                end_ts=end.isoformat(),
+                page_size=self.rng.choice((25, 100, 1000)),
+            )
+            if kind == "deep_page":
+                # Um dia tem 1440 linhas: páginas do fim da janela
+                params["page"] = max(1440 // params["page_size"] - 1, 1)
+        return kind, DATA_PATH, params
+
+
+async def scrape_pool(client: httpx.AsyncClient) -> Dict[str, float]:
+    try:
+        response = await client.get(METRICS_PATH)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return {}
+    return {name: float(value) for name, value in POOL_METRIC.findall(response.text)}
+
+
+async def _timed_request(
+    client: httpx.AsyncClient,
+    stats: StageStats,
+    kind: str,
+    path: str,
+    params: Dict[str, Any],
+) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    try:
+        response = await client.get(path, params=params)
+        stats.record(kind, time.perf_counter() - start, str(response.status_code))
+        return response
+    except httpx.HTTPError as e:
+        stats.record(kind, time.perf_counter() - start, type(e).__name__)
+        return None
+
+
+async def crawler(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    stats_ref: Dict[str, StageStats],
+    stop: asyncio.Event,
+) -> None:
+    """Usuário fechado que pagina um dia inteiro como o ETL faz."""
+    while not stop.is_set():
+        start, end = workload.random_day()
+        params = {
+            "start_ts": start.isoformat(),
+            "end_ts": end.isoformat(),
+            "page_size": 1000,
+            "page": 1,
+        }
+        while not stop.is_set():
+            response = await _timed_request(
+                client, stats_ref["current"], CRAWLER, DATA_PATH, params
+            )
+            if response is None or response.status_code != 200:
+                break
+            if not response.json()["paging"]["has_next"]:
+                break
+            params["page"] += 1
+
+
+async def sample_pool(
+    client: httpx.AsyncClient, stats_ref: Dict[str, StageStats], stop: asyncio.Event
+) -> None:
+    while not stop.is_set():
+        pool = await scrape_pool(client)
+        checked_out = pool.get('db_pool_connections{state="checked_out"}')
+        if checked_out is not None:
+            stats_ref["current"].pool_checked_out.append(checked_out)
+        await asyncio.sleep(0.5)
+
+
+async def run_stage(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    stats: StageStats,
+    duration: float,
+    max_in_flight: int,
+    rng: random.Random,
+) -> float:
+    in_flight: set = set()
+    started = time.perf_counter()
+    next_arrival = started
+
+    while (now := time.perf_counter()) - started < duration:
+        if "429" in stats.statuses:
+            break
+        if now < next_arrival:
+            await asyncio.sleep(next_arrival - now)
+            continue
+        next_arrival += rng.expovariate(stats.target_rps)
+
+        if len(in_flight) >= max_in_flight:
+            # O cliente não acompanha a taxa: conta como descartada
+            stats.dropped += 1
+            continue
+
+        kind, path, params = workload.next_request()
+        task = asyncio.create_task(_timed_request(client, stats, kind, path, params))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    return time.perf_counter() - started
+
+
+def summarize_stage(
+    stats: StageStats,
+    elapsed: float,
+    pool_before: Dict[str, float],
+    pool_after: Dict[str, float],
+    max_overflow: Optional[float] = None,
+) -> Dict[str, Any]:
+    all_latencies = [
+        value
+        for kind, values in stats.latencies.items()
+        if kind != CRAWLER
+        for value in values
+    ]
+
+    def _round(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
+
+    wait_count = pool_after.get("db_pool_checkout_wait_seconds_count", 0) - (
+        pool_before.get("db_pool_checkout_wait_seconds_count", 0)
+    )
+    wait_sum = pool_after.get("db_pool_checkout_wait_seconds_sum", 0) - (
+        pool_before.get("db_pool_checkout_wait_seconds_sum", 0)
+    )
+    pool_size = pool_after.get('db_pool_connections{state="size"}')
+    # O gauge "overflow" é o excedente em uso; a capacidade usa o limite
+    # configurado, lido do /metrics ou informado em --max-overflow
+    max_overflow = pool_after.get(
+        'db_pool_connections{state="max_overflow"}', max_overflow
+    )
+    max_checked_out = max(stats.pool_checked_out, default=None)
+    if not pool_size or max_overflow is None or max_checked_out is None:
+        exhausted = None
+    else:
+        exhausted = max_overflow >= 0 and max_checked_out >= pool_size + max_overflow
+
+    return {
+        "target_rps": stats.target_rps,
+        "achieved_rps": round(stats.completed / elapsed, 2),
+        "completed": stats.completed,
+        "dropped": stats.dropped,
+        "error_rate": (
+            round(stats.errors / stats.completed, 4) if stats.completed else 0
+        ),
+        "statuses": stats.statuses,
+        "crawler_requests": stats.crawler_completed,
+        "crawler_errors": stats.crawler_errors,
+        "latency_ms": {
+            "p50": _round(percentile(all_latencies, 50)),
+            "p90": _round(percentile(all_latencies, 90)),
+            "p99": _round(percentile(all_latencies, 99)),
+            "max": _round(max(all_latencies, default=None)),
+        },
+        "latency_by_kind_ms": {
+            kind: {
+                "count": len(values),
+                "p50": _round(percentile(values, 50)),
+                "p99": _round(percentile(values, 99)),
+            }
+            for kind, values in sorted(stats.latencies.items())
+        },
+        "pool": {
+            "size": pool_size,
+            "max_overflow": max_overflow,
+            "max_checked_out": max_checked_out,
+            "checkouts": int(wait_count),
+            "mean_checkout_wait_ms": (
+                round(wait_sum / wait_count * 1000, 3) if wait_count else None
+            ),
+            "exhausted": exhausted,
+        },
+    }
+
+
+def is_saturated(stage: Dict[str, Any], slo_ms: float) -> bool:
+    p99 = stage["latency_ms"]["p99"]
+    return (
+        stage["achieved_rps"] < 0.95 * stage["target_rps"]
+        or stage["error_rate"] > 0.01
+        or (p99 is not None and p99 > slo_ms)
+    )
+
+
+async def discover_window(
+    client: httpx.AsyncClient, args
+) -> Tuple[datetime, datetime]:
+    if args.start_ts and args.end_ts:
+        return args.start_ts, args.end_ts
+
+    response = await client.get(AVAILABILITY_PATH, params={"granularity": "day"})
+    response.raise_for_status()
+    body = response.json()
+    if not body["min_ts"]:
+        raise SystemExit("A API não tem dados; popule com models.seed_data")
+    return datetime.fromisoformat(body["min_ts"]), datetime.fromisoformat(
+        body["max_ts"]
+    )
+
+
+async def run(args, transport: Optional[httpx.AsyncBaseTransport] = None):
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.max_in_flight + args.crawlers + 1)
+    headers = {
+        "Authorization": f"Bearer {args.api_key}",
+        "Accept-Encoding": args.accept_encoding,
+    }
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers=headers,
+        limits=limits,
+        timeout=args.timeout,
+        transport=transport,
+    ) as client:
+        min_ts, max_ts = await discover_window(client, args)
+        workload = Workload(min_ts, max_ts, MIXES[args.mix], rng)
+        print(f"Janela: {min_ts} até {max_ts}, mix '{args.mix}'")
+
+        stages = []
+        saturation = None
+        stats_ref = {"current": StageStats(target_rps=0)}
+        stop = asyncio.Event()
+        background = [
+            asyncio.create_task(crawler(client, workload, stats_ref, stop))
+            for _ in range(args.crawlers)
+        ] + [asyncio.create_task(sample_pool(client, stats_ref, stop))]
+
+        try:
+            for target_rps in [float(rps) for rps in args.rps.split(",")]:
+                stats = StageStats(target_rps=target_rps)
+                stats_ref["current"] = stats
+                pool_before = await scrape_pool(client)
+                elapsed = await run_stage(
+                    client,
+                    workload,
+                    stats,
+                    args.stage_seconds,
+                    args.max_in_flight,
+                    rng,
+                )
+                if "429" in stats.statuses:
+                    raise SystemExit(RATE_LIMITED)
+                pool_after = await scrape_pool(client)
+
+                stage = summarize_stage(
+                    stats, elapsed, pool_before, pool_after, args.max_overflow
+                )
+                stages.append(stage)
+                print(
+                    f"{target_rps:>7.1f} rps alvo -> "
+                    f"{stage['achieved_rps']:>7.1f} rps, "
+                    f"p50 {stage['latency_ms']['p50']} ms, "
+                    f"p99 {stage['latency_ms']['p99']} ms, "
+                    f"erros {stage['error_rate']:.2%}, "
+                    f"pool {stage['pool']['max_checked_out']}/{stage['pool']['size']}"
+                )
+
+                if saturation is None and is_saturated(stage, args.slo_ms):
+                    saturation = target_rps
+                    if args.stop_at_saturation:
+                        break
+        finally:
+            stop.set()
+            await asyncio.gather(*background, return_exceptions=True)
+
+    return {
+        "label": args.label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "mix": args.mix,
+        "crawlers": args.crawlers,
+        "slo_ms": args.slo_ms,
+        "saturation_rps": saturation,
+        "stages": stages,
+    }
+
+
+def compare(paths: List[str]) -> None:
+    runs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as input_file:
+            runs.append(json.load(input_file))
+
+    print(
+        f"{'config':<24} {'saturação':>10} {'rps':>8} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'erros':>7} {'pool':>7}"
+    )
+    for result in runs:
+        label = result["label"] or result["base_url"]
+        for stage in result["stages"]:
+            print(
+                f"{label:<24} {str(result['saturation_rps']):>10} "
+                f"{stage['achieved_rps']:>8} {str(stage['latency_ms']['p50']):>9} "
+                f"{str(stage['latency_ms']['p99']):>9} {stage['error_rate']:>7.2%} "
+                f"{str(stage['pool']['max_checked_out']):>7}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Gera carga na API em degraus de RPS e encontra a saturação."
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="+",
+        metavar="RESULTADO",
+        help="Compara resultados JSON gravados com --output e sai",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default="http://localhost:8000",
+        help="URL da API (padrão: http://localhost:8000)",
+    )
+    parser.add_argument(
+        "--api-key",
+        type=str,
+        default=os.getenv("API_KEY"),
+        help="API Key sem limite de requisições (padrão: variável API_KEY)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=str,
+        default="5,10,25,50,100",
+        help="Degraus de RPS alvo separados por vírgula (padrão: 5,10,25,50,100)",
+    )
+    parser.add_argument(
+        "--stage-seconds",
+        type=float,
+        default=30,
+        help="Duração de cada degrau em segundos (padrão: 30)",
+    )
+    parser.add_argument(
+        "--mix",
+        choices=sorted(MIXES),
+        default="default",
+        help="Mix de requisições (padrão: default)",
+    )
+    parser.add_argument(
+        "--crawlers",
+        type=int,
+        default=1,
+        help="Crawlers simultâneos paginando dias inteiros como o ETL (padrão: 1)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=200,
+        help="Máximo de requisições abertas do gerador (padrão: 200)",
+    )
+    parser.add_argument(
+        "--slo-ms",
+        type=float,
+        default=500,
+        help="p99 máximo aceitável antes de considerar saturado (padrão: 500)",
+    )
+    parser.add_argument(
+        "--stop-at-saturation",
+        action="store_true",
+        help="Interrompe no primeiro degrau saturado",
+    )
+    parser.add_argument(
+        "--start-ts",
+        type=datetime.fromisoformat,
+        help="Início da janela sorteada (padrão: descoberto via /availability)",
+    )
+    parser.add_argument(
+        "--end-ts",
+        type=datetime.fromisoformat,
+        help="Fim da janela sorteada (padrão: descoberto via /availability)",
+    )
+    parser.add_argument(
+        "--max-overflow",
+        type=float,
+        help="DB_MAX_OVERFLOW do servidor, se o /metrics não o expuser",
+    )
+    parser.add_argument(
+        "--accept-encoding",
+        type=str,
+        default="gzip",
+        help="Accept-Encoding enviado (padrão: gzip)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="Timeout por requisição (s)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Semente do sorteio (padrão: 42)"
+    )
+    parser.add_argument(
+        "--label", type=str, help="Nome da configuração testada (ex.: 4-workers)"
+    )
+    parser.add_argument(
+        "--output", type=str, help="Arquivo JSON para gravar os resultados"
+    )
+
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(args.compare)
+    else:
+        if not args.api_key:
+            parser.error("Informe --api-key ou defina API_KEY")
+
+        result = asyncio.run(run(args))
+        print(f"Saturação: {result['saturation_rps'] or 'não atingida'}")
+
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as output_file:
+                json.dump(result, output_file, indent=2)
@@ -2,9 +2,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from settings import DATABASE_URL_SOURCE
+from metrics import InstrumentedQueuePool, instrument_pool
+from settings import DATABASE_URL_SOURCE, DB_MAX_OVERFLOW, DB_POOL_SIZE
 
-engine = create_engine(DATABASE_URL_SOURCE)
+engine = create_engine(
+    DATABASE_URL_SOURCE,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+)
+instrument_pool(engine.pool)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -15,6 +15,11 @@ class DataSchema(BaseModel):
     )
 
 
+class ChangeSchema(DataSchema):
+    id: int = Field(description="Identificador do registro")
+    created_at: datetime = Field(description="Momento da inserção ou correção")
+
+
 class PagingSchema(BaseModel):
     page: int = Field(description="Número da página atual")
     total_pages: int = Field(description="Número total de páginas disponíveis")
@@ -26,3 +31,61 @@ class PagingSchema(BaseModel):
 class DataResponseSchema(BaseModel):
     data: List[DataSchema]
     paging: PagingSchema
+
+
+class ChangesResponseSchema(BaseModel):
+    data: List[ChangeSchema]
+    next_cursor: str | None = Field(
+        default=None, description="Cursor para a próxima chamada"
+    )
+    has_more: bool = Field(description="Indica se há mais alterações disponíveis")
+
+
+class AssetSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(description="Identificador do ativo")
+    name: str = Field(description="Nome do ativo (turbina)")
+
+
+class AvailabilityBucketSchema(BaseModel):
+    start: datetime = Field(description="Início do intervalo (dia ou hora)")
+    row_count: int = Field(description="Número de registros no intervalo")
+    min_ts: datetime | None = Field(default=None, description="Menor ts no intervalo")
+    max_ts: datetime | None = Field(default=None, description="Maior ts no intervalo")
+
+
+class AvailabilityResponseSchema(BaseModel):
+    granularity: str = Field(description="Granularidade dos intervalos (day ou hour)")
+    complete: bool = Field(
+        default=False,
+        description="Indica se o resumo cobre todos os registros: só então "
+        "intervalos ausentes significam que não há dados",
+    )
+    total_items: int = Field(description="Número total de registros na janela")
+    min_ts: datetime | None = Field(default=None, description="Menor ts na janela")
+    max_ts: datetime | None = Field(default=None, description="Maior ts na janela")
+    buckets: List[AvailabilityBucketSchema]
+
+
+class BulkIngestErrorSchema(BaseModel):
+    position: int = Field(
+        description="Linha (NDJSON) ou índice (colunar) do registro rejeitado"
+    )
+    detail: str = Field(description="Motivo da rejeição")
+
+
+class BulkIngestResponseSchema(BaseModel):
+    accepted: int = Field(description="Número de registros gravados")
+    rejected: int = Field(description="Número de registros rejeitados")
+    errors: List[BulkIngestErrorSchema] = Field(
+        default_factory=list,
+        description="Amostra dos registros rejeitados",
+    )
+
+
+class BulkIngestFailureSchema(BulkIngestResponseSchema):
+    detail: str = Field(
+        description="Erro que interrompeu a gravação; os blocos anteriores "
+        "(accepted) permanecem gravados"
+    )
@@ -0,0 +1,61 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from response_compression import CONTENT_CODINGS
+from settings import (
+    CACHE_IMMUTABLE_AFTER_SECONDS,
+    CACHE_MAX_AGE_SECONDS,
+    DATA_VERSION,
+)
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def is_immutable_window(end_ts: Optional[datetime]) -> bool:
+    if end_ts is None:
+        return False
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return _utc_naive(end_ts) <= now - timedelta(seconds=CACHE_IMMUTABLE_AFTER_SECONDS)
+
+
+def build_etag(params: Dict[str, Any], version: str = DATA_VERSION) -> str:
+    payload = json.dumps(
+        {"params": params, "version": version}, sort_keys=True, default=str
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+
+    # If-None-Match usa comparação fraca (RFC 9110, 13.1.2)
+    opaque = etag.removeprefix("W/")
+    return any(_strip_coding(candidate) == opaque for candidate in candidates)
+
+
+def _strip_coding(etag: str) -> str:
+    etag = etag.removeprefix("W/")
+    for coding in CONTENT_CODINGS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def cache_control(immutable: bool) -> str:
+    if immutable:
+        return f"private, max-age={CACHE_MAX_AGE_SECONDS}, immutable"
+    return "private, no-cache"
@@ -0,0 +1,333 @@
+import asyncio
+import logging
+import select
+import threading
+from typing import AsyncIterator, Callable, List, Optional, Set, Tuple
+
+from db import SessionLocal, engine
+from dtos.data import ChangeSchema, ChangesResponseSchema
+from models.data import DATA_NOTIFY_CHANNEL
+from services import DataService
+from services.data_service import decode_cursor, encode_cursor
+from settings import (
+    CHANGES_SAFETY_LAG_SECONDS,
+    LIVE_BATCH_SIZE,
+    LIVE_HEARTBEAT_SECONDS,
+    LIVE_MAX_SUBSCRIBERS,
+    LIVE_NOTIFY,
+    LIVE_NOTIFY_POLL_SECONDS,
+    LIVE_POLL_INTERVAL_SECONDS,
+    LIVE_QUEUE_SIZE,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Lote repassado aos inscritos: (id do ativo, alteração) em ordem de cursor
+Batch = List[Tuple[int, ChangeSchema]]
+
+REQUIRED_FIELDS = {"ts", "id", "created_at"}
+
+
+class Subscription:
+    """Fila de lotes de um cliente do /stream.
+
+    Alimentada pela thread do leitor compartilhado; quando a fila enche os
+    lotes novos são descartados e ``overflowed`` indica que o cliente precisa
+    voltar a ler do banco a partir do seu cursor.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def publish(self, batch: Batch) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, batch)
+        except RuntimeError:
+            # Loop já encerrado: o cliente está saindo
+            pass
+
+    def _put(self, batch: Batch) -> None:
+        try:
+            self.queue.put_nowait(batch)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def drain(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class ChangeBroadcaster:
+    """Leitor único do feed de alterações repassando as linhas novas a todos
+    os inscritos do /stream.
+
+    Roda numa thread própria enquanto houver inscritos, começando do fim do
+    feed no momento da primeira inscrição. No PostgreSQL espera os avisos de
+    LISTEN/NOTIFY (com uma conferência a cada ``notify_poll`` segundos); sem
+    eles consulta a cada ``poll_interval`` segundos.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        bind: Engine = engine,
+        notify: bool = LIVE_NOTIFY,
+        poll_interval: float = LIVE_POLL_INTERVAL_SECONDS,
+        notify_poll: float = LIVE_NOTIFY_POLL_SECONDS,
+        batch_size: int = LIVE_BATCH_SIZE,
+        queue_size: int = LIVE_QUEUE_SIZE,
+        max_subscribers: int = LIVE_MAX_SUBSCRIBERS,
+    ):
+        self.session_factory = session_factory
+        self.bind = bind
+        self.notify = notify
+        self.poll_interval = poll_interval
+        self.notify_poll = notify_poll
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = False
+        self._cursor: Optional[str] = None
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(
+        self, loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Optional[Subscription]:
+        """Inscreve o cliente no ``loop`` (padrão: o atual); ``None`` se não há
+        vagas.
+
+        O primeiro inscrito fixa aqui o cursor inicial do leitor, antes de o
+        cliente ler o que falta do banco: assim toda linha depois desse ponto
+        chega pela fila. Lê o banco, então rotas async devem chamá-lo numa
+        thread.
+        """
+        subscription = Subscription(
+            loop or asyncio.get_running_loop(), self.queue_size
+        )
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            if not self._started:
+                self._cursor = self._latest_cursor()
+                self._started = True
+            self._subscribers.add(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="live-broadcaster", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        listener = self._listen()
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    subscribers = list(self._subscribers)
+                    if not subscribers:
+                        # Sem inscritos a leitura para; o próximo inscrito
+                        # recomeça do fim do feed
+                        self._started = False
+                if not subscribers:
+                    self._wake.wait()
+                    self._wake.clear()
+                    continue
+
+                try:
+                    self._publish(subscribers)
+                except Exception as e:
+                    logger.error(f"Erro ao ler as alterações para o /stream: {e}")
+                listener = self._wait(listener)
+        finally:
+            if listener is not None:
+                listener.close()
+
+    def _latest_cursor(self) -> Optional[str]:
+        session = self.session_factory()
+        try:
+            return DataService(session).get_latest_cursor()
+        finally:
+            session.close()
+
+    def _publish(self, subscribers: List[Subscription]) -> None:
+        session = self.session_factory()
+        try:
+            service = DataService(session)
+            while True:
+                batch, self._cursor = service.get_change_batch(
+                    self._cursor, self.batch_size
+                )
+                if batch:
+                    for subscription in subscribers:
+                        subscription.publish(batch)
+                if len(batch) < self.batch_size:
+                    break
+        finally:
+            session.close()
+
+    def _listen(self):
+        if not self.notify or self.bind.dialect.name != "postgresql":
+            return None
+
+        try:
+            # Conexão própria, fora do pool, presa ao LISTEN
+            dialect = self.bind.dialect
+            args, kwargs = dialect.create_connect_args(self.bind.url)
+            connection = dialect.connect(*args, **kwargs)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {DATA_NOTIFY_CHANNEL}")
+            return connection
+        except Exception as e:
+            logger.warning(f"LISTEN indisponível, consultando a cada intervalo: {e}")
+            return None
+
+    def _wait(self, listener):
+        if listener is None:
+            self._stop.wait(self.poll_interval)
+            return None
+
+        try:
+            readable, _, _ = select.select([listener], [], [], self.notify_poll)
+            if readable:
+                listener.poll()
+                if listener.notifies:
+                    listener.notifies.clear()
+                    # As linhas só entram no feed depois do atraso de segurança
+                    self._stop.wait(CHANGES_SAFETY_LAG_SECONDS)
+            return listener
+        except Exception as e:
+            logger.warning(f"LISTEN interrompido, consultando a cada intervalo: {e}")
+            listener.close()
+            return None
+
+
+broadcaster = ChangeBroadcaster()
+
+
+def format_event(page: ChangesResponseSchema) -> str:
+    """Evento SSE com o lote; o id é o cursor para retomar (Last-Event-ID)."""
+    return (
+        f"id: {page.next_cursor}\n"
+        "event: changes\n"
+        f"data: {page.model_dump_json(exclude_none=True)}\n\n"
+    )
+
+
+def _read_changes(
+    session_factory: Callable[[], Session],
+    cursor: Optional[str],
+    fields: Optional[str],
+    asset_id: Optional[int],
+) -> ChangesResponseSchema:
+    session = session_factory()
+    try:
+        return DataService(session).get_changes(
+            cursor=cursor, fields=fields, limit=LIVE_BATCH_SIZE, asset_id=asset_id
+        )
+    finally:
+        session.close()
+
+
+def _latest_cursor(session_factory: Callable[[], Session]) -> Optional[str]:
+    session = session_factory()
+    try:
+        return DataService(session).get_latest_cursor()
+    finally:
+        session.close()
+
+
+async def stream_changes(
+    subscription: Subscription,
+    cursor: Optional[str],
+    fields: Optional[str] = None,
+    asset_id: Optional[int] = None,
+    session_factory: Callable[[], Session] = SessionLocal,
+    heartbeat: float = LIVE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Eventos SSE das alterações após ``cursor`` (sem cursor, do fim do feed).
+
+    Primeiro lê do banco o que falta até o presente e depois segue os lotes
+    do leitor compartilhado, filtrando o ativo e projetando ``fields``; linhas
+    já entregues na leitura inicial são ignoradas. Se a fila transbordar, a
+    leitura do banco é retomada do último cursor entregue.
+    """
+    keep = None
+    if fields:
+        keep = {field.strip() for field in fields.split(",")} | REQUIRED_FIELDS
+    if cursor is None:
+        cursor = await run_in_threadpool(_latest_cursor, session_factory)
+
+    while True:
+        subscription.overflowed = False
+        subscription.drain()
+        while True:
+            page = await run_in_threadpool(
+                _read_changes, session_factory, cursor, fields, asset_id
+            )
+            if page.data:
+                yield format_event(page)
+            cursor = page.next_cursor
+            if not page.has_more:
+                break
+        last_key = decode_cursor(cursor) if cursor else None
+
+        while not subscription.overflowed:
+            try:
+                batch = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Comentário SSE: mantém a conexão e detecta clientes que saíram
+                yield ": keepalive\n\n"
+                continue
+
+            rows = [
+                row
+                for row_asset_id, row in batch
+                if (asset_id is None or row_asset_id == asset_id)
+                and (last_key is None or (row.created_at, row.id) > last_key)
+            ]
+            if not rows:
+                continue
+
+            if keep is not None:
+                rows = [
+                    row.model_copy(
+                        update={
+                            name: None
+                            for name in ChangeSchema.model_fields
+                            if name not in keep
+                        }
+                    )
+                    for row in rows
+                ]
+            last_key = (rows[-1].created_at, rows[-1].id)
+            cursor = encode_cursor(*last_key)
+            yield format_event(
+                ChangesResponseSchema(data=rows, next_cursor=cursor, has_more=False)
+            )
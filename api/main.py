@@ -1,7 +1,13 @@
 from fastapi import FastAPI
 
+from metrics import MetricsMiddleware
+from profiling import ProfilingMiddleware
+from response_compression import CompressionMiddleware
 from routes.auth import router as auth_router
 from routes.data import router as data_router
+from routes.live import router as live_router
+from routes.metrics import router as metrics_router
+from settings import METRICS_ENABLED, PROFILING_ENABLED
 
 app = FastAPI(
     title="Teste Data Eng",
@@ -9,8 +15,17 @@ app = FastAPI(
     version="0.1.0",
 )
 
+app.add_middleware(CompressionMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if METRICS_ENABLED:
+    # Adicionado por último para ser o mais externo e incluir a compressão
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
 app.include_router(auth_router)
 app.include_router(data_router)
+app.include_router(live_router)
 
 
 @app.get("/", tags=["Root"])
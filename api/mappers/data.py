@@ -1,6 +1,11 @@
+from dtos.data import ChangeSchema as ChangeDTO
 from dtos.data import DataSchema as DataDTO
 from models.data import Data as DataModel
 
 
 def to_dto(data_model: DataModel) -> DataDTO:
     return DataDTO.model_validate(data_model)
+
+
+def to_change_dto(data_model: DataModel) -> ChangeDTO:
+    return ChangeDTO.model_validate(data_model)
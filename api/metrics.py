@@ -0,0 +1,349 @@
+import math
+from abc import ABC, abstractmethod
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.pool import Pool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+ROWS_BUCKETS = (0, 1, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Labels inválidos para {self.name}: esperado {self.labelnames}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Linhas de amostra no formato de exposição do Prometheus."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge com valor fixo por label ou calculado na leitura via set_function.
+
+    A função recebe nenhum argumento e devolve pares (valores dos labels, valor).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = (
+            None
+        )
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(
+        self, function: Callable[[], Iterable[Tuple[LabelValues, float]]]
+    ) -> None:
+        self._function = function
+
+    def values(self) -> Dict[LabelValues, float]:
+        if self._function is not None:
+            return {tuple(key): value for key, value in self._function()}
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], float]]:
+        with self._lock:
+            return {
+                key: (list(counts), self._sums[key])
+                for key, counts in self._counts.items()
+            }
+
+    def _samples(self) -> List[str]:
+        lines = []
+        bucket_labels = self.labelnames + ("le",)
+        for key, (counts, total) in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(bucket_labels, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica já registrada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets=buckets)
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ("method", "route", "status"),
+)
+PHASE_DURATION = REGISTRY.histogram(
+    "data_api_phase_duration_seconds",
+    "Tempo gasto em cada fase do atendimento das consultas de dados",
+    ("phase",),
+)
+ROWS_RETURNED = REGISTRY.histogram(
+    "data_api_rows_returned",
+    "Linhas devolvidas por requisição",
+    ("route",),
+    buckets=ROWS_BUCKETS,
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "http_cache_requests_total",
+    "Requisições condicionais respondidas com 304 (hit) ou corpo completo (miss)",
+    ("route", "result"),
+)
+CACHE_HIT_RATIO = REGISTRY.gauge(
+    "http_cache_hit_ratio",
+    "Fração das requisições respondidas com 304 desde o início do processo",
+    ("route",),
+)
+POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obter uma conexão do pool do SQLAlchemy",
+)
+POOL_CONNECTIONS = REGISTRY.gauge(
+    "db_pool_connections",
+    "Conexões do pool do SQLAlchemy por estado",
+    ("state",),
+)
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    "admission_rejections_total",
+    "Requisições recusadas pelo controle de admissão (rate_limit: 429, "
+    "overload: 503)",
+    ("reason",),
+)
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    "admission_requests_in_flight",
+    "Requisições de dados em atendimento dentro do limite de concorrência",
+)
+
+
+def _cache_hit_ratio() -> Iterable[Tuple[LabelValues, float]]:
+    totals: Dict[str, Dict[str, float]] = {}
+    for (route, result), value in CACHE_REQUESTS.values().items():
+        totals.setdefault(route, {})[result] = value
+
+    for route, results in totals.items():
+        requests = sum(results.values())
+        yield (route,), results.get("hit", 0.0) / requests if requests else 0.0
+
+
+CACHE_HIT_RATIO.set_function(_cache_hit_ratio)
+
+
+def observe_phase(phase: str):
+    return PHASE_DURATION.time(phase=phase)
+
+
+def record_cache(route: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(route=route, result="hit" if hit else "miss")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool que mede o tempo de espera de cada checkout."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_pool(pool: Pool) -> None:
+    if not isinstance(pool, QueuePool):
+        return
+
+    def connections() -> Iterable[Tuple[LabelValues, float]]:
+        yield ("size",), pool.size()
+        yield ("checked_out",), pool.checkedout()
+        yield ("checked_in",), pool.checkedin()
+        yield ("overflow",), max(pool.overflow(), 0)
+        # Limite configurado de conexões extras (-1: sem limite)
+        yield ("max_overflow",), pool._max_overflow
+
+    POOL_CONNECTIONS.set_function(connections)
+
+
+class MetricsMiddleware:
+    """Registra a latência de cada requisição HTTP pelo template da rota.
+
+    Usar o template (``/api/v1/data/``) e não o caminho bruto mantém a
+    cardinalidade dos labels limitada.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
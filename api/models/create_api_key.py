@@ -6,7 +6,12 @@ from db import SessionLocal
 from models.data import ApiKey
 
 
-def create_api_key(user_id: int, description: str):
+def create_api_key(
+    user_id: int,
+    description: str,
+    rate_limit_per_second: float | None = None,
+    rate_limit_burst: int | None = None,
+):
 
     session = SessionLocal()
 
@@ -23,7 +28,11 @@ def create_api_key(user_id: int, description: str):
         hashed_key = hashlib.sha256(api_key_plain.encode()).hexdigest()
 
         new_api_key = ApiKey(
-            user_id=user_id, hashed_key=hashed_key, description=description
+            user_id=user_id,
+            hashed_key=hashed_key,
+            description=description,
+            rate_limit_per_second=rate_limit_per_second,
+            rate_limit_burst=rate_limit_burst,
         )
 
         session.add(new_api_key)
@@ -54,7 +63,18 @@ if __name__ == "__main__":
         "user_id", type=int, help="O ID do usuário a ser criado a chave API."
     )
     parser.add_argument("description", type=str, help="A descrição da chave API.")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Requisições por segundo da chave (padrão: RATE_LIMIT_PER_SECOND; "
+        "0 sem limite)",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        help="Rajada máxima de requisições da chave (padrão: RATE_LIMIT_BURST)",
+    )
 
     args = parser.parse_args()
 
-    create_api_key(args.user_id, args.description)
+    create_api_key(args.user_id, args.description, args.rate_limit, args.burst)
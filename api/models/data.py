@@ -1,29 +1,82 @@
 from db import Base
+from settings import DEFAULT_ASSET_NAME
 from sqlalchemy import (
+    DDL,
     TIMESTAMP,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
+    UniqueConstraint,
+    event,
     func,
+    select,
 )
 from sqlalchemy.orm import relationship
 
 
+class Asset(Base):
+    """Ativo (turbina) ao qual pertencem as leituras da tabela data."""
+
+    __tablename__ = "asset"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(255), nullable=False, unique=True, index=True)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+
+# Inserções que não informam o ativo (bases de um único ativo) caem no padrão
+DEFAULT_ASSET_ID = (
+    select(Asset.id).where(Asset.name == DEFAULT_ASSET_NAME).scalar_subquery()
+)
+
+
+@event.listens_for(Asset.__table__, "after_create")
+def create_default_asset(target, connection, **kw):
+    connection.execute(target.insert().values(name=DEFAULT_ASSET_NAME))
+
+
 class Data(Base):
 
     __tablename__ = "data"
 
     id = Column(Integer, primary_key=True)
+    asset_id = Column(
+        Integer, ForeignKey("asset.id"), nullable=False, default=DEFAULT_ASSET_ID
+    )
     ts = Column(TIMESTAMP, nullable=False, index=True)
     wind_speed = Column(Float)
     power = Column(Float)
     ambient_temperature = Column(Float)
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
 
+    __table_args__ = (
+        # Uma leitura por ativo e minuto; também atende os filtros por ativo
+        UniqueConstraint("asset_id", "ts", name="uq_data_asset_id_ts"),
+        # Suporta o feed de alterações ordenado por (created_at, id)
+        Index("ix_data_created_at_id", "created_at", "id"),
+    )
+
+
+class DataAvailability(Base):
+    """Resumo por hora da tabela data, mantido por triggers no PostgreSQL."""
+
+    __tablename__ = "data_availability"
+
+    asset_id = Column(
+        Integer, ForeignKey("asset.id"), primary_key=True, default=DEFAULT_ASSET_ID
+    )
+    bucket = Column(TIMESTAMP, primary_key=True)
+    row_count = Column(BigInteger, nullable=False, default=0)
+    min_ts = Column(TIMESTAMP)
+    max_ts = Column(TIMESTAMP)
+    updated_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
 
 class User(Base):
     __tablename__ = "users"
@@ -46,4 +99,134 @@ class ApiKey(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
 
+    # Limites do token bucket da chave; NULL usa RATE_LIMIT_PER_SECOND e
+    # RATE_LIMIT_BURST, e 0 deixa a chave sem limite
+    rate_limit_per_second = Column(Float, nullable=True)
+    rate_limit_burst = Column(Integer, nullable=True)
+
     user = relationship("User", back_populates="api_keys")
+
+
+# Cada comando que altera a tabela data recalcula as horas afetadas em
+# data_availability a partir das transition tables (uma vez por comando). Um
+# resumo vazio numa base com dados (tabela criada depois deles) é preenchido
+# de uma vez ao final.
+# Antes da recontagem cada hora é travada (advisory lock até o fim da
+# transação, em ordem para não haver deadlock): com READ COMMITTED, um comando
+# concorrente na mesma hora espera o commit deste e reconta já vendo as suas
+# linhas, em vez de sobrescrever a contagem com um snapshot sem elas.
+DATA_AVAILABILITY_DDL = DDL(
+    """
+CREATE OR REPLACE FUNCTION data_availability_recompute(
+    asset_ids integer[], buckets timestamp[]
+)
+RETURNS void AS $$
+    SELECT pg_advisory_xact_lock(
+        b.asset_id, (extract(epoch FROM b.bucket) / 3600)::integer
+    )
+    FROM (
+        SELECT DISTINCT asset_id, bucket
+        FROM unnest(asset_ids, buckets) AS u(asset_id, bucket)
+        ORDER BY asset_id, bucket
+    ) b;
+
+    INSERT INTO data_availability
+        (asset_id, bucket, row_count, min_ts, max_ts, updated_at)
+    SELECT b.asset_id, b.bucket, count(d.id), min(d.ts), max(d.ts), now()
+    FROM unnest(asset_ids, buckets) AS b(asset_id, bucket)
+    LEFT JOIN data d
+        ON d.asset_id = b.asset_id
+        AND d.ts >= b.bucket
+        AND d.ts < b.bucket + interval '1 hour'
+    GROUP BY b.asset_id, b.bucket
+    ON CONFLICT (asset_id, bucket) DO UPDATE SET
+        row_count = EXCLUDED.row_count,
+        min_ts = EXCLUDED.min_ts,
+        max_ts = EXCLUDED.max_ts,
+        updated_at = EXCLUDED.updated_at;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION data_availability_on_new_rows() RETURNS trigger AS $$
+BEGIN
+    PERFORM data_availability_recompute(array_agg(asset_id), array_agg(bucket))
+    FROM (SELECT DISTINCT asset_id, date_trunc('hour', ts) AS bucket FROM new_rows) b;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION data_availability_on_old_rows() RETURNS trigger AS $$
+BEGIN
+    PERFORM data_availability_recompute(array_agg(asset_id), array_agg(bucket))
+    FROM (SELECT DISTINCT asset_id, date_trunc('hour', ts) AS bucket FROM old_rows) b;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER data_availability_insert
+    AFTER INSERT ON data REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION data_availability_on_new_rows();
+
+CREATE OR REPLACE TRIGGER data_availability_update_new
+    AFTER UPDATE ON data REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION data_availability_on_new_rows();
+
+CREATE OR REPLACE TRIGGER data_availability_update_old
+    AFTER UPDATE ON data REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION data_availability_on_old_rows();
+
+CREATE OR REPLACE TRIGGER data_availability_delete
+    AFTER DELETE ON data REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION data_availability_on_old_rows();
+
+INSERT INTO data_availability
+    (asset_id, bucket, row_count, min_ts, max_ts, updated_at)
+SELECT asset_id, date_trunc('hour', ts), count(*), min(ts), max(ts), now()
+FROM data
+WHERE NOT EXISTS (SELECT 1 FROM data_availability)
+GROUP BY 1, 2
+ON CONFLICT (asset_id, bucket) DO NOTHING;
+"""
+)
+
+# Com os quatro triggers ativos o resumo cobre toda a tabela data (o DDL acima
+# preenche o resumo quando ele é criado vazio numa base que já tem dados)
+DATA_AVAILABILITY_TRIGGERS = (
+    "data_availability_insert",
+    "data_availability_update_new",
+    "data_availability_update_old",
+    "data_availability_delete",
+)
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DATA_AVAILABILITY_DDL.execute_if(dialect="postgresql"),
+)
+
+# Avisa o /stream a cada comando que grava na tabela data. O NOTIFY só é
+# entregue no commit e avisos iguais na mesma transação viram um só.
+DATA_NOTIFY_CHANNEL = "data_changes"
+DATA_NOTIFY_DDL = DDL(
+    f"""
+CREATE OR REPLACE FUNCTION data_notify_changes() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{DATA_NOTIFY_CHANNEL}', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER data_notify_insert
+    AFTER INSERT ON data
+    FOR EACH STATEMENT EXECUTE FUNCTION data_notify_changes();
+
+CREATE OR REPLACE TRIGGER data_notify_update
+    AFTER UPDATE ON data
+    FOR EACH STATEMENT EXECUTE FUNCTION data_notify_changes();
+"""
+)
+
+event.listen(
+    Base.metadata,
+    "after_create",
+    DATA_NOTIFY_DDL.execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,84 @@
+from db import SessionLocal, engine
+from models.data import DATA_AVAILABILITY_DDL
+from models.migrate_unique_ts import MIGRATION_SQL as UNIQUE_TS_SQL
+from settings import DEFAULT_ASSET_NAME
+from sqlalchemy import inspect, text
+
+# Migra bancos criados antes da dimensão de ativo: as linhas existentes passam
+# a pertencer ao ativo padrão e a unicidade de ts vira (asset_id, ts), com a
+# mesma remoção de repetidas de models.migrate_unique_ts.
+MIGRATION_SQL = """
+CREATE TABLE IF NOT EXISTS asset (
+    id serial PRIMARY KEY,
+    name varchar(255) NOT NULL,
+    created_at timestamp NOT NULL DEFAULT now()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_asset_name ON asset (name);
+INSERT INTO asset (name) VALUES (:asset) ON CONFLICT (name) DO NOTHING;
+
+ALTER TABLE data ADD COLUMN IF NOT EXISTS asset_id integer REFERENCES asset (id);
+UPDATE data SET asset_id = (SELECT id FROM asset WHERE name = :asset)
+WHERE asset_id IS NULL;
+ALTER TABLE data ALTER COLUMN asset_id SET NOT NULL;
+
+DROP INDEX IF EXISTS ix_data_ts;
+CREATE INDEX ix_data_ts ON data (ts);
+"""
+
+# Só para bancos que já têm o resumo de disponibilidade; sem ele, a tabela e
+# as funções são criadas por models.refresh_availability
+AVAILABILITY_MIGRATION_SQL = """
+ALTER TABLE data_availability
+    ADD COLUMN IF NOT EXISTS asset_id integer REFERENCES asset (id);
+UPDATE data_availability
+SET asset_id = (SELECT id FROM asset WHERE name = :asset)
+WHERE asset_id IS NULL;
+ALTER TABLE data_availability DROP CONSTRAINT IF EXISTS data_availability_pkey;
+ALTER TABLE data_availability ADD PRIMARY KEY (asset_id, bucket);
+
+DROP FUNCTION IF EXISTS data_availability_recompute(timestamp[]);
+"""
+
+
+def migrate_assets():
+
+    if engine.dialect.name != "postgresql":
+        print("A migração de ativos requer PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        session.execute(text(MIGRATION_SQL), {"asset": DEFAULT_ASSET_NAME})
+        session.execute(text(UNIQUE_TS_SQL))
+
+        has_availability = inspect(session.connection()).has_table(
+            "data_availability"
+        )
+        if has_availability:
+            session.execute(
+                text(AVAILABILITY_MIGRATION_SQL), {"asset": DEFAULT_ASSET_NAME}
+            )
+            # Recria funções e triggers com a chave (asset_id, bucket)
+            session.execute(text(str(DATA_AVAILABILITY_DDL.statement)))
+        session.commit()
+
+        print(f"Sucesso! Linhas existentes atribuídas ao ativo '{DEFAULT_ASSET_NAME}'")
+        if not has_availability:
+            print(
+                "Resumo de disponibilidade ausente: crie-o com "
+                "python -m models.refresh_availability"
+            )
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_assets()
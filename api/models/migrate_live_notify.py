@@ -0,0 +1,32 @@
+from db import SessionLocal, engine
+from models.data import DATA_NOTIFY_DDL
+from sqlalchemy import text
+
+
+def migrate_live_notify():
+
+    if engine.dialect.name != "postgresql":
+        print("Os avisos do /stream (LISTEN/NOTIFY) requerem PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        # Cria os triggers que avisam o /stream das gravações na tabela data
+        session.execute(text(str(DATA_NOTIFY_DDL.statement)))
+        session.commit()
+
+        print("Sucesso! Triggers de aviso criados na tabela data")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_live_notify()
@@ -0,0 +1,37 @@
+from db import SessionLocal, engine
+from sqlalchemy import text
+
+# Adiciona os limites por chave a bancos criados antes do controle de admissão.
+# NULL usa os padrões RATE_LIMIT_PER_SECOND e RATE_LIMIT_BURST.
+MIGRATION_SQL = """
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS rate_limit_per_second double precision;
+ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS rate_limit_burst integer;
+"""
+
+
+def migrate_rate_limits():
+
+    if engine.dialect.name != "postgresql":
+        print("A migração dos limites requer PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        session.execute(text(MIGRATION_SQL))
+        session.commit()
+
+        print("Sucesso! Colunas de limite adicionadas em api_keys")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_rate_limits()
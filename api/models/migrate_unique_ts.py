@@ -0,0 +1,49 @@
+from db import SessionLocal, engine
+from sqlalchemy import inspect, text
+
+# A ingestão em lote faz upsert em (asset_id, ts), que exige a restrição única.
+# Bancos criados antes dela podem ter leituras repetidas no mesmo ts: são
+# removidas antes da restrição, mantendo a gravada por último.
+MIGRATION_SQL = """
+DELETE FROM data d
+USING data newer
+WHERE newer.asset_id = d.asset_id
+  AND newer.ts = d.ts
+  AND (newer.created_at, newer.id) > (d.created_at, d.id);
+ALTER TABLE data DROP CONSTRAINT IF EXISTS uq_data_asset_id_ts;
+ALTER TABLE data ADD CONSTRAINT uq_data_asset_id_ts UNIQUE (asset_id, ts);
+"""
+
+
+def migrate_unique_ts():
+
+    if engine.dialect.name != "postgresql":
+        print("A migração da restrição única requer PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        columns = inspect(session.connection()).get_columns("data")
+        if "asset_id" not in {column["name"] for column in columns}:
+            # migrate_assets cria asset_id e, em seguida, esta mesma restrição
+            print("Tabela data sem asset_id: rode python -m models.migrate_assets")
+            return
+
+        session.execute(text(MIGRATION_SQL))
+        session.commit()
+
+        print("Sucesso! Restrição única (asset_id, ts) criada em data")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_unique_ts()
@@ -0,0 +1,84 @@
+import argparse
+from datetime import datetime, timedelta
+
+from db import SessionLocal, engine
+from models.data import DATA_AVAILABILITY_DDL, DataAvailability
+from sqlalchemy import text
+
+REBUILD_SQL = """
+INSERT INTO data_availability (asset_id, bucket, row_count, min_ts, max_ts, updated_at)
+SELECT asset_id, date_trunc('hour', ts), count(*), min(ts), max(ts), now()
+FROM data
+WHERE (CAST(:start_ts AS timestamp) IS NULL OR ts >= CAST(:start_ts AS timestamp))
+  AND (CAST(:end_ts AS timestamp) IS NULL OR ts < CAST(:end_ts AS timestamp))
+GROUP BY 1, 2
+ON CONFLICT (asset_id, bucket) DO UPDATE SET
+    row_count = EXCLUDED.row_count,
+    min_ts = EXCLUDED.min_ts,
+    max_ts = EXCLUDED.max_ts,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def refresh_availability(start_ts: datetime | None, end_ts: datetime | None):
+
+    # O resumo é por hora: o intervalo é expandido para horas completas
+    if start_ts:
+        start_ts = _floor_hour(start_ts)
+    if end_ts and end_ts != _floor_hour(end_ts):
+        end_ts = _floor_hour(end_ts) + timedelta(hours=1)
+
+    DataAvailability.__table__.create(bind=engine, checkfirst=True)
+
+    session = SessionLocal()
+
+    try:
+        # Garante as funções e triggers em bancos criados antes do resumo
+        session.execute(text(str(DATA_AVAILABILITY_DDL.statement)))
+
+        delete_query = session.query(DataAvailability)
+        if start_ts:
+            delete_query = delete_query.filter(DataAvailability.bucket >= start_ts)
+        if end_ts:
+            delete_query = delete_query.filter(DataAvailability.bucket < end_ts)
+        delete_query.delete(synchronize_session=False)
+
+        result = session.execute(
+            text(REBUILD_SQL), {"start_ts": start_ts, "end_ts": end_ts}
+        )
+        session.commit()
+
+        print(f"Sucesso! {result.rowcount} horas por ativo recalculadas")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recalcula o resumo de disponibilidade (data_availability)."
+    )
+    parser.add_argument(
+        "--start-ts",
+        type=datetime.fromisoformat,
+        help="Início do intervalo (padrão: toda a tabela)",
+    )
+    parser.add_argument(
+        "--end-ts",
+        type=datetime.fromisoformat,
+        help="Fim do intervalo (padrão: toda a tabela)",
+    )
+
+    args = parser.parse_args()
+
+    refresh_availability(args.start_ts, args.end_ts)
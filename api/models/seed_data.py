@@ -0,0 +1,374 @@
+import argparse
+import io
+import struct
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator
+
+from db import SessionLocal
+from models.data import Asset, Data
+from settings import DEFAULT_ASSET_NAME
+from sqlalchemy import insert
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional (extra "seed")
+    np = None
+
+MINUTES_PER_DAY = 1440
+VALUE_COLUMNS = ("wind_speed", "power", "ambient_temperature")
+
+# Época do formato binário do COPY (timestamps em microssegundos desde 2000-01-01)
+PG_EPOCH = datetime(2000, 1, 1)
+COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+COPY_HEADER = COPY_SIGNATURE + struct.pack("!ii", 0, 0)
+COPY_TRAILER = struct.pack("!h", -1)
+COPY_SQL = (
+    "COPY data (asset_id, ts, wind_speed, power, ambient_temperature) "
+    "FROM STDIN WITH (FORMAT binary)"
+)
+COPY_FIELDS = 2 + len(VALUE_COLUMNS)
+
+# Turbina de referência (kW e m/s)
+RATED_POWER = 2000.0
+CUT_IN_SPEED = 3.0
+RATED_SPEED = 12.0
+CUT_OUT_SPEED = 25.0
+
+# Escala da distribuição de vento (Rice/Rayleigh) e clima
+WIND_SIGMA = 6.0
+PREVAILING_WIND = 0.8
+MEAN_TEMPERATURE = 22.0
+SEASONAL_TEMPERATURE_AMPLITUDE = 5.0
+DIURNAL_TEMPERATURE_AMPLITUDE = 4.5
+
+# Imperfeições dos dados reais
+GAP_PROBABILITY = 0.03
+GAP_MINUTES = (10, 360)
+OUTLIER_PROBABILITY = 1e-4
+NULL_PROBABILITY = 1e-3
+
+
+def _require_numpy():
+    if np is None:
+        raise SystemExit(
+            "numpy não está instalado. Instale o extra 'seed': uv sync --extra seed"
+        )
+
+
+def _day_number(day: date) -> int:
+    return (day - PG_EPOCH.date()).days
+
+
+def _day_nodes(seed: int, day_number: int):
+    """Nós de baixa frequência do dia (sinóticos a cada 6h e horários).
+
+    São os primeiros valores sorteados do gerador do dia, então o dia
+    seguinte pode ser consultado só para interpolar a fronteira.
+    """
+    rng = np.random.default_rng([seed, day_number])
+    synoptic = rng.standard_normal((3, 4))
+    hourly = rng.standard_normal((2, 24))
+    return rng, synoptic, hourly
+
+
+def _power_curve(wind_speed):
+    ratio = (wind_speed**3 - CUT_IN_SPEED**3) / (RATED_SPEED**3 - CUT_IN_SPEED**3)
+    power = RATED_POWER * np.clip(ratio, 0.0, 1.0)
+    operating = (wind_speed >= CUT_IN_SPEED) & (wind_speed < CUT_OUT_SPEED)
+    return np.where(operating, power, 0.0)
+
+
+def generate_days(seed: int, start_day: date, days: int) -> Dict[str, "np.ndarray"]:
+    """Gera ``days`` dias de dados de 1 minuto a partir de ``start_day``.
+
+    Cada dia usa um gerador semeado por (seed, dia), então o resultado de
+    um dia não depende do tamanho do bloco nem de onde a geração começou.
+    Valores ausentes (NULL) são representados como NaN.
+    """
+    _require_numpy()
+
+    first_day = _day_number(start_day)
+    minutes = days * MINUTES_PER_DAY
+
+    synoptic_nodes = np.empty((3, (days + 1) * 4))
+    hourly_nodes = np.empty((2, (days + 1) * 24))
+    minute_noise = np.empty((4, minutes))
+    keep = np.ones(minutes, dtype=bool)
+    outliers = np.zeros(minutes, dtype=bool)
+    outlier_signs = np.ones(minutes)
+    nulls = np.zeros((3, minutes), dtype=bool)
+
+    for offset in range(days + 1):
+        rng, synoptic, hourly = _day_nodes(seed, first_day + offset)
+        synoptic_nodes[:, offset * 4 : (offset + 1) * 4] = synoptic
+        hourly_nodes[:, offset * 24 : (offset + 1) * 24] = hourly
+        if offset == days:
+            break
+
+        day_slice = slice(offset * MINUTES_PER_DAY, (offset + 1) * MINUTES_PER_DAY)
+        minute_noise[:, day_slice] = rng.standard_normal((4, MINUTES_PER_DAY))
+
+        has_gap = rng.random() < GAP_PROBABILITY
+        gap_start = int(rng.integers(0, MINUTES_PER_DAY))
+        gap_length = int(rng.integers(*GAP_MINUTES))
+        if has_gap:
+            keep[day_slice][gap_start : gap_start + gap_length] = False
+
+        outliers[day_slice] = rng.random(MINUTES_PER_DAY) < OUTLIER_PROBABILITY
+        outlier_signs[day_slice] = rng.choice((-1.0, 1.0), MINUTES_PER_DAY)
+        nulls[:, day_slice] = rng.random((3, MINUTES_PER_DAY)) < NULL_PROBABILITY
+
+    minute_index = np.arange(minutes)
+    synoptic_positions = np.arange(synoptic_nodes.shape[1]) * 360
+    hourly_positions = np.arange(hourly_nodes.shape[1]) * 60
+
+    def synoptic(component: int):
+        return np.interp(minute_index, synoptic_positions, synoptic_nodes[component])
+
+    def hourly(component: int):
+        return np.interp(minute_index, hourly_positions, hourly_nodes[component])
+
+    ts = np.datetime64(start_day, "m") + minute_index.astype("timedelta64[m]")
+    day_of_year = (
+        (ts - ts.astype("datetime64[Y]")).astype("timedelta64[m]").astype(np.int64)
+        / MINUTES_PER_DAY
+    )
+    hour_of_day = (minute_index % MINUTES_PER_DAY) / 60
+
+    # Vento: módulo de duas componentes gaussianas correlacionadas no tempo
+    # (distribuição de Rice), mais forte no meio do ano
+    u = (
+        PREVAILING_WIND
+        + 0.75 * synoptic(0)
+        + 0.45 * hourly(0)
+        + 0.2 * minute_noise[0]
+    )
+    v = 0.75 * synoptic(1) + 0.45 * hourly(1) + 0.2 * minute_noise[1]
+    seasonal_wind = 1 + 0.15 * np.cos(2 * np.pi * (day_of_year - 200) / 365.25)
+    wind_speed = WIND_SIGMA * seasonal_wind * np.hypot(u, v)
+
+    power = _power_curve(wind_speed) * (1 + 0.02 * minute_noise[2])
+    power = np.clip(power, 0.0, RATED_POWER)
+
+    ambient_temperature = (
+        MEAN_TEMPERATURE
+        + SEASONAL_TEMPERATURE_AMPLITUDE
+        * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+        + DIURNAL_TEMPERATURE_AMPLITUDE * np.cos(2 * np.pi * (hour_of_day - 15) / 24)
+        + 1.5 * synoptic(2)
+        + 0.1 * minute_noise[3]
+    )
+
+    # Picos isolados: leituras de sensor claramente fora da curva
+    wind_speed = np.where(outliers, wind_speed * 3, wind_speed)
+    ambient_temperature = np.where(
+        outliers, ambient_temperature + 15 * outlier_signs, ambient_temperature
+    )
+
+    values = np.round(np.vstack([wind_speed, power, ambient_temperature]), 3)
+    values[nulls] = np.nan
+
+    return {
+        "ts": ts[keep],
+        **{column: values[i][keep] for i, column in enumerate(VALUE_COLUMNS)},
+    }
+
+
+def iter_chunks(
+    seed: int, start_day: date, days: int, chunk_days: int
+) -> Iterator[Dict[str, "np.ndarray"]]:
+    for offset in range(0, days, chunk_days):
+        yield generate_days(
+            seed,
+            start_day + timedelta(days=offset),
+            min(chunk_days, days - offset),
+        )
+
+
+def encode_copy_binary(chunk: Dict[str, "np.ndarray"], asset_id: int) -> bytes:
+    """Codifica o bloco no formato binário do COPY (ativo, ts e valores).
+
+    Linhas completas são montadas de uma vez com um array estruturado;
+    as poucas linhas com NULL têm tamanho variável e são codificadas à parte.
+    """
+    ts = (chunk["ts"] - np.datetime64(PG_EPOCH, "us")).astype("timedelta64[us]")
+    ts = ts.astype(np.int64)
+    values = np.vstack([chunk[column] for column in VALUE_COLUMNS])
+    complete = ~np.isnan(values).any(axis=0)
+
+    row_dtype = np.dtype(
+        [
+            ("fields", ">i2"),
+            ("asset_id_length", ">i4"),
+            ("asset_id", ">i4"),
+            ("ts_length", ">i4"),
+            ("ts", ">i8"),
+        ]
+        + [
+            field
+            for column in VALUE_COLUMNS
+            for field in ((f"{column}_length", ">i4"), (column, ">f8"))
+        ]
+    )
+    rows = np.empty(int(complete.sum()), dtype=row_dtype)
+    rows["fields"] = COPY_FIELDS
+    rows["asset_id_length"] = 4
+    rows["asset_id"] = asset_id
+    rows["ts_length"] = 8
+    rows["ts"] = ts[complete]
+    for i, column in enumerate(VALUE_COLUMNS):
+        rows[f"{column}_length"] = 8
+        rows[column] = values[i][complete]
+
+    buffer = io.BytesIO()
+    buffer.write(rows.tobytes())
+    for index in np.flatnonzero(~complete):
+        buffer.write(struct.pack("!hiiiq", COPY_FIELDS, 4, asset_id, 8, ts[index]))
+        for value in values[:, index]:
+            if np.isnan(value):
+                buffer.write(struct.pack("!i", -1))
+            else:
+                buffer.write(struct.pack("!id", 8, value))
+    return buffer.getvalue()
+
+
+def _copy_chunk(session, chunk: Dict[str, "np.ndarray"], asset_id: int) -> None:
+    buffer = io.BytesIO(
+        COPY_HEADER + encode_copy_binary(chunk, asset_id) + COPY_TRAILER
+    )
+    dbapi_connection = session.connection().connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.copy_expert(COPY_SQL, buffer)
+
+
+def _insert_chunk(session, chunk: Dict[str, "np.ndarray"], asset_id: int) -> None:
+    rows = [
+        {
+            "asset_id": asset_id,
+            "ts": ts.item(),
+            **{
+                column: None if np.isnan(chunk[column][i]) else float(chunk[column][i])
+                for column in VALUE_COLUMNS
+            },
+        }
+        for i, ts in enumerate(chunk["ts"].astype("datetime64[us]"))
+    ]
+    session.execute(insert(Data), rows)
+
+
+def seed_data(
+    start_day: date,
+    days: int,
+    seed: int = 42,
+    chunk_days: int = 180,
+    replace: bool = False,
+    session_factory=SessionLocal,
+    asset: str = DEFAULT_ASSET_NAME,
+):
+    _require_numpy()
+
+    session = session_factory()
+    end = datetime.combine(start_day + timedelta(days=days), datetime.min.time())
+    total_rows = 0
+    started = time.perf_counter()
+
+    try:
+        use_copy = session.get_bind().dialect.name == "postgresql"
+
+        asset_id = session.query(Asset.id).filter(Asset.name == asset).scalar()
+        if asset_id is None:
+            new_asset = Asset(name=asset)
+            session.add(new_asset)
+            session.commit()
+            asset_id = new_asset.id
+
+        if replace:
+            deleted = (
+                session.query(Data)
+                .filter(
+                    Data.asset_id == asset_id,
+                    Data.ts >= datetime.combine(start_day, datetime.min.time()),
+                    Data.ts < end,
+                )
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+            print(f"{deleted} linhas existentes removidas do intervalo")
+
+        for chunk in iter_chunks(seed, start_day, days, chunk_days):
+            if use_copy:
+                _copy_chunk(session, chunk, asset_id)
+            else:
+                _insert_chunk(session, chunk, asset_id)
+            session.commit()
+
+            total_rows += len(chunk["ts"])
+            elapsed = time.perf_counter() - started
+            print(
+                f"{total_rows} linhas gravadas até {chunk['ts'][-1]} "
+                f"({total_rows / elapsed:,.0f} linhas/s)"
+            )
+
+        print(f"Sucesso! {total_rows} linhas sintéticas gravadas em data")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+    return total_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Popula a tabela data com dados sintéticos de 1 minuto."
+    )
+    parser.add_argument(
+        "--start-date",
+        type=date.fromisoformat,
+        default=date(2020, 1, 1),
+        help="Primeiro dia gerado (padrão: 2020-01-01)",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=365,
+        help="Quantidade de dias (1440 linhas por dia, menos falhas) (padrão: 365)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Semente do gerador (padrão: 42)"
+    )
+    parser.add_argument(
+        "--chunk-days",
+        type=int,
+        default=180,
+        help="Dias por bloco de COPY/commit (padrão: 180)",
+    )
+    parser.add_argument(
+        "--asset",
+        type=str,
+        default=DEFAULT_ASSET_NAME,
+        help="Ativo dos dados gerados, criado se não existir; use sementes "
+        f"diferentes por ativo (padrão: {DEFAULT_ASSET_NAME})",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Remove as linhas já existentes no intervalo antes de gravar",
+    )
+
+    args = parser.parse_args()
+
+    seed_data(
+        args.start_date,
+        args.days,
+        args.seed,
+        args.chunk_days,
+        args.replace,
+        asset=args.asset,
+    )
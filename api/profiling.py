@@ -0,0 +1,120 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+from settings import PROFILING_DIR, PROFILING_THRESHOLD_MS
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+STATS_LIMIT = 50
+
+
+def write_profile(
+    profiler: cProfile.Profile, directory: str, name: str, metadata: Dict[str, Any]
+) -> Path:
+    """Grava o perfil em .prof (pstats), .txt (resumo legível) e .json (metadados)."""
+    output_dir = Path(directory)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    base = output_dir / f"{timestamp}-{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}"
+
+    profiler.dump_stats(base.with_suffix(".prof"))
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LIMIT)
+    base.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+
+    base.with_suffix(".json").write_text(
+        json.dumps(metadata, indent=2, default=str), encoding="utf-8"
+    )
+    return base.with_suffix(".prof")
+
+
+class ProfilingMiddleware:
+    """Perfila requisições com cProfile e guarda as que passam do limite.
+
+    Só uma requisição é perfilada por vez (o cProfile não aceita perfis
+    simultâneos); as demais seguem sem perfil. No Python 3.12 o perfil
+    cobre todas as threads, então endpoints síncronos executados no
+    threadpool também aparecem, junto com o que rodar em paralelo.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str = PROFILING_DIR,
+        threshold_ms: float = PROFILING_THRESHOLD_MS,
+    ):
+        self.app = app
+        self.directory = directory
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= self.threshold_ms:
+                self._save(profiler, scope, status_code, duration_ms)
+        finally:
+            self._lock.release()
+
+    def _save(
+        self,
+        profiler: cProfile.Profile,
+        scope: Scope,
+        status_code: int,
+        duration_ms: float,
+    ) -> None:
+        route = scope.get("route")
+        metadata = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "query_string": scope.get("query_string", b"").decode("latin-1"),
+            "status": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "threshold_ms": self.threshold_ms,
+        }
+        try:
+            path = write_profile(
+                profiler,
+                self.directory,
+                f"{scope['method']}-{scope['path']}-{int(duration_ms)}ms",
+                metadata,
+            )
+            logger.warning(
+                f"Requisição lenta ({duration_ms:.0f} ms): perfil gravado em {path}"
+            )
+        except OSError as e:
+            logger.error(f"Não foi possível gravar o perfil da requisição: {e}")
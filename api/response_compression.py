@@ -0,0 +1,190 @@
+import gzip
+from typing import Dict, List, Optional
+
+from settings import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_ENCODINGS,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MINIMUM_SIZE,
+    COMPRESSION_ZSTD_LEVEL,
+)
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+
+CONTENT_CODINGS = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+NON_COMPRESSIBLE_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> List[str]:
+    available = {"gzip"}
+    if brotli is not None:
+        available.add("br")
+    if zstandard is not None:
+        available.add("zstd")
+    return [encoding for encoding in COMPRESSION_ENCODINGS if encoding in available]
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], supported: Optional[List[str]] = None
+) -> Optional[str]:
+    if not accept_encoding:
+        return None
+
+    supported = available_encodings() if supported is None else supported
+
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    wildcard = qualities.get("*")
+    candidates = []
+    for preference, coding in enumerate(supported):
+        quality = qualities.get(coding, wildcard)
+        if quality:
+            candidates.append((-quality, preference, coding))
+
+    return min(candidates)[2] if candidates else None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Codificação não suportada: {encoding}")
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+
+    content_type = headers.get("content-type", "")
+    if content_type.startswith(NON_COMPRESSIBLE_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Comprime respostas completas com gzip, brotli ou zstd.
+
+    Respostas em streaming (mais de um bloco de corpo) passam sem compressão,
+    o que mantém o SSE e downloads longos com a latência original.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            send, encoding, self.minimum_size, request_headers.get("if-none-match")
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        minimum_size: int,
+        if_none_match: Optional[str] = None,
+    ):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.if_none_match = if_none_match
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    def _encoded_etag(self, etag: Optional[str]) -> Optional[str]:
+        # Cada codificação é uma representação distinta: o ETag forte recebe
+        # um sufixo (ver http_cache.etag_matches).
+        if etag and etag.endswith('"') and not etag.startswith("W/"):
+            return f'{etag[:-1]}-{self.encoding}"'
+        return None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=list(message["headers"]))
+            headers.add_vary_header("Accept-Encoding")
+            not_modified = message["status"] == 304
+            if not_modified:
+                # O 304 confirma a representação que o cliente já tem: leva o
+                # sufixo, a menos que o cliente tenha validado a sem compressão
+                etag = headers.get("etag")
+                encoded_etag = self._encoded_etag(etag)
+                held = [tag.strip() for tag in (self.if_none_match or "").split(",")]
+                if encoded_etag and etag not in held:
+                    headers["ETag"] = encoded_etag
+            message["headers"] = headers.raw
+
+            if not_modified or not _is_compressible(headers):
+                # Sem corpo a comprimir (304, SSE, tipos binários): os
+                # cabeçalhos seguem na hora, sem esperar o primeiro bloco
+                self.passthrough = True
+                await self._send(message)
+                return
+
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        start_message, self.start_message = self.start_message, None
+        headers = MutableHeaders(raw=start_message["headers"])
+
+        body = message.get("body", b"")
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            self.passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        compressed = compress_body(body, self.encoding)
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        encoded_etag = self._encoded_etag(headers.get("etag"))
+        if encoded_etag:
+            headers["ETag"] = encoded_etag
+        start_message["headers"] = headers.raw
+
+        await self._send(start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
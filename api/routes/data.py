@@ -1,34 +1,120 @@
+import json
+import logging
 from datetime import datetime
-from typing import List
+from typing import List, Literal
 
-from auth import get_current_user
-from db import SessionLocal
-from dtos.data import DataResponseSchema, DataSchema
-from fastapi import APIRouter, Depends, HTTPException, Query
-from services import DataService
+from admission import admission_control
+from auth import get_current_user, get_db
+from dtos.data import (
+    AssetSchema,
+    AvailabilityResponseSchema,
+    BulkIngestFailureSchema,
+    BulkIngestResponseSchema,
+    ChangesResponseSchema,
+    DataResponseSchema,
+    DataSchema,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from http_cache import build_etag, cache_control, etag_matches, is_immutable_window
+from metrics import ROWS_RETURNED, observe_phase, record_cache
+from services import DataIngestService, DataService, IngestError
+from settings import DATA_JSON_RENDERER, DATA_VERSION, DEFAULT_ASSET_NAME
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-router = APIRouter(prefix="/api/v1/data", tags=["Data"])
-
+logger = logging.getLogger(__name__)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# A sessão vem da mesma dependência da autenticação (uma conexão do pool por
+# requisição); toda rota passa pelo controle de admissão
+router = APIRouter(
+    prefix="/api/v1/data",
+    tags=["Data"],
+    dependencies=[Depends(admission_control)],
+)
 
 
 def get_data_service(db: Session = Depends(get_db)) -> DataService:
     return DataService(db)
 
 
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def validate_fields(fields: str | None, data_service: DataService) -> set[str] | None:
+    if not fields:
+        return None
+
+    available_fields = data_service.get_available_fields()
+    selected_field_names = set(field.strip() for field in fields.split(","))
+    invalid_fields = selected_field_names - set(available_fields)
+    if invalid_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid_fields)}",
+        )
+    return selected_field_names
+
+
+def resolve_asset(
+    asset: str | None, data_service: DataService, required: bool = False
+) -> int | None:
+    if asset is None:
+        # As linhas não dizem a que ativo pertencem: sem o filtro, ativos
+        # diferentes com o mesmo ts seriam indistinguíveis na resposta
+        if required and data_service.count_assets() > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Informe o parâmetro asset: há mais de um ativo",
+            )
+        return None
+
+    asset_id = data_service.get_asset_id(asset)
+    if asset_id is None:
+        raise HTTPException(status_code=404, detail=f"Ativo não encontrado: {asset}")
+    return asset_id
+
+
+def get_ingest_service(
+    asset: str = Query(DEFAULT_ASSET_NAME, description="Nome do ativo dos registros"),
+    data_service: DataService = Depends(get_data_service),
+    current_user: dict = Depends(get_current_user),
+) -> DataIngestService:
+    # Autentica antes de resolver o ativo: ativos desconhecidos respondem 404,
+    # como nas rotas de leitura, em vez de serem criados pela ingestão
+    return DataIngestService(
+        data_service.db, asset_id=resolve_asset(asset, data_service)
+    )
+
+
 @router.get("/fields", response_model=List[str], summary="Get available fields")
 def get_available_fields(
+    request: Request,
+    response: Response,
     data_service: DataService = Depends(get_data_service),
     current_user: dict = Depends(get_current_user),
 ):
-    return data_service.get_available_fields()
+    available_fields = data_service.get_available_fields()
+
+    headers = {
+        "ETag": build_etag({"fields": available_fields}),
+        "Cache-Control": cache_control(immutable=True),
+    }
+    hit = etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+    record_cache("/api/v1/data/fields", hit)
+    if hit:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return available_fields
+
+
+@router.get("/assets", response_model=List[AssetSchema], summary="Get assets")
+def get_assets(
+    data_service: DataService = Depends(get_data_service),
+    current_user: dict = Depends(get_current_user),
+):
+    return data_service.get_assets()
 
 
 @router.get(
@@ -38,6 +124,7 @@ def get_available_fields(
     summary="Get data with pagination",
 )
 def get_data(
+    request: Request,
     start_ts: datetime | None = Query(None, description="Data de início"),
     end_ts: datetime | None = Query(None, description="Data de fim"),
     fields: str | None = Query(
@@ -46,23 +133,206 @@ def get_data(
     ),
     page: int = Query(1, ge=1, description="Número da página"),
     page_size: int = Query(25, ge=1, le=1000, description="Número de itens por página"),
+    asset: str | None = Query(
+        None, description="Nome do ativo (obrigatório com mais de um ativo)"
+    ),
     data_service: DataService = Depends(get_data_service),
     current_user: dict = Depends(get_current_user),
 ):
-    if fields:
-        available_fields = data_service.get_available_fields()
-        selected_field_names = set(field.strip() for field in fields.split(","))
-        invalid_fields = selected_field_names - set(available_fields)
-        if invalid_fields:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Campos inválidos: {', '.join(invalid_fields)}",
-            )
+    selected_field_names = validate_fields(fields, data_service)
+    asset_id = resolve_asset(asset, data_service, required=True)
 
-    return data_service.get_data_with_pagination(
+    # A versão vem do resumo por hora (data_availability), então o 304 é
+    # respondido sem consultar nem serializar as linhas da página.
+    version = data_service.get_data_version(
+        start_ts=start_ts, end_ts=end_ts, asset_id=asset_id
+    )
+    immutable = is_immutable_window(end_ts)
+    etag = build_etag(
+        {
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "fields": sorted(selected_field_names) if selected_field_names else None,
+            "page": page,
+            "page_size": page_size,
+            "asset": asset,
+        },
+        f"{DATA_VERSION}:{version}",
+    )
+    headers = {"ETag": etag, "Cache-Control": cache_control(immutable)}
+
+    hit = etag_matches(request.headers.get("if-none-match"), etag)
+    record_cache("/api/v1/data/", hit)
+    if hit:
+        return Response(status_code=304, headers=headers)
+
+    if DATA_JSON_RENDERER == "database":
+        body, rows = data_service.get_data_page_json(
+            start_ts=start_ts,
+            end_ts=end_ts,
+            fields=fields,
+            page=page,
+            page_size=page_size,
+            asset_id=asset_id,
+        )
+        ROWS_RETURNED.observe(rows, route="/api/v1/data/")
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    result = data_service.get_data_with_pagination(
         start_ts=start_ts,
         end_ts=end_ts,
         fields=fields,
         page=page,
         page_size=page_size,
+        asset_id=asset_id,
+    )
+    ROWS_RETURNED.observe(len(result.data), route="/api/v1/data/")
+
+    # Serializa direto com o pydantic para medir a renderização do JSON
+    with observe_phase("json_render"):
+        body = result.model_dump_json(exclude_none=True)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/changes",
+    response_model=ChangesResponseSchema,
+    response_model_exclude_none=True,
+    summary="Get inserted or corrected data since a cursor",
+)
+def get_changes(
+    cursor: str | None = Query(
+        None,
+        description="Cursor retornado na chamada anterior (vazio para começar do início)",
+    ),
+    fields: str | None = Query(
+        None,
+        description="Campos desejados, separados por vírgula. Ex: wind_speed,power",
+    ),
+    limit: int = Query(1000, ge=1, le=10000, description="Número máximo de registros"),
+    asset: str | None = Query(
+        None, description="Nome do ativo (obrigatório com mais de um ativo)"
+    ),
+    data_service: DataService = Depends(get_data_service),
+    current_user: dict = Depends(get_current_user),
+):
+    validate_fields(fields, data_service)
+    asset_id = resolve_asset(asset, data_service, required=True)
+
+    try:
+        result = data_service.get_changes(
+            cursor=cursor, fields=fields, limit=limit, asset_id=asset_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    ROWS_RETURNED.observe(len(result.data), route="/api/v1/data/changes")
+    return result
+
+
+@router.get(
+    "/availability",
+    response_model=AvailabilityResponseSchema,
+    summary="Get row counts per day or hour",
+)
+def get_availability(
+    start_ts: datetime | None = Query(None, description="Data de início"),
+    end_ts: datetime | None = Query(None, description="Data de fim"),
+    granularity: Literal["day", "hour"] = Query(
+        "day", description="Granularidade dos intervalos"
+    ),
+    asset: str | None = Query(None, description="Nome do ativo (padrão: todos)"),
+    data_service: DataService = Depends(get_data_service),
+    current_user: dict = Depends(get_current_user),
+):
+    return data_service.get_availability(
+        start_ts=start_ts,
+        end_ts=end_ts,
+        granularity=granularity,
+        asset_id=resolve_asset(asset, data_service),
     )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkIngestResponseSchema,
+    responses={500: {"model": BulkIngestFailureSchema}},
+    summary="Bulk ingest data",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"type": "string"},
+                    "example": '{"ts": "2024-01-01T00:00:00", "wind_speed": 7.2}',
+                },
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "additionalProperties": {"type": "array"},
+                    },
+                    "example": {
+                        "ts": ["2024-01-01T00:00:00"],
+                        "wind_speed": [7.2],
+                        "power": [812.5],
+                        "ambient_temperature": [21.3],
+                    },
+                },
+            },
+        }
+    },
+)
+async def bulk_ingest(
+    request: Request,
+    ingest_service: DataIngestService = Depends(get_ingest_service),
+    current_user: dict = Depends(get_current_user),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    try:
+        if content_type in NDJSON_MEDIA_TYPES:
+            # O corpo é consumido em streaming: cada bloco de linhas completas é
+            # validado e gravado sem manter o payload inteiro em memória.
+            position = 0
+            remainder = b""
+            async for chunk in request.stream():
+                lines = (remainder + chunk).split(b"\n")
+                remainder = lines.pop()
+                numbered = list(enumerate(lines, start=position + 1))
+                position += len(lines)
+                await run_in_threadpool(ingest_service.add_ndjson_lines, numbered)
+            if remainder:
+                await run_in_threadpool(
+                    ingest_service.add_ndjson_lines, [(position + 1, remainder)]
+                )
+
+        elif content_type == "application/json":
+            try:
+                payload = json.loads(await request.body())
+            except ValueError:
+                raise HTTPException(status_code=400, detail="JSON inválido")
+            try:
+                await run_in_threadpool(ingest_service.add_columnar, payload)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        else:
+            raise HTTPException(
+                status_code=415,
+                detail="Content-Type deve ser application/x-ndjson ou application/json",
+            )
+
+        await run_in_threadpool(ingest_service.flush)
+
+    except IngestError as e:
+        # Os blocos anteriores ao erro já foram gravados: a resposta (e o log)
+        # informam quantos, para o cliente reenviar só o restante
+        result = ingest_service.result()
+        logger.error(
+            f"Ingestão em lote interrompida com {result.accepted} registros "
+            f"gravados: {e}"
+        )
+        failure = BulkIngestFailureSchema(**result.model_dump(), detail=str(e))
+        return JSONResponse(status_code=500, content=failure.model_dump(mode="json"))
+
+    return ingest_service.result()
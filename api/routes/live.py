@@ -0,0 +1,83 @@
+import asyncio
+
+from admission import rate_limit
+from auth import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from live import broadcaster, stream_changes
+from routes.data import resolve_asset, validate_fields
+from services import DataService
+from services.data_service import decode_cursor
+from settings import ADMISSION_RETRY_AFTER_SECONDS
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+# Fora do router de dados: um stream dura horas e não deve ocupar uma vaga do
+# limite de concorrência, só passar pelo limite de requisições da API key
+router = APIRouter(prefix="/api/v1/data", tags=["Data"])
+
+
+def _resolve(fields: str | None, asset: str | None, db: Session) -> int | None:
+    data_service = DataService(db)
+    validate_fields(fields, data_service)
+    try:
+        return resolve_asset(asset, data_service, required=True)
+    finally:
+        # Libera a conexão da requisição antes de começar o stream
+        db.close()
+
+
+@router.get(
+    "/stream",
+    summary="Stream new data as Server-Sent Events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_data(
+    request: Request,
+    cursor: str | None = Query(
+        None,
+        description="Cursor do último evento recebido (o cabeçalho Last-Event-ID "
+        "tem prioridade); vazio para começar das próximas alterações",
+    ),
+    fields: str | None = Query(
+        None,
+        description="Campos desejados, separados por vírgula. Ex: wind_speed,power",
+    ),
+    asset: str | None = Query(
+        None, description="Nome do ativo (obrigatório com mais de um ativo)"
+    ),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(rate_limit),
+):
+    asset_id = await run_in_threadpool(_resolve, fields, asset, db)
+
+    cursor = request.headers.get("last-event-id") or cursor
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    subscription = await run_in_threadpool(
+        broadcaster.subscribe, asyncio.get_running_loop()
+    )
+    if subscription is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Limite de conexões do stream atingido, tente novamente",
+            headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+    async def events():
+        try:
+            async for event in stream_changes(subscription, cursor, fields, asset_id):
+                yield event
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,3 +1,4 @@
 from .data_service import DataService
+from .ingest_service import DataIngestService, IngestError
 
-__all__ = ["DataService"]
+__all__ = ["DataService", "DataIngestService", "IngestError"]
@@ -1,13 +1,50 @@
+import base64
+import binascii
 import math
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
-from dtos.data import DataResponseSchema, DataSchema, PagingSchema
-from mappers.data import to_dto
+from dtos.data import (
+    AssetSchema,
+    AvailabilityBucketSchema,
+    AvailabilityResponseSchema,
+    ChangeSchema,
+    ChangesResponseSchema,
+    DataResponseSchema,
+    DataSchema,
+    PagingSchema,
+)
+from mappers.data import to_change_dto, to_dto
+from metrics import observe_phase
+from models.data import DATA_AVAILABILITY_TRIGGERS
+from models.data import Asset as AssetModel
 from models.data import Data as DataModel
-from sqlalchemy import func
+from models.data import DataAvailability as DataAvailabilityModel
+from settings import CHANGES_SAFETY_LAG_SECONDS
+from sqlalchemy import Text, cast, func, inspect, literal, text, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
 
+Cursor = Tuple[datetime, int]
+
+# Bancos em que data_availability já existe. Em bancos criados antes do resumo
+# (sem create_tables ou refresh_availability) a versão vem da tabela data.
+_availability_ready: Set[str] = set()
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Cursor inválido: {cursor}")
+
 
 class DataService:
 
@@ -17,6 +54,16 @@ class DataService:
     def get_available_fields(self) -> List[str]:
         return list(DataSchema.model_fields.keys())
 
+    def get_assets(self) -> List[AssetSchema]:
+        assets = self.db.query(AssetModel).order_by(AssetModel.name).all()
+        return [AssetSchema.model_validate(asset) for asset in assets]
+
+    def count_assets(self) -> int:
+        return self.db.query(func.count(AssetModel.id)).scalar()
+
+    def get_asset_id(self, name: str) -> Optional[int]:
+        return self.db.query(AssetModel.id).filter(AssetModel.name == name).scalar()
+
     def get_data_with_pagination(
         self,
         start_ts: Optional[datetime] = None,
@@ -24,25 +71,30 @@ class DataService:
         fields: Optional[str] = None,
         page: int = 1,
         page_size: int = 25,
+        asset_id: Optional[int] = None,
     ) -> DataResponseSchema:
 
         base_query = self._build_base_query(fields)
 
         base_query = self._apply_date_filters(base_query, start_ts, end_ts)
+        base_query = self._apply_asset_filter(base_query, DataModel, asset_id)
 
-        total_items = base_query.with_entities(func.count(DataModel.id)).scalar()
+        with observe_phase("count_query"):
+            total_items = base_query.with_entities(func.count(DataModel.id)).scalar()
         total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
         has_next = page < total_pages
 
         offset = (page - 1) * page_size
-        results = (
-            base_query.order_by(DataModel.ts.desc())
-            .offset(offset)
-            .limit(page_size)
-            .all()
-        )
+        with observe_phase("page_query"):
+            results = (
+                base_query.order_by(DataModel.ts.desc())
+                .offset(offset)
+                .limit(page_size)
+                .all()
+            )
 
-        data = [to_dto(row) for row in results]
+        with observe_phase("dto_mapping"):
+            data = [to_dto(row) for row in results]
 
         return DataResponseSchema(
             data=data,
@@ -55,11 +107,258 @@ class DataService:
             ),
         )
 
-    def _build_base_query(self, fields: Optional[str] = None):
+    def get_data_page_json(
+        self,
+        start_ts: Optional[datetime] = None,
+        end_ts: Optional[datetime] = None,
+        fields: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 25,
+        asset_id: Optional[int] = None,
+    ) -> Tuple[bytes, int]:
+        """Página já serializada no formato de ``get_data_with_pagination`` e
+        o número de linhas dela.
+
+        No PostgreSQL o array ``data`` é montado pelo próprio banco
+        (``json_agg`` sobre ``json_build_object`` com a projeção de
+        ``fields``) e chega como texto, sem criar objetos Python por linha;
+        nos demais bancos a página é serializada com o pydantic.
+        """
+        if self._dialect != "postgresql":
+            result = self.get_data_with_pagination(
+                start_ts, end_ts, fields, page, page_size, asset_id
+            )
+            with observe_phase("json_render"):
+                body = result.model_dump_json(exclude_none=True).encode()
+            return body, len(result.data)
+
+        selected_field_names = (
+            self._ensure_required_fields({field.strip() for field in fields.split(",")})
+            if fields
+            else set(self.get_available_fields())
+        )
+        columns = [
+            getattr(DataModel, field)
+            for field in self.get_available_fields()
+            if field in selected_field_names
+        ]
+
+        base_query = self._apply_date_filters(self.db.query(*columns), start_ts, end_ts)
+        base_query = self._apply_asset_filter(base_query, DataModel, asset_id)
+
+        with observe_phase("count_query"):
+            total_items = base_query.with_entities(func.count(DataModel.id)).scalar()
+        total_pages = math.ceil(total_items / page_size) if total_items > 0 else 0
+        offset = (page - 1) * page_size
+        rows = max(min(page_size, total_items - offset), 0)
+
+        page_rows = (
+            base_query.order_by(DataModel.ts.desc())
+            .offset(offset)
+            .limit(page_size)
+            .subquery()
+        )
+        # json_strip_nulls omite os campos nulos, como o exclude_none da API
+        row_json = func.json_strip_nulls(
+            func.json_build_object(
+                *[
+                    item
+                    for column in columns
+                    for item in (literal(column.key), page_rows.c[column.key])
+                ]
+            )
+        )
+        data_json = func.json_agg(aggregate_order_by(row_json, page_rows.c.ts.desc()))
+        with observe_phase("page_query"):
+            data = self.db.query(
+                func.coalesce(cast(data_json, Text), "[]")
+            ).scalar()
+
+        paging = PagingSchema(
+            page=page,
+            total_pages=total_pages,
+            items_per_page=page_size,
+            total_items=total_items,
+            has_next=page < total_pages,
+        )
+        with observe_phase("json_render"):
+            body = b"".join(
+                (
+                    b'{"data":',
+                    data.encode(),
+                    b',"paging":',
+                    paging.model_dump_json().encode(),
+                    b"}",
+                )
+            )
+        return body, rows
+
+    def get_changes(
+        self,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        limit: int = 1000,
+        asset_id: Optional[int] = None,
+    ) -> ChangesResponseSchema:
+
+        query = self._build_base_query(
+            fields, required_fields=["ts", "id", "created_at"]
+        )
+        query = self._apply_asset_filter(query, DataModel, asset_id)
+        query = self._apply_changes_filters(query, cursor)
+
+        results = (
+            query.order_by(DataModel.created_at, DataModel.id).limit(limit + 1).all()
+        )
+        has_more = len(results) > limit
+        results = results[:limit]
+
+        next_cursor = cursor
+        if results:
+            next_cursor = encode_cursor(results[-1].created_at, results[-1].id)
+
+        return ChangesResponseSchema(
+            data=[to_change_dto(row) for row in results],
+            next_cursor=next_cursor,
+            has_more=has_more,
+        )
+
+    def get_availability(
+        self,
+        start_ts: Optional[datetime] = None,
+        end_ts: Optional[datetime] = None,
+        granularity: str = "day",
+        asset_id: Optional[int] = None,
+    ) -> AvailabilityResponseSchema:
+
+        # O resumo é por hora: horas parcialmente dentro da janela entram inteiras
+        query = self.db.query(DataAvailabilityModel).filter(
+            DataAvailabilityModel.row_count > 0
+        )
+        query = self._apply_bucket_filters(query, start_ts, end_ts)
+        query = self._apply_asset_filter(query, DataAvailabilityModel, asset_id)
+
+        buckets: List[AvailabilityBucketSchema] = []
+        for hour in query.order_by(DataAvailabilityModel.bucket).all():
+            start = hour.bucket
+            if granularity == "day":
+                start = start.replace(hour=0)
+
+            if buckets and buckets[-1].start == start:
+                bucket = buckets[-1]
+                bucket.row_count += hour.row_count
+                bucket.min_ts = min(bucket.min_ts, hour.min_ts)
+                bucket.max_ts = max(bucket.max_ts, hour.max_ts)
+            else:
+                buckets.append(
+                    AvailabilityBucketSchema(
+                        start=start,
+                        row_count=hour.row_count,
+                        min_ts=hour.min_ts,
+                        max_ts=hour.max_ts,
+                    )
+                )
+
+        return AvailabilityResponseSchema(
+            granularity=granularity,
+            complete=self._availability_complete(),
+            total_items=sum(bucket.row_count for bucket in buckets),
+            min_ts=buckets[0].min_ts if buckets else None,
+            max_ts=buckets[-1].max_ts if buckets else None,
+            buckets=buckets,
+        )
+
+    def get_data_version(
+        self,
+        start_ts: Optional[datetime] = None,
+        end_ts: Optional[datetime] = None,
+        asset_id: Optional[int] = None,
+    ) -> str:
+
+        if self._dialect == "postgresql" and self._has_availability():
+            # No PostgreSQL o resumo por hora é mantido por triggers, então a
+            # versão sai de O(horas) linhas sem tocar na tabela data.
+            query = self.db.query(
+                func.sum(DataAvailabilityModel.row_count),
+                func.max(DataAvailabilityModel.updated_at),
+            )
+            query = self._apply_bucket_filters(query, start_ts, end_ts)
+            query = self._apply_asset_filter(query, DataAvailabilityModel, asset_id)
+            total_items, updated_at = query.one()
+            return f"{total_items}:{updated_at}"
+
+        query = self.db.query(
+            func.count(DataModel.id),
+            func.max(DataModel.id),
+            func.max(DataModel.created_at),
+        )
+        query = self._apply_date_filters(query, start_ts, end_ts)
+        query = self._apply_asset_filter(query, DataModel, asset_id)
+        total_items, max_id, max_created_at = query.one()
+
+        return f"{total_items}:{max_id}:{max_created_at}"
+
+    def get_change_batch(
+        self, cursor: Optional[str] = None, limit: int = 1000
+    ) -> Tuple[List[Tuple[int, ChangeSchema]], Optional[str]]:
+        """Alterações de todos os ativos após ``cursor``, cada uma com o id do
+        seu ativo, e o cursor da última; usado pelo repasse do /stream."""
+        query = self._apply_changes_filters(self.db.query(DataModel), cursor)
+        results = query.order_by(DataModel.created_at, DataModel.id).limit(limit).all()
+        if results:
+            cursor = encode_cursor(results[-1].created_at, results[-1].id)
+        return [(row.asset_id, to_change_dto(row)) for row in results], cursor
+
+    def get_latest_cursor(self) -> Optional[str]:
+        """Cursor da alteração mais recente já entregue pelo feed."""
+        latest = (
+            self._apply_changes_filters(
+                self.db.query(DataModel.created_at, DataModel.id), None
+            )
+            .order_by(DataModel.created_at.desc(), DataModel.id.desc())
+            .first()
+        )
+        return encode_cursor(latest.created_at, latest.id) if latest else None
+
+    @property
+    def _dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _availability_complete(self) -> bool:
+        """Se o resumo cobre toda a tabela data, ou seja, se horas ausentes
+        nele de fato não têm registros: só no PostgreSQL, com a tabela e os
+        triggers que a mantêm ativos."""
+        if self._dialect != "postgresql" or not self._has_availability():
+            return False
+
+        active_triggers = self.db.execute(
+            text(
+                "SELECT count(*) FROM pg_trigger "
+                "WHERE tgrelid = 'data'::regclass AND tgname = ANY(:names) "
+                "AND tgenabled <> 'D'"
+            ),
+            {"names": list(DATA_AVAILABILITY_TRIGGERS)},
+        ).scalar()
+        return active_triggers == len(DATA_AVAILABILITY_TRIGGERS)
+
+    def _has_availability(self) -> bool:
+        bind = self.db.get_bind()
+        key = str(bind.url)
+        if key not in _availability_ready:
+            if not inspect(bind).has_table(DataAvailabilityModel.__tablename__):
+                return False
+            _availability_ready.add(key)
+        return True
+
+    def _build_base_query(
+        self, fields: Optional[str] = None, required_fields: list[str] = None
+    ):
 
         if fields:
             selected_field_names = set(field.strip() for field in fields.split(","))
-            selected_field_names = self._ensure_required_fields(selected_field_names)
+            selected_field_names = self._ensure_required_fields(
+                selected_field_names, required_fields
+            )
             selectable_columns = [
                 getattr(DataModel, field) for field in selected_field_names
             ]
@@ -77,6 +376,41 @@ class DataService:
             query = query.filter(DataModel.ts <= end_ts)
         return query
 
+    def _apply_changes_filters(self, query, cursor: Optional[str]):
+
+        if CHANGES_SAFETY_LAG_SECONDS > 0 and self._dialect == "postgresql":
+            query = query.filter(
+                DataModel.created_at
+                <= func.localtimestamp()
+                - func.make_interval(0, 0, 0, 0, 0, 0, CHANGES_SAFETY_LAG_SECONDS)
+            )
+
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(DataModel.created_at, DataModel.id) > tuple_(created_at, row_id)
+            )
+        return query
+
+    def _apply_asset_filter(self, query, model, asset_id: Optional[int]):
+
+        if asset_id is not None:
+            query = query.filter(model.asset_id == asset_id)
+        return query
+
+    def _apply_bucket_filters(
+        self, query, start_ts: Optional[datetime], end_ts: Optional[datetime]
+    ):
+
+        if start_ts:
+            query = query.filter(
+                DataAvailabilityModel.bucket
+                >= start_ts.replace(minute=0, second=0, microsecond=0)
+            )
+        if end_ts:
+            query = query.filter(DataAvailabilityModel.bucket <= end_ts)
+        return query
+
     def _ensure_required_fields(
         self, selected_fields: set[str], required_fields: list[str] = None
     ) -> set[str]:
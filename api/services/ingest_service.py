@@ -0,0 +1,217 @@
+import io
+import json
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dtos.data import BulkIngestErrorSchema, BulkIngestResponseSchema
+from models.data import Data as DataModel
+from settings import BULK_INGEST_CHUNK_SIZE, BULK_INGEST_MAX_ERRORS
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+VALUE_COLUMNS = ("wind_speed", "power", "ambient_temperature")
+INGEST_COLUMNS = ("ts",) + VALUE_COLUMNS
+
+Row = Tuple[datetime, Optional[float], Optional[float], Optional[float]]
+
+STAGE_TABLE_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS data_ingest_stage (
+    ts timestamp NOT NULL,
+    wind_speed double precision,
+    power double precision,
+    ambient_temperature double precision
+) ON COMMIT DELETE ROWS
+"""
+
+STAGE_COPY_SQL = "COPY data_ingest_stage FROM STDIN WITH (FORMAT csv)"
+
+STAGE_UPSERT_SQL = """
+INSERT INTO data (asset_id, ts, wind_speed, power, ambient_temperature)
+SELECT %(asset_id)s, ts, wind_speed, power, ambient_temperature
+FROM data_ingest_stage
+ON CONFLICT (asset_id, ts) DO UPDATE SET
+    wind_speed = EXCLUDED.wind_speed,
+    power = EXCLUDED.power,
+    ambient_temperature = EXCLUDED.ambient_temperature,
+    created_at = now()
+"""
+
+
+class IngestError(Exception):
+    pass
+
+
+def parse_row(record: Any) -> Row:
+    if not isinstance(record, dict):
+        raise ValueError("Registro deve ser um objeto JSON")
+
+    unknown = set(record) - set(INGEST_COLUMNS)
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(sorted(unknown))}")
+
+    raw_ts = record.get("ts")
+    if not isinstance(raw_ts, str):
+        raise ValueError("Campo 'ts' ausente ou inválido")
+    try:
+        ts = datetime.fromisoformat(raw_ts)
+    except ValueError:
+        raise ValueError(f"Timestamp inválido: {raw_ts}")
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+
+    values = []
+    for column in VALUE_COLUMNS:
+        value = record.get(column)
+        if value is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Valor inválido para '{column}': {value!r}")
+            value = float(value)
+            if not math.isfinite(value):
+                raise ValueError(f"Valor não finito para '{column}'")
+        values.append(value)
+
+    return (ts, *values)
+
+
+def iter_columnar_records(payload: Any) -> Iterable[Dict[str, Any]]:
+    if not isinstance(payload, dict) or "ts" not in payload:
+        raise ValueError("Payload colunar deve ser um objeto com a coluna 'ts'")
+
+    columns = {name: payload[name] for name in INGEST_COLUMNS if name in payload}
+    unknown = set(payload) - set(INGEST_COLUMNS)
+    if unknown:
+        raise ValueError(f"Colunas desconhecidas: {', '.join(sorted(unknown))}")
+    if not all(isinstance(values, list) for values in columns.values()):
+        raise ValueError("Cada coluna deve ser uma lista")
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Todas as colunas devem ter o mesmo tamanho")
+
+    for index in range(lengths.pop() if lengths else 0):
+        yield {name: values[index] for name, values in columns.items()}
+
+
+class DataIngestService:
+    """Grava lotes de registros de um ativo na tabela data com upsert
+    idempotente em (ativo, ts).
+
+    Os registros são validados um a um e acumulados em blocos de
+    ``chunk_size``; no PostgreSQL cada bloco entra via COPY numa tabela
+    temporária e é aplicado com um único INSERT ... ON CONFLICT. O ativo
+    precisa existir; a rota resolve o nome e responde 404 para ativos
+    desconhecidos.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        asset_id: int,
+        chunk_size: int = BULK_INGEST_CHUNK_SIZE,
+        max_errors: int = BULK_INGEST_MAX_ERRORS,
+    ):
+        self.db = db
+        self.asset_id = asset_id
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: List[BulkIngestErrorSchema] = []
+        # Último valor vence quando o mesmo ts aparece mais de uma vez no bloco;
+        # os registros substituídos ainda contam como aceitos (_buffered conta
+        # todos os registros válidos do bloco, não só os ts distintos)
+        self._pending: Dict[datetime, Row] = {}
+        self._buffered = 0
+
+    def add(self, position: int, record: Any) -> None:
+        try:
+            row = parse_row(record)
+        except ValueError as e:
+            self.reject(position, str(e))
+            return
+
+        self._pending[row[0]] = row
+        self._buffered += 1
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def add_ndjson_lines(self, lines: Iterable[Tuple[int, bytes]]) -> None:
+        for position, line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.reject(position, "JSON inválido")
+                continue
+            self.add(position, record)
+
+    def add_columnar(self, payload: Any) -> None:
+        for position, record in enumerate(iter_columnar_records(payload)):
+            self.add(position, record)
+
+    def reject(self, position: int, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(BulkIngestErrorSchema(position=position, detail=detail))
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+
+        rows = list(self._pending.values())
+        buffered = self._buffered
+        self._pending.clear()
+        self._buffered = 0
+
+        try:
+            if self.db.get_bind().dialect.name == "postgresql":
+                self._copy_upsert(self.asset_id, rows)
+            else:
+                self._insert_upsert(self.asset_id, rows)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise IngestError(
+                f"Erro ao gravar lote após {self.accepted} registros: {e}"
+            ) from e
+
+        self.accepted += buffered
+
+    def result(self) -> BulkIngestResponseSchema:
+        return BulkIngestResponseSchema(
+            accepted=self.accepted, rejected=self.rejected, errors=self.errors
+        )
+
+    def _copy_upsert(self, asset_id: int, rows: List[Row]) -> None:
+        buffer = io.StringIO()
+        for ts, *values in rows:
+            buffer.write(ts.isoformat())
+            for value in values:
+                buffer.write(",")
+                if value is not None:
+                    buffer.write(repr(value))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        dbapi_connection = self.db.connection().connection
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(STAGE_TABLE_DDL)
+            cursor.copy_expert(STAGE_COPY_SQL, buffer)
+            cursor.execute(STAGE_UPSERT_SQL, {"asset_id": asset_id})
+
+    def _insert_upsert(self, asset_id: int, rows: List[Row]) -> None:
+        statement = sqlite_insert(DataModel)
+        statement = statement.on_conflict_do_update(
+            index_elements=[DataModel.asset_id, DataModel.ts],
+            set_={
+                **{column: statement.excluded[column] for column in VALUE_COLUMNS},
+                "created_at": func.now(),
+            },
+        )
+        self.db.execute(
+            statement,
+            [{"asset_id": asset_id, **dict(zip(INGEST_COLUMNS, row))} for row in rows],
+        )
@@ -11,3 +11,95 @@ DB_USER_SOURCE = os.getenv("DB_USER_SOURCE")
 DB_PASSWORD_SOURCE = os.getenv("DB_PASSWORD_SOURCE")
 
 DATABASE_URL_SOURCE = f"postgresql+psycopg2://{DB_USER_SOURCE}:{DB_PASSWORD_SOURCE}@{DB_HOST_SOURCE}:{DB_PORT_SOURCE}/{DB_NAME_SOURCE}"
+
+# Cache HTTP (ETag / Cache-Control)
+# Janelas cujo end_ts é mais antigo que este limite são tratadas como imutáveis.
+CACHE_IMMUTABLE_AFTER_SECONDS = int(os.getenv("CACHE_IMMUTABLE_AFTER_SECONDS", "86400"))
+CACHE_MAX_AGE_SECONDS = int(os.getenv("CACHE_MAX_AGE_SECONDS", "3600"))
+# Incrementar para invalidar todos os ETags já emitidos (ex.: mudança de formato).
+DATA_VERSION = os.getenv("DATA_VERSION", "1")
+
+# Compressão das respostas (Content-Encoding negociado via Accept-Encoding)
+COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if encoding.strip()
+]
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# Ingestão em lote (POST /api/v1/data/bulk)
+BULK_INGEST_CHUNK_SIZE = int(os.getenv("BULK_INGEST_CHUNK_SIZE", "10000"))
+BULK_INGEST_MAX_ERRORS = int(os.getenv("BULK_INGEST_MAX_ERRORS", "100"))
+
+# Métricas no formato Prometheus (GET /metrics). Desligado por padrão: o
+# endpoint não exige API key e expõe rotas, latências e o estado do pool, então
+# só deve ser habilitado com a porta acessível apenas ao coletor.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+# Perfil (cProfile) das requisições mais lentas que o limite, gravado em
+# PROFILING_DIR. Desligado por padrão: o cProfile deixa as requisições mais lentas.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+PROFILING_THRESHOLD_MS = float(os.getenv("PROFILING_THRESHOLD_MS", "500"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", ".cache/profiles")
+
+# Feed de alterações (GET /api/v1/data/changes)
+# Linhas mais novas que este atraso ainda não são entregues, para não pular
+# transações concorrentes que ainda não fizeram commit.
+CHANGES_SAFETY_LAG_SECONDS = int(os.getenv("CHANGES_SAFETY_LAG_SECONDS", "5"))
+
+# Ativo (turbina) usado quando a requisição ou a ingestão não informa um.
+# Criado junto com as tabelas; bancos de um único ativo continuam funcionando.
+DEFAULT_ASSET_NAME = os.getenv("DEFAULT_ASSET_NAME", "default")
+
+# Pool de conexões do SQLAlchemy
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Controle de admissão das rotas de dados. Cada API key tem um token bucket de
+# RATE_LIMIT_PER_SECOND requisições por segundo com rajadas de até
+# RATE_LIMIT_BURST; as colunas rate_limit_per_second e rate_limit_burst de
+# api_keys sobrepõem esses valores por chave (0 deixa a chave sem limite).
+# Acima do limite a resposta é 429 com Retry-After.
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "50"))
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "100"))
+# No máximo ADMISSION_MAX_CONCURRENCY requisições usam o banco ao mesmo tempo
+# (0: a capacidade do pool, DB_POOL_SIZE + DB_MAX_OVERFLOW). As demais esperam
+# uma vaga por até ADMISSION_QUEUE_TIMEOUT_SECONDS e então recebem 503 com
+# Retry-After de ADMISSION_RETRY_AFTER_SECONDS.
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "0"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "2")
+)
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+# Chaves válidas ficam em memória por AUTH_CACHE_TTL_SECONDS, evitando uma
+# consulta ao banco por requisição (0 desliga). Chaves desativadas ou limites
+# alterados valem depois desse prazo.
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+
+# Serialização das páginas de GET /api/v1/data/: "python" (pydantic, padrão)
+# ou "database" (o PostgreSQL monta o JSON das linhas com json_agg e a API
+# devolve os bytes sem convertê-los em objetos Python; em outros bancos
+# continua com o pydantic)
+DATA_JSON_RENDERER = os.getenv("DATA_JSON_RENDERER", "python").lower()
+
+# Acompanhamento ao vivo (GET /api/v1/data/stream, Server-Sent Events). Um
+# único leitor busca as alterações novas em lotes de LIVE_BATCH_SIZE e as
+# repassa a todos os inscritos (no máximo LIVE_MAX_SUBSCRIBERS). No PostgreSQL
+# ele é acordado por LISTEN/NOTIFY (LIVE_NOTIFY) e confere o feed a cada
+# LIVE_NOTIFY_POLL_SECONDS mesmo sem aviso; sem NOTIFY consulta a cada
+# LIVE_POLL_INTERVAL_SECONDS. Um inscrito com mais de LIVE_QUEUE_SIZE lotes
+# pendentes volta a ler do banco a partir do seu cursor.
+LIVE_NOTIFY = os.getenv("LIVE_NOTIFY", "true").lower() in ("1", "true", "yes")
+LIVE_POLL_INTERVAL_SECONDS = float(os.getenv("LIVE_POLL_INTERVAL_SECONDS", "2"))
+LIVE_NOTIFY_POLL_SECONDS = float(os.getenv("LIVE_NOTIFY_POLL_SECONDS", "30"))
+LIVE_BATCH_SIZE = int(os.getenv("LIVE_BATCH_SIZE", "1000"))
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "100"))
+LIVE_MAX_SUBSCRIBERS = int(os.getenv("LIVE_MAX_SUBSCRIBERS", "100"))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+
+import admission
+import pytest
+from admission import (
+    ConcurrencyLimiter,
+    RateLimiter,
+    TokenBucket,
+    admission_control,
+)
+from auth import get_current_user
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _user(rate=1.0, burst=2, api_key_id=1):
+    return {
+        "api_key_id": api_key_id,
+        "rate_limit_per_second": rate,
+        "rate_limit_burst": burst,
+    }
+
+
+class TestTokenBucket:
+
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+
+        assert [bucket.take(0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.take(0.0) == pytest.approx(0.5)
+        assert bucket.take(0.5) == 0.0
+
+    def test_tokens_capped_at_burst(self):
+        bucket = TokenBucket(rate=10.0, burst=2, now=0.0)
+
+        assert bucket.take(100.0) == 0.0
+        assert bucket.take(100.0) == 0.0
+        assert bucket.take(100.0) > 0
+
+
+class TestRateLimiter:
+
+    def test_buckets_are_per_key(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock)
+
+        assert limiter.acquire(1, rate=1.0, burst=1) == 0.0
+        assert limiter.acquire(1, rate=1.0, burst=1) == pytest.approx(1.0)
+        assert limiter.acquire(2, rate=1.0, burst=1) == 0.0
+
+        clock.now = 1.0
+        assert limiter.acquire(1, rate=1.0, burst=1) == 0.0
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = RateLimiter(FakeClock())
+
+        assert all(limiter.acquire(1, rate=0, burst=0) == 0.0 for _ in range(100))
+
+    def test_changed_limits_do_not_refill(self):
+        limiter = RateLimiter(FakeClock())
+        limiter.acquire(1, rate=1.0, burst=1)
+
+        assert limiter.acquire(1, rate=1.0, burst=5) > 0
+
+
+class TestConcurrencyLimiter:
+
+    def test_rejects_after_timeout_when_full(self):
+        limiter = ConcurrencyLimiter(capacity=1, timeout=0.01)
+
+        assert asyncio.run(limiter.acquire())
+        assert not asyncio.run(limiter.acquire())
+        assert limiter.in_flight == 1
+
+        limiter.release()
+        assert asyncio.run(limiter.acquire())
+
+    def test_waits_for_released_slot(self):
+        limiter = ConcurrencyLimiter(capacity=1, timeout=5)
+        asyncio.run(limiter.acquire())
+        threading.Timer(0.05, limiter.release).start()
+
+        assert asyncio.run(limiter.acquire())
+        assert limiter.in_flight == 1
+
+    def test_waits_on_the_event_loop(self):
+        limiter = ConcurrencyLimiter(capacity=1, timeout=5)
+
+        async def scenario():
+            await limiter.acquire()
+            waiting = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+            await asyncio.sleep(0.01)
+
+            # As duas esperas não bloqueiam o loop e são atendidas em ordem
+            limiter.release()
+            assert await waiting[0]
+            assert not waiting[1].done()
+            limiter.release()
+            return await waiting[1]
+
+        assert asyncio.run(scenario())
+        assert limiter.in_flight == 1
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(admission, "rate_limiter", RateLimiter(FakeClock()))
+    monkeypatch.setattr(
+        admission, "concurrency_limiter", ConcurrencyLimiter(capacity=1, timeout=0)
+    )
+
+    app = FastAPI()
+
+    @app.get("/data", dependencies=[Depends(admission_control)])
+    def data():
+        return {"in_flight": admission.concurrency_limiter.in_flight}
+
+    return app
+
+
+class TestAdmissionControl:
+
+    def test_rate_limited_with_retry_after(self, app):
+        app.dependency_overrides[get_current_user] = lambda: _user(rate=0.5, burst=1)
+        client = TestClient(app)
+
+        assert client.get("/data").json() == {"in_flight": 1}
+
+        response = client.get("/data")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+
+    def test_slot_released_after_response(self, app):
+        app.dependency_overrides[get_current_user] = lambda: _user(rate=0)
+        client = TestClient(app)
+
+        assert client.get("/data").status_code == 200
+        assert client.get("/data").status_code == 200
+        assert admission.concurrency_limiter.in_flight == 0
+
+    def test_overload_sheds_with_503(self, app):
+        app.dependency_overrides[get_current_user] = lambda: _user(rate=0)
+        client = TestClient(app)
+        asyncio.run(admission.concurrency_limiter.acquire())
+
+        response = client.get("/data")
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    def test_no_auth_lookup_without_a_slot(self, app):
+        lookups = []
+
+        def user():
+            lookups.append(True)
+            return _user(rate=0)
+
+        app.dependency_overrides[get_current_user] = user
+        client = TestClient(app)
+        asyncio.run(admission.concurrency_limiter.acquire())
+
+        assert client.get("/data").status_code == 503
+        assert lookups == []
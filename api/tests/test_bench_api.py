@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+from benchmarks.bench_api import (
+    check_response,
+    compare_to_baseline,
+    measure,
+    page_for_depth,
+    run_matrix,
+    summarize,
+)
+
+
+class TestBenchApi:
+
+    def test_summarize(self):
+        stats = summarize([0.001, 0.002, 0.003, 0.004], wall_seconds=0.01)
+
+        assert stats["p50_ms"] == 2.0
+        assert stats["max_ms"] == 4.0
+        assert stats["throughput_rps"] == 400.0
+
+    def test_page_for_depth(self):
+        assert page_for_depth("first", 10) == 1
+        assert page_for_depth("middle", 10) == 5
+        assert page_for_depth("last", 10) == 10
+        assert page_for_depth("last", 0) == 1
+
+    def test_compare_to_baseline(self):
+        baseline = [
+            {"case": "a", "p50_ms": 10.0, "throughput_rps": 100.0},
+            {"case": "b", "p50_ms": 10.0, "throughput_rps": 100.0},
+            {"case": "d", "p50_ms": 10.0, "throughput_rps": 100.0},
+        ]
+        results = [
+            {"case": "a", "p50_ms": 11.0, "throughput_rps": 95.0},
+            {"case": "b", "p50_ms": 15.0, "throughput_rps": 60.0},
+            {"case": "c", "p50_ms": 99.0, "throughput_rps": 1.0},
+        ]
+
+        regressions = compare_to_baseline(
+            results, baseline, ["p50_ms", "throughput_rps"], threshold=0.2
+        )
+
+        assert regressions[0] == "d: ausente nesta execução"
+        assert len(regressions) == 3
+        assert all(regression.startswith("b:") for regression in regressions[1:])
+
+    def test_rate_limited_key_stops_the_benchmark(self):
+        request = httpx.Request("GET", "http://bench/api/v1/data/")
+        assert check_response(httpx.Response(200, request=request)) is None
+
+        async def scenario():
+            transport = httpx.MockTransport(lambda request: httpx.Response(429))
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                await measure(client, "/api/v1/data/", {}, requests=5, warmup=0)
+
+        with pytest.raises(SystemExit, match="429"):
+            asyncio.run(scenario())
+
+    def test_cases_are_keyed_by_request_parameters(self):
+        def handler(request):
+            return httpx.Response(200, json={"paging": {"total_pages": 4}})
+
+        async def scenario(data_size):
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler), base_url="http://bench"
+            ) as client:
+                return await run_matrix(
+                    client, data_size, {}, [25], [""], ["last"], requests=1, warmup=0
+                )
+
+        before, after = asyncio.run(scenario(1000)), asyncio.run(scenario(1010))
+
+        assert [entry["case"] for entry in before] == [
+            "/api/v1/data/|window=all|page_size=25|fields=all|page=last"
+        ]
+        assert [entry["case"] for entry in after] == [
+            entry["case"] for entry in before
+        ]
+        assert (before[0]["rows"], after[0]["rows"]) == (1000, 1010)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+from http_cache import build_etag, cache_control, etag_matches, is_immutable_window
+
+
+class TestEtag:
+
+    def test_etag_is_stable_for_same_query(self):
+        params = {"start_ts": datetime(2024, 1, 1), "page": 1, "page_size": 25}
+
+        assert build_etag(params, "1") == build_etag(dict(params), "1")
+
+    def test_etag_changes_with_version(self):
+        params = {"page": 1}
+
+        assert build_etag(params, "1") != build_etag(params, "2")
+
+    def test_etag_is_strong_and_quoted(self):
+        etag = build_etag({"page": 1}, "1")
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert not etag.startswith("W/")
+
+    def test_etag_matches(self):
+        etag = build_etag({"page": 1}, "1")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert etag_matches(f"W/{etag}", etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestImmutableWindow:
+
+    def test_open_window_is_not_immutable(self):
+        assert is_immutable_window(None) is False
+
+    def test_recent_window_is_not_immutable(self):
+        assert is_immutable_window(datetime.utcnow()) is False
+
+    def test_old_window_is_immutable(self):
+        assert is_immutable_window(datetime.utcnow() - timedelta(days=30)) is True
+
+    def test_cache_control(self):
+        assert "immutable" in cache_control(True)
+        assert "no-cache" in cache_control(False)
@@ -0,0 +1,186 @@
+from datetime import datetime
+
+import pytest
+from db import Base
+from fastapi import HTTPException
+from models.data import Asset, Data
+from routes.data import get_ingest_service
+from services import DataIngestService, DataService
+from services.ingest_service import iter_columnar_records, parse_row
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture(scope="function")
+def test_db():
+    engine = create_engine(
+        "sqlite:///./test_ingest.db", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def asset_id(test_db):
+    return DataService(test_db).get_asset_id("default")
+
+
+class TestParseRow:
+
+    def test_parse_valid_row(self):
+        row = parse_row({"ts": "2024-01-01T10:00:00", "wind_speed": 7, "power": None})
+
+        assert row == (datetime(2024, 1, 1, 10, 0, 0), 7.0, None, None)
+
+    def test_parse_converts_timezone_to_utc(self):
+        row = parse_row({"ts": "2024-01-01T10:00:00-03:00"})
+
+        assert row[0] == datetime(2024, 1, 1, 13, 0, 0)
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"wind_speed": 1.0},
+            {"ts": "not-a-date"},
+            {"ts": "2024-01-01T10:00:00", "power": "100"},
+            {"ts": "2024-01-01T10:00:00", "power": True},
+            {"ts": "2024-01-01T10:00:00", "unknown": 1.0},
+            ["2024-01-01T10:00:00"],
+        ],
+    )
+    def test_parse_invalid_row(self, record):
+        with pytest.raises(ValueError):
+            parse_row(record)
+
+    def test_columnar_length_mismatch(self):
+        with pytest.raises(ValueError):
+            list(iter_columnar_records({"ts": ["2024-01-01"], "power": [1.0, 2.0]}))
+
+
+class TestDataIngestService:
+
+    def test_ndjson_ingest_counts(self, test_db, asset_id):
+        service = DataIngestService(test_db, asset_id, chunk_size=2)
+
+        service.add_ndjson_lines(
+            [
+                (1, b'{"ts": "2024-01-01T10:00:00", "wind_speed": 7.5}'),
+                (2, b'{"ts": "2024-01-01T10:01:00", "wind_speed": 8.0}'),
+                (3, b"not json"),
+                (4, b""),
+                (5, b'{"ts": "2024-01-01T10:02:00", "power": "x"}'),
+                (6, b'{"ts": "2024-01-01T10:03:00", "power": 900.0}'),
+            ]
+        )
+        service.flush()
+        result = service.result()
+
+        assert result.accepted == 3
+        assert result.rejected == 2
+        assert [error.position for error in result.errors] == [3, 5]
+        assert test_db.query(Data).count() == 3
+
+    def test_upsert_is_idempotent(self, test_db, asset_id):
+        payload = {
+            "ts": ["2024-01-01T10:00:00", "2024-01-01T10:01:00"],
+            "wind_speed": [7.5, 8.0],
+            "power": [800.0, None],
+        }
+
+        for _ in range(2):
+            service = DataIngestService(test_db, asset_id)
+            service.add_columnar(payload)
+            service.flush()
+
+        assert test_db.query(Data).count() == 2
+
+        service = DataIngestService(test_db, asset_id)
+        service.add_columnar({"ts": ["2024-01-01T10:00:00"], "wind_speed": [9.9]})
+        service.flush()
+
+        updated = test_db.query(Data).filter(Data.ts == datetime(2024, 1, 1, 10)).one()
+        test_db.refresh(updated)
+        assert updated.wind_speed == 9.9
+        assert updated.power is None
+        assert test_db.query(Data).count() == 2
+
+    def test_duplicate_ts_in_chunk_keeps_last(self, test_db, asset_id):
+        service = DataIngestService(test_db, asset_id)
+        service.add(1, {"ts": "2024-01-01T10:00:00", "wind_speed": 1.0})
+        service.add(2, {"ts": "2024-01-01T10:00:00", "wind_speed": 2.0})
+        service.add(3, {"ts": "2024-01-01T10:01:00", "wind_speed": 3.0})
+        service.flush()
+        result = service.result()
+
+        # O registro substituído conta como aceito: aceitos + rejeitados fecha
+        # com o total enviado
+        assert (result.accepted, result.rejected) == (3, 0)
+        assert test_db.query(Data).filter(
+            Data.ts == datetime(2024, 1, 1, 10)
+        ).one().wind_speed == 2.0
+
+    def test_same_ts_in_different_assets(self, test_db):
+        assets = [Asset(name="wtg-01"), Asset(name="wtg-02")]
+        test_db.add_all(assets)
+        test_db.commit()
+
+        for asset in assets:
+            service = DataIngestService(test_db, asset.id)
+            service.add(1, {"ts": "2024-01-01T10:00:00", "wind_speed": 1.0})
+            service.flush()
+
+        assert test_db.query(Data.asset_id).order_by(Data.asset_id).all() == [
+            (asset.id,) for asset in assets
+        ]
+
+    def test_unknown_asset_is_not_found(self, test_db):
+        data_service = DataService(test_db)
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_ingest_service("wtg-99", data_service, current_user={})
+
+        assert exc_info.value.status_code == 404
+        assert data_service.get_asset_id("wtg-99") is None
+
+    def test_failed_chunk_reports_committed_rows(self, test_db, asset_id, monkeypatch):
+        from auth import get_current_user
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from routes.data import router
+
+        service = DataIngestService(test_db, asset_id, chunk_size=1)
+        insert_upsert = service._insert_upsert
+        calls = []
+
+        def fail_second_chunk(asset_id, rows):
+            calls.append(rows)
+            if len(calls) > 1:
+                raise RuntimeError("disco cheio")
+            insert_upsert(asset_id, rows)
+
+        monkeypatch.setattr(service, "_insert_upsert", fail_second_chunk)
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_ingest_service] = lambda: service
+        app.dependency_overrides[get_current_user] = lambda: {
+            "api_key_id": 1,
+            "rate_limit_per_second": 0,
+            "rate_limit_burst": 0,
+        }
+
+        response = TestClient(app).post(
+            "/api/v1/data/bulk",
+            content=b'{"ts": "2024-01-01T10:00:00"}\n{"ts": "2024-01-01T10:01:00"}\n',
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 500
+        assert response.json()["accepted"] == 1
+        assert "disco cheio" in response.json()["detail"]
+        assert test_db.query(Data).count() == 1
@@ -0,0 +1,171 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from db import Base
+from live import ChangeBroadcaster, Subscription, stream_changes
+from models.data import Asset, Data
+from services import DataService
+from services.data_service import encode_cursor
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+CREATED_AT = datetime(2024, 2, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="function")
+def session_factory():
+    engine = create_engine(
+        "sqlite:///./test_live.db", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    try:
+        yield SessionLocal
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+def _insert(session_factory, start: int, count: int, asset_id: int = 1):
+    session = session_factory()
+    try:
+        session.add_all(
+            Data(
+                asset_id=asset_id,
+                ts=datetime(2024, 1, 1) + timedelta(minutes=start + i),
+                wind_speed=float(start + i),
+                power=float(start + i) * 10,
+                created_at=CREATED_AT + timedelta(seconds=start + i),
+            )
+            for i in range(count)
+        )
+        session.commit()
+    finally:
+        session.close()
+
+
+def _batch(session_factory, cursor=None):
+    session = session_factory()
+    try:
+        return DataService(session).get_change_batch(cursor, 1000)
+    finally:
+        session.close()
+
+
+def _payload(event: str) -> dict:
+    lines = dict(line.split(": ", 1) for line in event.strip().split("\n"))
+    return {"id": lines["id"], **json.loads(lines["data"])}
+
+
+async def _take(events, count: int, timeout: float = 5) -> list:
+    return [
+        await asyncio.wait_for(events.__anext__(), timeout) for _ in range(count)
+    ]
+
+
+class TestChangeBroadcaster:
+
+    def test_publishes_new_rows_to_subscribers(self, session_factory):
+        _insert(session_factory, 0, 3)
+        broadcaster = ChangeBroadcaster(
+            session_factory, notify=False, poll_interval=0.01
+        )
+
+        async def scenario():
+            first = broadcaster.subscribe()
+            # O cursor inicial é fixado na inscrição, não pela thread do leitor:
+            # linhas gravadas logo em seguida sempre chegam pela fila
+            assert broadcaster._cursor == _batch(session_factory)[1]
+            second = broadcaster.subscribe()
+            _insert(session_factory, 3, 2)
+            return [
+                await asyncio.wait_for(subscription.queue.get(), 5)
+                for subscription in (first, second)
+            ]
+
+        try:
+            batches = asyncio.run(scenario())
+        finally:
+            broadcaster.stop()
+
+        # Começa do fim do feed: só as linhas gravadas depois da inscrição
+        for batch in batches:
+            assert [row.wind_speed for _, row in batch] == [3.0, 4.0]
+
+    def test_subscriber_limit(self, session_factory):
+        broadcaster = ChangeBroadcaster(
+            session_factory, notify=False, poll_interval=0.01, max_subscribers=1
+        )
+
+        async def scenario():
+            subscription = broadcaster.subscribe()
+            assert broadcaster.subscribe() is None
+            broadcaster.unsubscribe(subscription)
+            assert broadcaster.subscribe() is not None
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            broadcaster.stop()
+
+
+class TestStreamChanges:
+
+    def test_resumes_from_cursor_then_follows_batches(self, session_factory):
+        _insert(session_factory, 0, 4)
+        batch, _ = _batch(session_factory)
+        cursor = encode_cursor(batch[1][1].created_at, batch[1][1].id)
+
+        async def scenario():
+            subscription = Subscription(asyncio.get_running_loop(), 10)
+            events = stream_changes(
+                subscription, cursor, "power", None, session_factory
+            )
+
+            caught_up = await _take(events, 1)
+            # Lote com uma linha já entregue na leitura inicial e uma nova
+            _insert(session_factory, 4, 1)
+            batch, _ = _batch(session_factory, cursor)
+            subscription.publish(batch[-2:])
+            live = await _take(events, 1)
+            await events.aclose()
+            return caught_up + live
+
+        caught_up, live = [_payload(event) for event in asyncio.run(scenario())]
+
+        assert [row["power"] for row in caught_up["data"]] == [20.0, 30.0]
+        assert [row["power"] for row in live["data"]] == [40.0]
+        assert "wind_speed" not in live["data"][0]
+        assert live["id"] == live["next_cursor"]
+
+    def test_filters_asset_and_recovers_from_overflow(self, session_factory):
+        session = session_factory()
+        other = Asset(name="wtg-02")
+        session.add(other)
+        session.commit()
+        other_id = other.id
+        session.close()
+
+        async def scenario():
+            subscription = Subscription(asyncio.get_running_loop(), 1)
+            events = stream_changes(
+                subscription, None, None, other_id, session_factory, heartbeat=0.05
+            )
+            assert await _take(events, 1) == [": keepalive\n\n"]
+
+            _insert(session_factory, 0, 2, asset_id=1)
+            _insert(session_factory, 2, 2, asset_id=other_id)
+            batch, _ = _batch(session_factory)
+            subscription.publish(batch)
+            subscription.publish(batch)
+            await asyncio.sleep(0.01)
+            assert subscription.overflowed
+
+            received = await _take(events, 1)
+            await events.aclose()
+            return received
+
+        (event,) = asyncio.run(scenario())
+
+        assert [row["wind_speed"] for row in _payload(event)["data"]] == [2.0, 3.0]
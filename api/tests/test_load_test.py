@@ -0,0 +1,92 @@
+import random
+from datetime import datetime
+
+from benchmarks.load_test import (
+    CRAWLER,
+    MIXES,
+    StageStats,
+    Workload,
+    is_saturated,
+    summarize_stage,
+)
+
+
+class TestLoadTest:
+
+    def test_summarize_stage_separates_crawlers(self):
+        stats = StageStats(target_rps=10)
+        for _ in range(18):
+            stats.record("recent", 0.010, "200")
+        stats.record("recent", 0.050, "500")
+        stats.record("historical", 0.020, "304")
+        for _ in range(100):
+            stats.record(CRAWLER, 0.100, "200")
+
+        stage = summarize_stage(stats, elapsed=2.0, pool_before={}, pool_after={})
+
+        assert stage["achieved_rps"] == 10.0
+        assert stage["completed"] == 20
+        assert stage["crawler_requests"] == 100
+        assert stage["error_rate"] == 0.05
+        assert stage["latency_ms"]["max"] == 50.0
+        assert stage["latency_by_kind_ms"][CRAWLER]["count"] == 100
+
+    def test_summarize_stage_pool(self):
+        stats = StageStats(target_rps=1, pool_checked_out=[3.0, 15.0])
+        before = {
+            "db_pool_checkout_wait_seconds_count": 10,
+            "db_pool_checkout_wait_seconds_sum": 0.5,
+        }
+        after = {
+            "db_pool_checkout_wait_seconds_count": 30,
+            "db_pool_checkout_wait_seconds_sum": 1.5,
+            'db_pool_connections{state="size"}': 5.0,
+            'db_pool_connections{state="overflow"}': 10.0,
+            'db_pool_connections{state="max_overflow"}': 10.0,
+        }
+
+        pool = summarize_stage(stats, 1.0, before, after)["pool"]
+
+        assert pool["checkouts"] == 20
+        assert pool["mean_checkout_wait_ms"] == 50.0
+        assert pool["exhausted"] is True
+
+    def test_summarize_stage_pool_uses_max_overflow(self):
+        after = {
+            'db_pool_connections{state="size"}': 5.0,
+            'db_pool_connections{state="overflow"}': 0.0,
+        }
+
+        def exhausted(checked_out, **kwargs):
+            stats = StageStats(target_rps=1, pool_checked_out=[checked_out])
+            return summarize_stage(stats, 1.0, {}, after, **kwargs)["pool"]["exhausted"]
+
+        # Com o pool cheio ainda restam as conexões extras configuradas
+        assert exhausted(5.0, max_overflow=10) is False
+        assert exhausted(15.0, max_overflow=10) is True
+        assert exhausted(50.0, max_overflow=-1) is False
+        assert exhausted(5.0) is None
+
+    def test_is_saturated(self):
+        stage = {
+            "target_rps": 100,
+            "achieved_rps": 99.0,
+            "error_rate": 0.0,
+            "latency_ms": {"p99": 200.0},
+        }
+
+        assert not is_saturated(stage, slo_ms=500)
+        assert is_saturated({**stage, "achieved_rps": 90.0}, slo_ms=500)
+        assert is_saturated({**stage, "error_rate": 0.02}, slo_ms=500)
+        assert is_saturated(stage, slo_ms=100)
+
+    def test_workload_stays_in_window(self):
+        min_ts, max_ts = datetime(2024, 1, 1), datetime(2024, 1, 31)
+        workload = Workload(min_ts, max_ts, MIXES["default"], random.Random(1))
+
+        for _ in range(200):
+            kind, path, params = workload.next_request()
+            assert kind in MIXES["default"]
+            if "start_ts" in params:
+                assert min_ts <= datetime.fromisoformat(params["start_ts"])
+                assert datetime.fromisoformat(params["end_ts"]) <= max_ts
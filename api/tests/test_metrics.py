@@ -0,0 +1,106 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from metrics import MetricsMiddleware, MetricsRegistry
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestRegistry:
+
+    def test_counter_render(self, registry):
+        counter = registry.counter("hits_total", "Hits", ("route",))
+        counter.inc(route="/a")
+        counter.inc(2, route="/a")
+
+        output = registry.render()
+
+        assert "# TYPE hits_total counter" in output
+        assert 'hits_total{route="/a"} 3' in output
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        output = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{le="1"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+        assert "latency_seconds_count 3" in output
+        assert "latency_seconds_sum 5.55" in output
+
+    def test_gauge_function(self, registry):
+        gauge = registry.gauge("pool_connections", "Pool", ("state",))
+        gauge.set_function(lambda: [(("checked_out",), 2)])
+
+        assert 'pool_connections{state="checked_out"} 2' in registry.render()
+
+    def test_pool_gauge_reports_max_overflow(self, monkeypatch):
+        import metrics
+
+        monkeypatch.setattr(metrics.POOL_CONNECTIONS, "_function", None)
+        engine = create_engine(
+            "sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=3
+        )
+        metrics.instrument_pool(engine.pool)
+
+        values = metrics.POOL_CONNECTIONS.values()
+
+        assert values[("size",)] == 2
+        assert values[("overflow",)] == 0
+        assert values[("max_overflow",)] == 3
+
+    def test_label_mismatch(self, registry):
+        counter = registry.counter("hits_total", "Hits", ("route",))
+
+        with pytest.raises(ValueError):
+            counter.inc(path="/a")
+
+    def test_duplicate_name(self, registry):
+        registry.counter("hits_total", "Hits")
+
+        with pytest.raises(ValueError):
+            registry.counter("hits_total", "Hits")
+
+    def test_metric_base_is_abstract(self):
+        from metrics import _Metric
+
+        with pytest.raises(TypeError):
+            _Metric("hits_total", "Hits")
+
+    def test_label_escaping(self, registry):
+        counter = registry.counter("hits_total", "Hits", ("route",))
+        counter.inc(route='a"b')
+
+        assert 'hits_total{route="a\\"b"} 1' in registry.render()
+
+
+class TestMetricsMiddleware:
+
+    def test_records_route_template(self):
+        from metrics import REQUEST_DURATION
+
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: int):
+            return {"id": item_id}
+
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        snapshot = REQUEST_DURATION.snapshot()
+        assert snapshot[("GET", "/items/{item_id}", "200")][0][-1] >= 0
+        assert sum(snapshot[("GET", "/items/{item_id}", "200")][0]) == 2
+        assert sum(snapshot[("GET", "unmatched", "404")][0]) >= 1
@@ -0,0 +1,41 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from profiling import ProfilingMiddleware
+
+
+def build_client(directory, threshold_ms):
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware, directory=str(directory), threshold_ms=threshold_ms
+    )
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int):
+        return {"id": item_id}
+
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+
+    def test_writes_profile_above_threshold(self, tmp_path):
+        client = build_client(tmp_path, threshold_ms=0)
+
+        response = client.get("/items/1", params={"page_size": 10})
+
+        assert response.status_code == 200
+        assert len(list(tmp_path.glob("*.prof"))) == 1
+        assert len(list(tmp_path.glob("*.txt"))) == 1
+        metadata = json.loads(next(tmp_path.glob("*.json")).read_text())
+        assert metadata["route"] == "/items/{item_id}"
+        assert metadata["query_string"] == "page_size=10"
+        assert metadata["status"] == 200
+
+    def test_skips_fast_requests(self, tmp_path):
+        client = build_client(tmp_path, threshold_ms=60_000)
+
+        client.get("/items/1")
+
+        assert list(tmp_path.iterdir()) == []
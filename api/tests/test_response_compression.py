@@ -0,0 +1,143 @@
+import asyncio
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from http_cache import etag_matches
+from response_compression import CompressionMiddleware, negotiate_encoding
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    def large():
+        return JSONResponse(
+            {"data": [{"wind_speed": 1.0}] * 200}, headers={"ETag": '"abc"'}
+        )
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        def events():
+            for i in range(3):
+                yield f"data: {'x' * 200}{i}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse("a" * 500)
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+
+    return TestClient(app)
+
+
+class TestNegotiation:
+
+    def test_prefers_server_order_on_equal_quality(self):
+        assert negotiate_encoding("gzip, zstd, br", ["zstd", "br", "gzip"]) == "zstd"
+
+    def test_respects_quality_values(self):
+        assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5", ["zstd", "gzip"]) == "gzip"
+
+    def test_zero_quality_excludes(self):
+        assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+
+    def test_wildcard(self):
+        assert negotiate_encoding("*", ["br", "gzip"]) == "br"
+
+    def test_no_header(self):
+        assert negotiate_encoding(None, ["gzip"]) is None
+        assert negotiate_encoding("identity", ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+
+    def test_compresses_large_json(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert len(response.json()["data"]) == 200
+
+    def test_etag_gets_encoding_suffix(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["etag"] == '"abc-gzip"'
+        assert etag_matches(response.headers["etag"], '"abc"')
+
+    def test_small_response_is_not_compressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_identity_is_not_compressed(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == '"abc"'
+
+    def test_event_stream_passes_through(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("data:") == 3
+
+    def test_text_is_compressed(self, client):
+        response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "a" * 500
+
+    def test_not_modified_keeps_encoding_suffix(self, client):
+        response = client.get(
+            "/not-modified",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'},
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == '"abc-gzip"'
+
+        # O cliente validou a representação sem compressão
+        response = client.get(
+            "/not-modified",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc"'},
+        )
+
+        assert response.headers["etag"] == '"abc"'
+
+    def test_event_stream_headers_are_not_held(self):
+        sent = []
+
+        async def app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream")],
+                }
+            )
+            # O cliente recebe os cabeçalhos antes do primeiro evento
+            assert [message["type"] for message in sent] == ["http.response.start"]
+            await send({"type": "http.response.body", "body": b"data: x\n\n"})
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app, minimum_size=1)(scope, None, send))
+
+        assert sent[1]["body"] == b"data: x\n\n"
+        assert b"content-encoding" not in dict(sent[0]["headers"])
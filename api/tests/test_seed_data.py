@@ -0,0 +1,96 @@
+import struct
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from db import Base
+from models.data import Data
+from models.seed_data import (
+    MINUTES_PER_DAY,
+    RATED_POWER,
+    VALUE_COLUMNS,
+    encode_copy_binary,
+    generate_days,
+    iter_chunks,
+    seed_data,
+)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class TestGenerator:
+
+    def test_deterministic(self):
+        first = generate_days(7, date(2024, 1, 1), 3)
+        second = generate_days(7, date(2024, 1, 1), 3)
+
+        for column in ("ts",) + VALUE_COLUMNS:
+            assert np.array_equal(first[column], second[column], equal_nan=True)
+
+    def test_independent_of_chunk_size(self):
+        whole = generate_days(7, date(2024, 1, 1), 10)
+        chunks = list(iter_chunks(7, date(2024, 1, 1), 10, chunk_days=3))
+
+        for column in ("ts",) + VALUE_COLUMNS:
+            joined = np.concatenate([chunk[column] for chunk in chunks])
+            assert np.array_equal(whole[column], joined, equal_nan=True)
+
+    def test_plausible_values(self):
+        chunk = generate_days(7, date(2024, 1, 1), 60)
+
+        assert len(chunk["ts"]) <= 60 * MINUTES_PER_DAY
+        assert np.all(np.diff(chunk["ts"]).astype(int) >= 1)
+        assert 4 < np.nanmean(chunk["wind_speed"]) < 10
+        assert np.nanmin(chunk["power"]) >= 0
+        assert np.nanmax(chunk["power"]) <= RATED_POWER
+        assert 10 < np.nanmean(chunk["ambient_temperature"]) < 35
+
+
+class TestCopyBinary:
+
+    def test_encodes_rows_and_nulls(self):
+        chunk = {
+            "ts": np.array(
+                ["2000-01-01T00:00", "2000-01-01T00:01"], dtype="datetime64[m]"
+            ),
+            "wind_speed": np.array([1.5, np.nan]),
+            "power": np.array([10.0, 20.0]),
+            "ambient_temperature": np.array([25.0, 26.0]),
+        }
+
+        encoded = encode_copy_binary(chunk, asset_id=3)
+
+        complete_row = struct.pack(
+            "!hiiiqididid", 5, 4, 3, 8, 0, 8, 1.5, 8, 10.0, 8, 25.0
+        )
+        null_row = struct.pack(
+            "!hiiiqiidid", 5, 4, 3, 8, 60_000_000, -1, 8, 20.0, 8, 26.0
+        )
+        assert encoded == complete_row + null_row
+
+
+class TestSeedData:
+
+    def test_seed_sqlite(self):
+        engine = create_engine("sqlite:///./test_seed_data.db")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        try:
+            total = seed_data(
+                date(2024, 1, 1),
+                days=2,
+                seed=7,
+                chunk_days=1,
+                session_factory=session_factory,
+            )
+
+            session = session_factory()
+            assert session.query(Data).count() == total > 0
+            assert session.query(Data).order_by(Data.ts).first().ts >= datetime(
+                2024, 1, 1
+            )
+            session.close()
+        finally:
+            Base.metadata.drop_all(bind=engine)
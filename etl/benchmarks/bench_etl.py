@@ -0,0 +1,293 @@
+"""Benchmark das etapas de transformação e carga do ETL.
+
+Gera dados brutos sintéticos de 1 minuto (como os devolvidos pela API) e
+mede ``DataETL.transform_data`` e ``DataETL.load_data`` para cada
+combinação de linhas e campos: tempo, pico de memória (tracemalloc) e
+linhas/s. A carga roda contra SQLite (padrão, arquivo temporário) ou
+contra o PostgreSQL informado em ``--database-url``, sempre em tabelas
+recriadas a cada caso.
+
+Uso:
+    uv run python -m benchmarks.bench_etl --rows 10000,100000,1000000 \\
+        --fields 3,10,50 --output results.json
+
+Para volumes grandes use ``--input frame`` (evita montar milhões de
+dicionários) e ``--stages transform``: a carga atual faz um merge por
+ponto e fica limitada por ``--max-load-rows``.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from db import Base
+from main import DataETL
+from models.data import Signal
+from settings import setup_logging
+
+BASE_FIELDS = ["wind_speed", "power", "ambient_temperature"]
+AGGREGATIONS = ["mean", "min", "max", "std"]
+
+
+def field_names(count: int) -> List[str]:
+    extra = [f"extra_{index:02d}" for index in range(len(BASE_FIELDS), count)]
+    return (BASE_FIELDS + extra)[:count]
+
+
+def build_raw_frame(rows: int, fields: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        rng.normal(10.0, 3.0, size=(rows, fields)).round(3),
+        columns=field_names(fields),
+    )
+    ts = pd.date_range("2024-01-01", periods=rows, freq="min")
+    frame.insert(0, "ts", ts.strftime("%Y-%m-%dT%H:%M:%S"))
+    return frame
+
+
+def build_raw_data(rows: int, fields: int, input_kind: str) -> Any:
+    frame = build_raw_frame(rows, fields)
+    if input_kind == "frame":
+        return frame
+    return frame.to_dict("records")
+
+
+def measure(func: Callable[[], Any], trace_memory: bool) -> Tuple[Any, float, int]:
+    """Executa ``func`` e retorna (resultado, segundos, pico do tracemalloc).
+
+    O tracemalloc deixa o código bem mais lento, então as medições de tempo
+    e de memória são feitas em execuções separadas.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _prepare_database(database_url: str, fields: List[str]):
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        Signal(name=f"{field}_{aggregation}")
+        for field in fields
+        for aggregation in AGGREGATIONS
+    )
+    session.commit()
+    return engine, session
+
+
+def _result(
+    stage: str,
+    rows: int,
+    fields: int,
+    input_kind: str,
+    backend: str,
+    timings: List[float],
+    peak: int | None,
+    output_rows: int,
+) -> Dict[str, Any]:
+    seconds = statistics.median(timings)
+    return {
+        "stage": stage,
+        "rows": rows,
+        "fields": fields,
+        "input": input_kind,
+        "backend": backend,
+        "output_rows": output_rows,
+        "seconds": round(seconds, 6),
+        "rows_per_second": round(rows / seconds, 2) if seconds else None,
+        "peak_traced_bytes": peak,
+    }
+
+
+def run(args) -> List[Dict[str, Any]]:
+    etl_processor = DataETL()
+    stages = args.stages.split(",")
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = args.database_url or f"sqlite:///{Path(tmp_dir) / 'bench.db'}"
+        backend = database_url.split(":", 1)[0]
+
+        for fields in [int(count) for count in args.fields.split(",")]:
+            for rows in [int(count) for count in args.rows.split(",")]:
+                raw_data = build_raw_data(rows, fields, args.input)
+
+                timings, peak = [], None
+                for _ in range(args.repeat):
+                    transformed, elapsed, _ = measure(
+                        lambda: etl_processor.transform_data(raw_data), False
+                    )
+                    timings.append(elapsed)
+                if args.memory and "transform" in stages:
+                    transformed, _, peak = measure(
+                        lambda: etl_processor.transform_data(raw_data), True
+                    )
+                del raw_data
+
+                if "transform" in stages:
+                    results.append(
+                        _result(
+                            "transform",
+                            rows,
+                            fields,
+                            args.input,
+                            "-",
+                            timings,
+                            peak,
+                            len(transformed),
+                        )
+                    )
+                    print(_format(results[-1]))
+
+                if "load" not in stages:
+                    continue
+                if rows > args.max_load_rows:
+                    print(f"load: {rows} linhas acima de --max-load-rows, ignorado")
+                    continue
+
+                timings, peak = [], None
+                for trace_memory in [False] * args.repeat + [True] * args.memory:
+                    engine, session = _prepare_database(
+                        database_url, field_names(fields)
+                    )
+                    try:
+                        (inserted, updated), elapsed, traced_peak = measure(
+                            lambda: etl_processor.load_data(session, transformed),
+                            trace_memory,
+                        )
+                    finally:
+                        session.close()
+                        engine.dispose()
+                    if trace_memory:
+                        peak = traced_peak
+                    else:
+                        timings.append(elapsed)
+
+                results.append(
+                    _result(
+                        "load",
+                        rows,
+                        fields,
+                        args.input,
+                        backend,
+                        timings,
+                        peak,
+                        inserted + updated,
+                    )
+                )
+                print(_format(results[-1]))
+
+    return results
+
+
+def _format(result: Dict[str, Any]) -> str:
+    return (
+        f"{result['stage']:>9} rows={result['rows']:>10} fields={result['fields']:>3} "
+        f"{result['seconds']:>10.4f}s {result['rows_per_second'] or 0:>14,.0f} rows/s "
+        f"peak {(result['peak_traced_bytes'] or 0) / 2**20:>9.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mede tempo, memória e vazão da transformação e da carga."
+    )
+    parser.add_argument(
+        "--rows",
+        type=str,
+        default="10000,100000,1000000",
+        help="Linhas brutas (1 por minuto) separadas por vírgula "
+        "(padrão: 10000,100000,1000000)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default="3,10,50",
+        help="Quantidade de campos separada por vírgula (padrão: 3,10,50)",
+    )
+    parser.add_argument(
+        "--stages",
+        type=str,
+        default="transform,load",
+        help="Etapas medidas (padrão: transform,load)",
+    )
+    parser.add_argument(
+        "--input",
+        choices=("records", "frame"),
+        default="records",
+        help="Formato da entrada do transform: lista de dicionários como a API "
+        "devolve (records) ou DataFrame (frame) (padrão: records)",
+    )
+    parser.add_argument(
+        "--database-url",
+        type=str,
+        help="Banco da etapa de carga (padrão: SQLite temporário). As tabelas "
+        "signal e data são recriadas a cada caso",
+    )
+    parser.add_argument(
+        "--max-load-rows",
+        type=int,
+        default=10_000,
+        help="Maior volume bruto usado na carga, que grava um ponto por vez "
+        "(padrão: 10000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Repetições por caso; o tempo reportado é a mediana (padrão: 1)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="Pula a execução extra com tracemalloc que mede o pico de memória",
+    )
+    parser.add_argument(
+        "--output", type=str, help="Arquivo JSON para gravar os resultados"
+    )
+
+    args = parser.parse_args()
+    setup_logging("WARNING")
+
+    results = run(args)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "argv": sys.argv[1:],
+            "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from settings import get_logger
+
+logger = get_logger(__name__)
+
+STATS = ("count", "mean", "min", "max", "m2")
+
+# Bytes de um ts em texto (objeto str do Python) quando os registros chegam
+# como lista de dicionários, sem a decodificação em colunas
+TEXT_TS_BYTES = 80
+
+
+class MemoryBudgetError(RuntimeError):
+    """Os dados de uma etapa não cabem no orçamento de memória configurado."""
+
+
+def frame_bytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(deep=True).sum())
+
+
+def raw_row_bytes(fields: List[str], typed: bool = True) -> int:
+    """Estimativa de bytes por linha do bloco bruto: ts e um float64 por
+    campo, com o ts em texto quando os registros não são tipados."""
+    return 8 * (1 + len(fields)) + (0 if typed else TEXT_TS_BYTES)
+
+
+def bucket_labels(ts: pd.Series) -> pd.Series:
+    """Rótulo do intervalo de 10 minutos de cada ts, como no resample do
+    ``transform_data``: o intervalo rotulado T cobre (T, T + 10 min]."""
+    return (ts - pd.Timedelta(1, "ns")).dt.floor("10min")
+
+
+def partial_aggregates(frame: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+    """Agregados parciais por intervalo: contagem, média, mínimo, máximo e soma
+    dos quadrados dos desvios (m2), combináveis entre blocos."""
+    grouped = frame[fields].groupby(bucket_labels(frame["ts"]).to_numpy())
+    count = grouped.count()
+    return pd.concat(
+        {
+            "count": count,
+            "mean": grouped.mean(),
+            "min": grouped.min(),
+            "max": grouped.max(),
+            "m2": grouped.var(ddof=0) * count,
+        },
+        axis=1,
+    )
+
+
+def combine_partials(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
+    """Combina agregados parciais do mesmo intervalo (Chan et al.)."""
+    na, nb = a["count"], b["count"]
+    n = na + nb
+    mean_a, mean_b = a["mean"].fillna(0.0), b["mean"].fillna(0.0)
+    delta = mean_b - mean_a
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (mean_a + delta * nb / n).where(n > 0)
+        m2 = a["m2"].fillna(0.0) + b["m2"].fillna(0.0) + delta**2 * na * nb / n
+
+    return pd.concat(
+        {
+            "count": n,
+            "mean": mean,
+            "min": np.fmin(a["min"], b["min"]),
+            "max": np.fmax(a["max"], b["max"]),
+            "m2": m2.where(n > 0),
+        },
+        axis=1,
+    )
+
+
+def finalize_partials(partials: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+    """Converte agregados parciais no formato de saída do ``transform_data``."""
+    count = partials["count"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(partials["m2"] / (count - 1)).where(count > 1)
+
+    columns = {}
+    for field in fields:
+        columns[f"{field}_mean"] = partials["mean"][field]
+        columns[f"{field}_min"] = partials["min"][field]
+        columns[f"{field}_max"] = partials["max"][field]
+        columns[f"{field}_std"] = std[field]
+
+    result = pd.DataFrame(columns, index=partials.index)
+    result.index.name = "ts"
+    return result.reset_index()
+
+
+class ChunkedTransformer:
+    """Agrega dados brutos em intervalos de 10 minutos bloco a bloco.
+
+    Os blocos chegam em ordem de tempo e cada um é agregado em até
+    ``chunk_rows`` linhas por vez; o último intervalo de cada bloco pode
+    continuar no próximo, então seus agregados parciais ficam retidos e são
+    combinados com os do bloco seguinte. ``feed`` retorna só os intervalos
+    fechados e ``finish`` o último. Um bloco maior que ``memory_budget``
+    bytes levanta ``MemoryBudgetError``; ``run_chunked`` dimensiona as partes
+    pelo orçamento para que isso não aconteça.
+    """
+
+    def __init__(self, fields: List[str], chunk_rows: int, memory_budget: int):
+        self.fields = fields
+        self.chunk_rows = chunk_rows
+        self.memory_budget = memory_budget
+        self._carry: Optional[pd.DataFrame] = None
+
+    def feed(self, raw_data: list[dict] | pd.DataFrame) -> pd.DataFrame:
+        frame = pd.DataFrame(raw_data)
+        if frame.empty:
+            return finalize_partials(self._empty_partials(), self.fields)
+
+        size = frame_bytes(frame)
+        if size > self.memory_budget:
+            raise MemoryBudgetError(
+                f"Bloco de {size} bytes excede o orçamento de "
+                f"{self.memory_budget} bytes; reduza a janela por bloco"
+            )
+
+        # Só copia o bloco quando as colunas ou o tipo do ts precisam mudar
+        columns = ["ts", *self.fields]
+        if list(frame.columns) != columns:
+            frame = frame.reindex(columns=columns)
+        if not pd.api.types.is_datetime64_any_dtype(frame["ts"]):
+            frame["ts"] = pd.to_datetime(frame["ts"])
+        if not frame["ts"].is_monotonic_increasing:
+            frame = frame.sort_values("ts", kind="stable")
+
+        closed = []
+        for start in range(0, len(frame), self.chunk_rows):
+            partials = partial_aggregates(
+                frame.iloc[start : start + self.chunk_rows], self.fields
+            )
+            closed.append(self._merge_carry(partials))
+
+        return finalize_partials(pd.concat(closed), self.fields)
+
+    def finish(self) -> pd.DataFrame:
+        carry, self._carry = self._carry, None
+        if carry is None:
+            carry = self._empty_partials()
+        return finalize_partials(carry, self.fields)
+
+    def _merge_carry(self, partials: pd.DataFrame) -> pd.DataFrame:
+        if self._carry is not None:
+            carried = self._carry.index[0]
+            first = partials.index[0]
+            if first < carried:
+                raise ValueError("Blocos fora de ordem de tempo")
+            if first == carried:
+                merged = combine_partials(self._carry, partials.iloc[:1])
+                partials = pd.concat([merged, partials.iloc[1:]])
+            else:
+                partials = pd.concat([self._carry, partials])
+
+        self._carry = partials.iloc[-1:]
+        return partials.iloc[:-1]
+
+    def _empty_partials(self) -> pd.DataFrame:
+        columns = pd.MultiIndex.from_product([STATS, self.fields])
+        return pd.DataFrame(
+            columns=columns, index=pd.DatetimeIndex([]), dtype="float64"
+        )
+
+
+class SpillBuffer:
+    """Acumula os blocos agregados até a carga, em ordem.
+
+    Enquanto cabem em ``memory_budget`` bytes os blocos ficam em memória;
+    acima disso vão para arquivos em ``spill_dir`` (ou levantam
+    ``MemoryBudgetError`` sem diretório). Assim a carga só começa depois de
+    toda a extração, como no modo sem blocos, sem manter tudo em memória.
+    """
+
+    def __init__(self, memory_budget: int, spill_dir: Optional[str] = None):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self._frames: List[pd.DataFrame] = []
+        self._bytes = 0
+        self._files: List[str] = []
+        self._directory: Optional[str] = None
+        self.rows = 0
+
+    def append(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+
+        self._frames.append(frame)
+        self._bytes += frame_bytes(frame)
+        self.rows += len(frame)
+        if self._bytes > self.memory_budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self.spill_dir:
+            raise MemoryBudgetError(
+                f"Agregados em memória ({self._bytes} bytes) excedem o orçamento "
+                f"de {self.memory_budget} bytes; configure TRANSFORM_SPILL_DIR"
+            )
+
+        if self._directory is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._directory = tempfile.mkdtemp(prefix="etl-spill-", dir=self.spill_dir)
+
+        path = os.path.join(self._directory, f"{len(self._files):06d}.pkl")
+        pd.concat(self._frames, ignore_index=True).to_pickle(path)
+        logger.debug(f"{self._bytes} bytes de agregados gravados em {path}")
+        self._files.append(path)
+        self._frames = []
+        self._bytes = 0
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for path in self._files:
+            yield pd.read_pickle(path)
+        if self._frames:
+            yield pd.concat(self._frames, ignore_index=True)
+
+    @property
+    def spilled_files(self) -> int:
+        return len(self._files)
+
+    def close(self) -> None:
+        if self._directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self._files = []
+        self._frames = []
+        self._bytes = 0
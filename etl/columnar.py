@@ -0,0 +1,80 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarBuffer:
+    """Decodifica páginas de registros da API direto em colunas tipadas.
+
+    ``ts`` vira datetime64[ns] (sem fuso; horários com fuso são convertidos
+    para UTC) com uma única conversão vetorizada por página, e cada campo um
+    vetor ``dtype`` com NaN para valores nulos ou ausentes. Os vetores são
+    pré-alocados e dobram de tamanho quando enchem; ``to_frame`` monta o
+    DataFrame sobre eles, sem cópia.
+    """
+
+    def __init__(
+        self, fields: List[str], dtype: str = "float64", capacity: int = 1024
+    ):
+        self.fields = fields
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self._ts = np.empty(capacity, dtype="datetime64[ns]")
+        self._values: Dict[str, np.ndarray] = {
+            field: np.empty(capacity, dtype=self.dtype) for field in fields
+        }
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ts)
+
+    def _reserve(self, rows: int) -> None:
+        required = self.size + rows
+        if required <= self.capacity:
+            return
+
+        capacity = max(self.capacity * 2, required)
+        ts = np.empty(capacity, dtype=self._ts.dtype)
+        ts[: self.size] = self._ts[: self.size]
+        self._ts = ts
+        for field, values in self._values.items():
+            grown = np.empty(capacity, dtype=self.dtype)
+            grown[: self.size] = values[: self.size]
+            self._values[field] = grown
+
+    def append(self, records: List[dict]) -> None:
+        rows = len(records)
+        if not rows:
+            return
+
+        self._reserve(rows)
+        end = self.size + rows
+
+        ts = pd.to_datetime([record["ts"] for record in records], format="ISO8601")
+        if ts.tz is not None:
+            ts = ts.tz_convert(None)
+        self._ts[self.size : end] = ts.to_numpy("datetime64[ns]")
+
+        for field, values in self._values.items():
+            # None (nulo ou campo omitido) vira NaN na conversão para float
+            values[self.size : end] = np.array(
+                [record.get(field) for record in records], dtype=self.dtype
+            )
+
+        self.size = end
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "ts": self._ts[: self.size],
+                **{
+                    field: values[: self.size]
+                    for field, values in self._values.items()
+                },
+            },
+            copy=False,
+        )
@@ -0,0 +1,68 @@
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Formato compacto (tabela data_daily): uma linha por sinal e dia com os 144
+# intervalos de 10 minutos num único float8[]. O slot i guarda o valor
+# rotulado dia + i * 10 min; intervalos sem valor ficam NULL (NaN aqui).
+SLOTS = 144
+SLOT_NS = 10 * 60 * 1_000_000_000
+
+
+def pack_daily(
+    signal_ids: np.ndarray, timestamps: Iterable, values: np.ndarray
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Agrupa pontos (sinal, ts, valor) em vetores diários de ``SLOTS`` posições.
+
+    Retorna as chaves (signal_id, day), uma por linha, e a matriz
+    ``(len(chaves), SLOTS)`` com NaN nos intervalos ausentes. Com pontos
+    repetidos vale o último.
+    """
+    ts = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    days = ts.normalize()
+    offsets = (ts - days).to_numpy("timedelta64[ns]").astype("int64")
+    if np.any(offsets % SLOT_NS):
+        raise ValueError("Timestamps fora dos intervalos exatos de 10 minutos")
+
+    keys = pd.DataFrame({"signal_id": np.asarray(signal_ids), "day": days})
+    codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+
+    matrix = np.full((len(uniques), SLOTS), np.nan)
+    matrix[codes, offsets // SLOT_NS] = np.asarray(values, dtype="float64")
+
+    return uniques.to_frame(index=False, name=["signal_id", "day"]), matrix
+
+
+def unpack_daily(
+    signal_ids: np.ndarray, days: Iterable, matrix: np.ndarray
+) -> pd.DataFrame:
+    """Inverso de ``pack_daily``: retorna (signal_id, ts, value) sem os vazios."""
+    matrix = np.asarray(matrix, dtype="float64").reshape(-1, SLOTS)
+    day_ns = (
+        pd.DatetimeIndex(pd.to_datetime(days))
+        .to_numpy("datetime64[ns]")
+        .astype("int64")
+    )
+
+    ts = (day_ns[:, None] + np.arange(SLOTS) * SLOT_NS).ravel()
+    values = matrix.ravel()
+    present = ~np.isnan(values)
+
+    return pd.DataFrame(
+        {
+            "signal_id": np.repeat(np.asarray(signal_ids), SLOTS)[present],
+            "ts": pd.to_datetime(ts[present]),
+            "value": values[present],
+        }
+    )
+
+
+def merge_slots(new: np.ndarray, existing: np.ndarray) -> np.ndarray:
+    """Sobrepõe os slots preenchidos de ``new`` aos de ``existing``."""
+    return np.where(np.isnan(new), existing, new)
+
+
+def to_db_rows(matrix: np.ndarray) -> list:
+    """Converte a matriz em listas para o float8[], com None no lugar de NaN."""
+    return np.where(np.isnan(matrix), None, matrix).tolist()
@@ -0,0 +1,250 @@
+import signal
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from db import SessionLocal, engine
+from main import DataETL, map_assets, run_etl
+from profiling import profile_run
+from run_report import RunReport
+from services import DataService, WatermarkService
+from settings import (
+    DAEMON_CHANGES_LIMIT,
+    DAEMON_INITIAL_LOOKBACK_HOURS,
+    DAEMON_LAG_SECONDS,
+    DAEMON_MAX_WINDOW_HOURS,
+    get_logger,
+)
+from windows import BUCKET, changed_windows, floor_bucket, next_window, split_window
+
+Window = Tuple[datetime, datetime]
+
+logger = get_logger(__name__)
+
+
+class EtlDaemon:
+    """Executa o ETL em ciclos, sempre sobre os intervalos recém-fechados.
+
+    Cada ativo tem seu próprio watermark e janela; a cada ciclo até
+    ``args.asset_workers`` ativos rodam em paralelo. O cliente HTTP, o pool
+    do engine e os mapas de sinais do ``DataETL`` são reaproveitados entre
+    ciclos. Com ``args.follow_changes`` cada ativo também acompanha o feed
+    /changes da API a partir de um cursor gravado no watermark, e os
+    intervalos já processados que receberam correções são refeitos.
+    SIGTERM/SIGINT pedem o encerramento: uma
+    extração em andamento para na próxima página sem gravar nada (a janela
+    é refeita na próxima execução a partir do que já está no destino) e uma
+    carga em andamento é concluída antes de o processo sair.
+    """
+
+    def __init__(
+        self,
+        args,
+        etl_processor: Optional[DataETL] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self.args = args
+        self.interval = args.interval
+        self.lag = timedelta(seconds=DAEMON_LAG_SECONDS)
+        self.max_window = timedelta(hours=DAEMON_MAX_WINDOW_HOURS)
+        self.initial_lookback = timedelta(hours=DAEMON_INITIAL_LOOKBACK_HOURS)
+        self.clock = clock
+
+        self.stop_event = threading.Event()
+        self.etl_processor = etl_processor or DataETL(
+            source=args.source, autotune=args.autotune
+        )
+        self.etl_processor.stop_event = self.stop_event
+        self.data_service = DataService()
+        self.watermark_service = WatermarkService()
+        self.behind = False
+
+    def request_stop(self, signum=None, frame=None) -> None:
+        logger.info("Encerramento solicitado, finalizando o ciclo atual")
+        self.stop_event.set()
+
+    def install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+    def get_watermark(self, asset_id: int) -> Optional[datetime]:
+        session = SessionLocal()
+        try:
+            watermark = self.data_service.get_latest_ts(session, asset_id)
+            # Fim da última janela processada: sem isso uma lacuna na origem
+            # não avança o destino e seria buscada de novo
+            processed_until = self.watermark_service.get(session, asset_id)
+        finally:
+            session.close()
+
+        if processed_until and (
+            watermark is None or processed_until - BUCKET > watermark
+        ):
+            return processed_until - BUCKET
+        return watermark
+
+    def read_changes(
+        self, asset: str, asset_id: int
+    ) -> Optional[Tuple[List[Window], Optional[str]]]:
+        """Lê o feed /changes do ativo desde o cursor gravado.
+
+        Retorna as janelas já processadas com registros alterados e o novo
+        cursor, ou None em erro, encerramento ou antes da primeira janela
+        processada. Sem cursor gravado o feed só é percorrido para posicionar
+        o cursor, sem reprocessar o histórico.
+        """
+        session = SessionLocal()
+        try:
+            processed_until = self.watermark_service.get(session, asset_id)
+            cursor = self.watermark_service.get_cursor(session, asset_id)
+        finally:
+            session.close()
+        if processed_until is None:
+            return None
+
+        changed: List[datetime] = []
+        next_cursor = cursor
+        while not self.stop_event.is_set():
+            page = self.etl_processor.extract_changes(
+                next_cursor, self.args.fields, DAEMON_CHANGES_LIMIT, asset
+            )
+            if page is None:
+                return None
+            if cursor is not None:
+                changed.extend(
+                    datetime.fromisoformat(record["ts"]) for record in page["data"]
+                )
+            next_cursor = page.get("next_cursor") or next_cursor
+            if not page.get("has_more"):
+                return changed_windows(changed, processed_until), next_cursor
+        return None
+
+    def apply_changes(
+        self, asset: str, asset_id: int, windows: List[Window], cursor: Optional[str]
+    ) -> bool:
+        """Reprocessa as janelas corrigidas; o cursor só avança se todas
+        forem concluídas, senão elas são lidas de novo no próximo ciclo."""
+        for window_start, window_end in windows:
+            for start_ts, end_ts in split_window(
+                window_start, window_end, self.max_window
+            ):
+                report = run_etl(
+                    self.args, start_ts, end_ts, self.etl_processor, asset=asset
+                )
+                if report.status != "success" or not self.etl_processor.last_extract_ok:
+                    logger.warning(
+                        f"Ativo {asset}: falha ao reprocessar correções de "
+                        f"{start_ts} a {end_ts}; refeitas no próximo ciclo"
+                    )
+                    return False
+
+        if windows:
+            logger.info(f"Ativo {asset}: {len(windows)} janelas corrigidas na origem")
+        if cursor is None:
+            return True
+
+        session = SessionLocal()
+        try:
+            return self.watermark_service.save_cursor(session, asset_id, cursor)
+        finally:
+            session.close()
+
+    def run_asset(self, asset: str, now: datetime) -> Tuple[Optional[RunReport], bool]:
+        """Processa a próxima janela do ativo; retorna (relatório, em atraso)."""
+        session = SessionLocal()
+        try:
+            asset_id = self.etl_processor.get_asset_id(session, asset)
+        finally:
+            session.close()
+
+        # Lido antes da janela nova: as alterações posteriores ao watermark
+        # atual entram nela, as anteriores são correções
+        changes = (
+            self.read_changes(asset, asset_id) if self.args.follow_changes else None
+        )
+
+        report, behind = None, False
+        window = next_window(
+            self.get_watermark(asset_id),
+            now,
+            self.lag,
+            self.max_window,
+            self.initial_lookback,
+        )
+        if window is None:
+            logger.debug(f"Ativo {asset}: nenhum intervalo fechado desde o último")
+        else:
+            start_ts, end_ts = window
+            report = run_etl(
+                self.args, start_ts, end_ts, self.etl_processor, asset=asset
+            )
+
+            # last_extract_ok é por thread: lido na mesma thread que extraiu
+            succeeded = report.status == "success"
+            if succeeded and self.etl_processor.last_extract_ok:
+                session = SessionLocal()
+                try:
+                    self.watermark_service.advance(session, asset_id, end_ts)
+                finally:
+                    session.close()
+            behind = succeeded and end_ts < floor_bucket(now - self.lag)
+
+        if changes is not None:
+            self.apply_changes(asset, asset_id, *changes)
+        return report, behind
+
+    def run_cycle(self) -> Dict[str, RunReport]:
+        now = self.clock()
+        assets = self.etl_processor.resolve_assets(self.args.assets)
+        if not assets:
+            logger.warning("Nenhum ativo para processar neste ciclo")
+            self.behind = False
+            return {}
+
+        profiler = (
+            profile_run(
+                self.args.profile_dir, "etl-daemon", {"arguments": vars(self.args)}
+            )
+            if self.args.profile
+            else nullcontext()
+        )
+        with profiler:
+            results = map_assets(
+                lambda asset: self.run_asset(asset, now),
+                assets,
+                self.args.asset_workers,
+            )
+
+        self.behind = any(behind for _, behind in results)
+        return {
+            asset: report
+            for asset, (report, _) in zip(assets, results)
+            if report is not None
+        }
+
+    def serve(self) -> None:
+        self.install_signal_handlers()
+        logger.info(f"Modo daemon: ciclos a cada {self.interval:.0f}s")
+
+        try:
+            while not self.stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    logger.error(f"Erro no ciclo do daemon: {e}")
+                    self.behind = False
+
+                # Em atraso, o próximo ciclo começa imediatamente
+                if not self.behind:
+                    self.stop_event.wait(
+                        max(self.interval - (time.monotonic() - started), 0)
+                    )
+        finally:
+            self.etl_processor.client.close()
+            if self.etl_processor.db_extractor:
+                self.etl_processor.db_extractor.close()
+            engine.dispose()
+            logger.info("Daemon encerrado")
@@ -2,9 +2,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-from settings import DATABASE_URL_TARGET
+from settings import DATABASE_URL_TARGET, ETL_ASSET_WORKERS
 
-engine = create_engine(DATABASE_URL_TARGET)
+# Ao menos uma conexão por pipeline de ativo em paralelo
+engine = create_engine(
+    DATABASE_URL_TARGET, pool_size=max(5, ETL_ASSET_WORKERS), pool_pre_ping=True
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
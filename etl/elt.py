@@ -0,0 +1,121 @@
+import io
+import uuid
+from typing import Iterator
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from settings import ELT_COPY_CHUNK_ROWS, get_logger
+
+logger = get_logger(__name__)
+
+AGGREGATIONS = ("mean", "min", "max", "std")
+
+# Mesma semântica do resample("10min", closed="right") do transform_data: o
+# intervalo rotulado T cobre (T, T + 10 min], daí o ts - 1 microssegundo.
+# stddev_samp equivale ao std do pandas (ddof=1); valores nulos são ignorados
+# e agregados nulos (ex.: std de um único valor) não são gravados.
+AGGREGATE_SQL = """
+WITH buckets AS (
+    SELECT
+        date_bin(
+            interval '10 minutes',
+            ts - interval '1 microsecond',
+            timestamp '2000-01-01'
+        ) AS bucket,
+        field,
+        avg(value) AS mean,
+        min(value) AS min,
+        max(value) AS max,
+        stddev_samp(value) AS std
+    FROM {staging}
+    GROUP BY 1, 2
+),
+upserted AS (
+    INSERT INTO data (signal_id, ts, value)
+    SELECT s.id, b.bucket, v.value
+    FROM buckets b
+    CROSS JOIN LATERAL (
+        VALUES ('mean', b.mean), ('min', b.min), ('max', b.max), ('std', b.std)
+    ) AS v (aggregation, value)
+    JOIN signal s
+        ON s.asset_id = :asset_id AND s.name = b.field || '_' || v.aggregation
+    WHERE v.value IS NOT NULL
+    ON CONFLICT (signal_id, ts) DO UPDATE SET value = EXCLUDED.value
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT
+    count(*) FILTER (WHERE inserted) AS inserted,
+    count(*) FILTER (WHERE NOT inserted) AS updated
+FROM upserted
+"""
+
+
+def iter_long_chunks(
+    raw_data: list[dict] | pd.DataFrame, chunk_rows: int
+) -> Iterator[pd.DataFrame]:
+    """Converte os dados brutos em blocos (ts, field, value) sem valores nulos."""
+    for start in range(0, len(raw_data), chunk_rows):
+        chunk = raw_data[start : start + chunk_rows]
+        frame = chunk if isinstance(chunk, pd.DataFrame) else pd.DataFrame(chunk)
+        yield frame.melt(id_vars="ts", var_name="field", value_name="value").dropna(
+            subset=["value"]
+        )
+
+
+class EltLoader:
+    """Carrega dados brutos numa tabela de staging e agrega dentro do PostgreSQL.
+
+    A staging é uma tabela UNLOGGED criada na própria transação da carga:
+    recebe as linhas brutas por COPY em blocos de ``chunk_rows`` e é
+    descartada no fim, inclusive em caso de erro (o rollback desfaz a
+    criação). A agregação e o upsert em data são um único comando SQL, então
+    o consumo de memória do ETL não depende do tamanho da janela agregada.
+    """
+
+    def __init__(self, chunk_rows: int = ELT_COPY_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+
+    def load(
+        self, session: Session, raw_data: list[dict] | pd.DataFrame, asset_id: int
+    ) -> tuple[int, int]:
+        """Grava os agregados do ativo e retorna (inseridos, atualizados)."""
+        if session.bind.dialect.name != "postgresql":
+            raise ValueError("A estratégia de carga 'elt' requer PostgreSQL")
+
+        staging = f"etl_staging_{uuid.uuid4().hex[:12]}"
+        connection = session.connection()
+        connection.execute(
+            text(
+                f"CREATE UNLOGGED TABLE {staging} "
+                "(ts timestamp NOT NULL, field text NOT NULL, value float8 NOT NULL)"
+            )
+        )
+
+        cursor = connection.connection.cursor()
+        staged = 0
+        try:
+            for chunk in iter_long_chunks(raw_data, self.chunk_rows):
+                buffer = io.StringIO()
+                chunk.to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f"COPY {staging} (ts, field, value) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+                staged += len(chunk)
+        finally:
+            cursor.close()
+        logger.info(f"{staged} valores brutos copiados para {staging}")
+
+        inserted, updated = connection.execute(
+            text(AGGREGATE_SQL.format(staging=staging)), {"asset_id": asset_id}
+        ).one()
+        connection.execute(text(f"DROP TABLE {staging}"))
+        session.commit()
+
+        logger.info(
+            f"Agregação no banco: {inserted} pontos inseridos, {updated} atualizados"
+        )
+        return inserted, updated
@@ -0,0 +1,173 @@
+import io
+from datetime import datetime
+from typing import List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from sqlalchemy import column, create_engine, inspect, select, table
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from settings import (
+    DATABASE_URL_SOURCE,
+    EXTRACT_DB_BATCH_SIZE,
+    EXTRACT_DB_METHOD,
+    get_logger,
+)
+
+logger = get_logger(__name__)
+
+SOURCE_TABLE = "data"
+ASSET_TABLE = "asset"
+
+
+class DatabaseExtractor:
+    """Lê a tabela data do banco de origem direto, sem passar pela API.
+
+    Retorna um DataFrame com ``ts`` e os campos pedidos, na mesma janela
+    (início, fim] da API, pronto para ``DataETL.transform_data``. Com o
+    método "copy" os dados vêm por COPY TO STDOUT em CSV e são lidos pelo
+    parser em C do pandas; com "cursor" (ou fora do PostgreSQL) vêm de um
+    cursor no servidor, em lotes, acumulados por coluna.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str] = DATABASE_URL_SOURCE,
+        method: str = EXTRACT_DB_METHOD,
+        batch_size: int = EXTRACT_DB_BATCH_SIZE,
+    ):
+        if not database_url:
+            raise ValueError("Configure DB_*_SOURCE ou DATABASE_URL_SOURCE")
+        if method not in ("copy", "cursor"):
+            raise ValueError(f"Método de extração inválido: {method}")
+
+        self.engine: Engine = create_engine(database_url, pool_pre_ping=True)
+        self.method = method
+        self.batch_size = batch_size
+        self._columns: Set[str] = set()
+
+    def _source_columns(self) -> Set[str]:
+        if not self._columns:
+            self._columns = {
+                source_column["name"]
+                for source_column in inspect(self.engine).get_columns(SOURCE_TABLE)
+            }
+        return self._columns
+
+    def _query(
+        self,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: List[str],
+        asset: Optional[str] = None,
+    ):
+        ts = column("ts")
+        query = (
+            select(ts, *[column(field) for field in fields])
+            .select_from(table(SOURCE_TABLE))
+            .where(ts > start_ts, ts <= end_ts)
+            .order_by(ts)
+        )
+        if asset:
+            asset_id = (
+                select(column("id"))
+                .select_from(table(ASSET_TABLE))
+                .where(column("name") == asset)
+                .scalar_subquery()
+            )
+            query = query.where(column("asset_id") == asset_id)
+        return query
+
+    def extract_assets(self) -> List[str]:
+        """Nomes dos ativos da origem, ou lista vazia em caso de erro."""
+        query = (
+            select(column("name")).select_from(table(ASSET_TABLE)).order_by("name")
+        )
+        try:
+            with self.engine.connect() as connection:
+                return list(connection.execute(query).scalars())
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            logger.error(f"Erro ao ler os ativos da origem: {e}")
+            return []
+
+    def extract(
+        self,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: List[str],
+        asset: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Retorna os dados da janela, filtrados por ativo, ou None em erro."""
+        query = self._query(start_ts, end_ts, fields, asset)
+        columns = ["ts", *fields]
+
+        try:
+            unknown = set(fields) - self._source_columns()
+            if unknown:
+                logger.error(f"Campos inexistentes na tabela de origem: {unknown}")
+                return None
+
+            if self.method == "copy" and self.engine.dialect.name == "postgresql":
+                frame = self._extract_copy(query, columns)
+            else:
+                frame = self._extract_cursor(query, columns)
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            logger.error(f"Erro ao ler a tabela de origem: {e}")
+            return None
+
+        logger.info(f"{len(frame)} registros lidos direto do banco de origem")
+        return frame
+
+    def _extract_copy(self, query, columns: List[str]) -> pd.DataFrame:
+        compiled = query.compile(dialect=self.engine.dialect)
+        buffer = io.BytesIO()
+
+        raw_connection = self.engine.raw_connection()
+        try:
+            cursor = raw_connection.cursor()
+            sql = cursor.mogrify(str(compiled), compiled.params).decode()
+            cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", buffer)
+            cursor.close()
+            raw_connection.commit()
+        finally:
+            raw_connection.close()
+
+        if not buffer.tell():
+            return pd.DataFrame(
+                {"ts": pd.to_datetime([]), **{field: [] for field in columns[1:]}}
+            )
+
+        buffer.seek(0)
+        return pd.read_csv(
+            buffer,
+            names=columns,
+            parse_dates=["ts"],
+            dtype={field: "float64" for field in columns[1:]},
+        )
+
+    def _extract_cursor(self, query, columns: List[str]) -> pd.DataFrame:
+        values: List[list] = [[] for _ in columns]
+
+        with self.engine.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=self.batch_size
+            ).execute(query)
+            for batch in result.partitions():
+                for index, column_values in enumerate(zip(*batch)):
+                    values[index].extend(column_values)
+
+        # None (NULL) vira NaN, como nos campos omitidos pela API
+        frame = pd.DataFrame(
+            {
+                name: np.array(column_values, dtype="float64")
+                for name, column_values in zip(columns[1:], values[1:])
+            },
+            columns=columns[1:],
+        )
+        frame.insert(0, "ts", pd.to_datetime(values[0]))
+        return frame
+
+    def close(self) -> None:
+        self.engine.dispose()
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from settings import get_logger
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """Cópia local das respostas da API indexada por URL e parâmetros.
+
+    Guarda o ETag junto com o corpo JSON para que a próxima requisição
+    possa ser condicional (If-None-Match) e reaproveitar o corpo no 304.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, url: str, params: Optional[Dict[str, Any]]) -> Path:
+        key = json.dumps({"url": url, "params": params or {}}, sort_keys=True)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, Any]]:
+
+        path = self._path(url, params)
+        try:
+            with open(path, encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+            return entry["etag"], entry["body"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Entrada de cache inválida em {path}: {e}")
+            return None
+
+    def put(
+        self, url: str, params: Optional[Dict[str, Any]], etag: str, body: Any
+    ) -> None:
+
+        path = self._path(url, params)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                json.dump({"etag": etag, "body": body}, cache_file)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o cache em {path}: {e}")
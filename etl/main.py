@@ -1,32 +1,180 @@
-from datetime import datetime
-from typing import Any, Dict
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
 
 import httpx
 import pandas as pd
+from chunked import ChunkedTransformer, SpillBuffer, raw_row_bytes
+from columnar import ColumnarBuffer
+from compact import pack_daily
 from db import SessionLocal
+from elt import AGGREGATIONS, EltLoader
+from extractors import DatabaseExtractor
+from http_cache import ResponseCache
 from models.data import Data as DataModel
-from services import DataService, SignalService
-from settings import API_BASE_URL, API_KEY, get_logger, setup_logging
+from profiling import profile_run
+from run_report import RunReport
+from services import (
+    AssetService,
+    DataDailyService,
+    DataService,
+    EtlRunService,
+    SignalService,
+)
+from settings import (
+    API_BASE_URL,
+    API_KEY,
+    DAEMON_INTERVAL_SECONDS,
+    DEFAULT_ASSET_NAME,
+    ETL_ASSET_WORKERS,
+    ETL_ASSETS,
+    ETL_AUTOTUNE,
+    ETL_MEMORY_BUDGET_MB,
+    ETL_SEGMENT_HOURS,
+    EXTRACT_COLUMNAR,
+    EXTRACT_FLOAT_DTYPE,
+    EXTRACT_SOURCE,
+    HTTP_ACCEPT_ENCODING,
+    HTTP_CACHE_DIR,
+    LOAD_STRATEGY,
+    PROFILE_DIR,
+    RECONCILE_BUCKET_HOURS,
+    RUN_REPORT_TOP_ALLOCATIONS,
+    STORAGE_FORMAT,
+    TRANSFORM_CHUNK_HOURS,
+    TRANSFORM_CHUNK_ROWS,
+    TRANSFORM_SPILL_DIR,
+    get_logger,
+    setup_logging,
+)
+from tuning import AimdTuner, fetch_pages
+from windows import align_window, split_window, split_window_by_rows
 
 setup_logging()
 logger = get_logger(__name__)
 
 
 class DataETL:
-    def __init__(self):
+    """Extrai, agrega e grava os dados de um ou mais ativos.
+
+    Uma instância pode atender vários ativos ao mesmo tempo, um por thread:
+    o cliente HTTP, o extrator e os caches de ativos e sinais são
+    compartilhados, enquanto o relatório e o resultado da última extração
+    ficam por thread.
+    """
+
+    def __init__(
+        self,
+        source: str = EXTRACT_SOURCE,
+        columnar: bool = EXTRACT_COLUMNAR,
+        autotune: bool = ETL_AUTOTUNE,
+    ):
         self.api_base_url = API_BASE_URL
         self.api_key = API_KEY
 
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
+        if HTTP_ACCEPT_ENCODING:
+            headers["Accept-Encoding"] = HTTP_ACCEPT_ENCODING
 
+        self.columnar = columnar
+        self.autotune = autotune
+        self.tuner: AimdTuner | None = None
         self.client = httpx.Client(timeout=30.0, headers=headers)
+        logger.debug(f"Accept-Encoding: {self.client.headers.get('Accept-Encoding')}")
+        self.response_cache = ResponseCache(HTTP_CACHE_DIR) if HTTP_CACHE_DIR else None
+        self.asset_service = AssetService()
         self.signal_service = SignalService()
         self.data_service = DataService()
+        self.data_daily_service = DataDailyService()
+        self.source = source
+        self.db_extractor = DatabaseExtractor() if source == "database" else None
+        self.elt_loader = EltLoader()
+        self.stop_event: threading.Event | None = None
+        self._local = threading.local()
+        self._asset_ids: Dict[str, int] = {}
+        self._signals_maps: Dict[int, Dict[str, int]] = {}
+        self._tuner_lock = threading.Lock()
+
+    @property
+    def run_report(self) -> RunReport | None:
+        return getattr(self._local, "run_report", None)
+
+    @run_report.setter
+    def run_report(self, report: RunReport | None) -> None:
+        self._local.run_report = report
+
+    @property
+    def last_extract_ok(self) -> bool:
+        return getattr(self._local, "last_extract_ok", False)
+
+    @last_extract_ok.setter
+    def last_extract_ok(self, ok: bool) -> None:
+        self._local.last_extract_ok = ok
+
+    def get_asset_id(self, session: SessionLocal, asset: str) -> int:
+        """Id do ativo no destino, criado na primeira carga do ativo."""
+        if asset not in self._asset_ids:
+            asset_id = self.asset_service.get_or_create_id(session, asset)
+            if asset_id is None:
+                raise ValueError(f"Não foi possível registrar o ativo {asset}")
+            self._asset_ids[asset] = asset_id
+        return self._asset_ids[asset]
+
+    def _get_signals_map(
+        self, session: SessionLocal, asset_id: int, names: list[str] | None = None
+    ) -> Dict[str, int]:
+        # Os sinais mudam raramente: o mapa só é relido quando falta algum nome,
+        # e os que faltam no ativo são criados
+        signals_map = self._signals_maps.get(asset_id)
+        names = names or []
+        if signals_map is None or any(name not in signals_map for name in names):
+            signals_map = self.signal_service.get_signals_map(session, asset_id)
+            if any(name not in signals_map for name in names):
+                self.signal_service.create_missing(session, asset_id, names)
+                signals_map = self.signal_service.get_signals_map(session, asset_id)
+            self._signals_maps[asset_id] = signals_map
+        return signals_map
+
+    def stop_requested(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def _get_json(
+        self,
+        url: str,
+        params: Dict[str, Any] | None = None,
+        run_report: RunReport | None = None,
+    ) -> Any:
+        cached = self.response_cache.get(url, params) if self.response_cache else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        start = time.perf_counter()
+        response = self.client.get(url, params=params, headers=headers)
+        # Nas threads de busca paralela o relatório vem por parâmetro
+        run_report = run_report or self.run_report
+        if run_report:
+            run_report.record_http(
+                time.perf_counter() - start, response.num_bytes_downloaded
+            )
+
+        if cached and response.status_code == 304:
+            logger.debug(f"Resposta não modificada, usando cópia local: {url}")
+            return cached[1]
+
+        response.raise_for_status()
+        body = response.json()
+
+        etag = response.headers.get("ETag")
+        if self.response_cache and response.status_code == 200 and etag:
+            self.response_cache.put(url, params, etag, body)
 
-    def _get_signals_map(self, session: SessionLocal) -> Dict[str, int]:
-        return self.signal_service.get_signals_map(session)
+        return body
 
     def extract_available_fields(self) -> Dict[str, Any]:
         """ """
@@ -35,9 +183,7 @@ class DataETL:
             return {}
 
         try:
-            response = self.client.get(f"{self.api_base_url}/fields")
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(f"{self.api_base_url}/fields")
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 401:
                 logger.error("Erro de autenticação: API_KEY inválida ou expirada")
@@ -52,26 +198,81 @@ class DataETL:
             logger.error(f"Não foi possível conectar à API: {e}")
             return {}
 
+    def extract_assets(self) -> List[str]:
+        """Nomes dos ativos disponíveis na origem."""
+        if self.db_extractor is not None:
+            return self.db_extractor.extract_assets()
+
+        if not self.api_key:
+            logger.error("API_KEY não configurada. Verifique o arquivo .env")
+            return []
+
+        try:
+            assets = self._get_json(f"{self.api_base_url}/assets")
+            return [asset["name"] for asset in assets]
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Erro HTTP {e.response.status_code} ao buscar ativos: {e}")
+            return []
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao conectar à API ao buscar ativos: {e}")
+            return []
+
+    def resolve_assets(self, assets: str) -> List[str]:
+        """Lista de ativos de --assets/ETL_ASSETS; "all" busca todos na origem."""
+        if assets.strip().lower() == "all":
+            return self.extract_assets()
+        return [asset.strip() for asset in assets.split(",") if asset.strip()]
+
+    def extract(
+        self,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: list[str],
+        page_size: int = 25,
+        asset: str | None = None,
+    ) -> list[dict] | pd.DataFrame:
+        """Extrai a janela pela API ou, com a origem "database", direto do banco."""
+        if self.db_extractor is None:
+            extract_data = (
+                self.extract_data_tuned if self.autotune else self.extract_data
+            )
+            return extract_data(
+                start_ts, end_ts, fields, page_size, asset, columnar=self.columnar
+            )
+
+        self.last_extract_ok = False
+        frame = self.db_extractor.extract(start_ts, end_ts, fields, asset)
+        if frame is None:
+            return []
+
+        self.last_extract_ok = True
+        return frame
+
     def extract_data(
         self,
         start_ts: datetime,
         end_ts: datetime,
         fields: list[str],
         page_size: int = 25,
-    ) -> Dict[str, Any]:
+        asset: str | None = None,
+        columnar: bool = False,
+    ) -> list[dict] | pd.DataFrame:
+        """Extrai todas as páginas da janela; com ``columnar`` cada página é
+        decodificada direto em colunas tipadas e o retorno é um DataFrame."""
+        self.last_extract_ok = False
         if not self.api_key:
             logger.error("API_KEY não configurada. Verifique o arquivo .env")
             return []
 
-        start_ts = datetime(
-            start_ts.year, start_ts.month, start_ts.day, 0, 0, 0
-        ).isoformat()
-
-        end_ts = datetime(end_ts.year, end_ts.month, end_ts.day, 0, 0, 0).isoformat()
+        start_ts = start_ts.isoformat()
+        end_ts = end_ts.isoformat()
 
         fields_str = ",".join(fields)
 
-        extracted_data = []
+        extracted_data = (
+            ColumnarBuffer(fields, dtype=EXTRACT_FLOAT_DTYPE) if columnar else []
+        )
+        add_page = extracted_data.append if columnar else extracted_data.extend
 
         params = {
             "start_ts": start_ts,
@@ -80,11 +281,11 @@ class DataETL:
             "page": 1,
             "page_size": page_size,
         }
+        if asset:
+            params["asset"] = asset
 
         try:
-            response = self.client.get(f"{self.api_base_url}", params=params)
-            response.raise_for_status()
-            json_response = response.json()
+            json_response = self._get_json(f"{self.api_base_url}", params=params)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 401:
                 logger.error("Erro de autenticação: API_KEY inválida ou expirada")
@@ -99,18 +300,21 @@ class DataETL:
             logger.error(f"Falha ao conectar à API na página 1: {e}")
             return []
 
-        extracted_data.extend(json_response.get("data", []))
+        add_page(json_response.get("data", []))
 
         total_pages = json_response.get("paging", {}).get("total_pages", 1)
 
         if total_pages > 1:
             for page in range(2, total_pages + 1):
+                if self.stop_requested():
+                    logger.warning(f"Extração interrompida na página {page}")
+                    return []
                 try:
                     params["page"] = page
-                    response = self.client.get(f"{self.api_base_url}", params=params)
-                    response.raise_for_status()
-                    json_response = response.json()
-                    extracted_data.extend(json_response.get("data", []))
+                    json_response = self._get_json(
+                        f"{self.api_base_url}", params=params
+                    )
+                    add_page(json_response.get("data", []))
                 except httpx.HTTPStatusError as e:
                     if e.response.status_code == 401:
                         logger.error(
@@ -129,10 +333,185 @@ class DataETL:
                     logger.error(f"Falha ao conectar à API na página {page}: {e}")
                     return []
 
-        return extracted_data
+        self.last_extract_ok = True
+        return extracted_data.to_frame() if columnar else extracted_data
+
+    def get_tuner(self, page_size: int) -> AimdTuner:
+        """Ajuste compartilhado entre ativos e execuções; a primeira chamada
+        define o tamanho de página inicial."""
+        with self._tuner_lock:
+            if self.tuner is None:
+                self.tuner = AimdTuner(page_size)
+                logger.info(
+                    f"Ajuste automático da extração: {self.tuner.describe()}"
+                )
+            return self.tuner
+
+    def extract_data_tuned(
+        self,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: list[str],
+        page_size: int = 25,
+        asset: str | None = None,
+        columnar: bool = False,
+    ) -> list[dict] | pd.DataFrame:
+        """Como ``extract_data``, mas com páginas buscadas em paralelo e tamanho
+        de página e concorrência ajustados pelas latências observadas."""
+        self.last_extract_ok = False
+        if not self.api_key:
+            logger.error("API_KEY não configurada. Verifique o arquivo .env")
+            return []
+
+        tuner = self.get_tuner(page_size)
+        run_report = self.run_report
+        fields_str = ",".join(fields)
 
-    def transform_data(self, raw_data: list[dict]) -> pd.DataFrame:
-        if not raw_data:
+        def fetch(start: datetime, end: datetime, page: int, size: int) -> Any:
+            params = {
+                "start_ts": start.isoformat(),
+                "end_ts": end.isoformat(),
+                "fields": fields_str,
+                "page": page,
+                "page_size": size,
+            }
+            if asset:
+                params["asset"] = asset
+            return self._get_json(
+                f"{self.api_base_url}", params=params, run_report=run_report
+            )
+
+        segments = split_window(start_ts, end_ts, timedelta(hours=ETL_SEGMENT_HOURS))
+        try:
+            pages = fetch_pages(fetch, segments, tuner, self.stop_requested)
+        except InterruptedError:
+            logger.warning("Extração interrompida")
+            return []
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                logger.error("Erro de autenticação: API_KEY inválida ou expirada")
+            elif e.response.status_code == 403:
+                logger.error("Acesso negado: verifique as permissões da API_KEY")
+            else:
+                logger.error(f"Erro HTTP {e.response.status_code} ao buscar dados: {e}")
+            return []
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao conectar à API: {e}")
+            return []
+
+        logger.info(
+            f"{len(pages)} páginas extraídas em {len(segments)} partes; "
+            f"ajuste atual: {tuner.describe()}"
+        )
+
+        if columnar:
+            buffer = ColumnarBuffer(fields, dtype=EXTRACT_FLOAT_DTYPE)
+            for page in pages:
+                buffer.append(page)
+            self.last_extract_ok = True
+            return buffer.to_frame()
+
+        self.last_extract_ok = True
+        return [record for page in pages for record in page]
+
+    def extract_changes(
+        self,
+        cursor: str | None,
+        fields: str | None = None,
+        limit: int = 1000,
+        asset: str | None = None,
+    ) -> dict | None:
+        """Próxima página do feed de alterações da API a partir de ``cursor``
+        (``data``, ``next_cursor`` e ``has_more``), ou None em erro."""
+        if not self.api_key:
+            logger.error("API_KEY não configurada. Verifique o arquivo .env")
+            return None
+
+        params: Dict[str, Any] = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if fields:
+            params["fields"] = fields
+        if asset:
+            params["asset"] = asset
+
+        try:
+            return self._get_json(f"{self.api_base_url}/changes", params=params)
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Erro HTTP {e.response.status_code} ao buscar alterações: {e}"
+            )
+            return None
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao conectar à API ao buscar alterações: {e}")
+            return None
+
+    def extract_availability(
+        self,
+        start_ts: datetime | None = None,
+        end_ts: datetime | None = None,
+        granularity: str = "day",
+        asset: str | None = None,
+    ) -> dict | None:
+        """Resumo de disponibilidade da origem (``buckets`` com a contagem de
+        registros e ``complete``), ou None em erro."""
+        if not self.api_key:
+            logger.error("API_KEY não configurada. Verifique o arquivo .env")
+            return None
+
+        params = {"granularity": granularity}
+        if start_ts:
+            params["start_ts"] = start_ts.isoformat()
+        if end_ts:
+            params["end_ts"] = end_ts.isoformat()
+        if asset:
+            params["asset"] = asset
+
+        try:
+            json_response = self._get_json(
+                f"{self.api_base_url}/availability", params=params
+            )
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Erro HTTP {e.response.status_code} ao buscar disponibilidade: {e}"
+            )
+            return None
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao conectar à API ao buscar disponibilidade: {e}")
+            return None
+
+        return json_response
+
+    def window_is_empty(self, start_ts: datetime, end_ts: datetime, asset: str) -> bool:
+        """True só quando o resumo da API garante que a janela não tem registros.
+
+        As horas consultadas cobrem a janela (início, fim] com folga; sem o
+        resumo completo (erro, resumo não mantido pela API ou extração direta
+        do banco) a extração segue normalmente.
+        """
+        hourly_rows = self.source_row_counts(start_ts, end_ts, asset)
+        return hourly_rows is not None and not any(hourly_rows.values())
+
+    def source_row_counts(
+        self, start_ts: datetime, end_ts: datetime, asset: str
+    ) -> dict[datetime, int] | None:
+        """Registros da origem por hora segundo o resumo da API, ou None sem ele.
+
+        O resumo só lista horas com registros; as ausentes só contam como vazias
+        quando a API garante que ele cobre toda a origem (``complete``).
+        """
+        if self.source != "api":
+            return None
+        availability = self.extract_availability(start_ts, end_ts, "hour", asset)
+        if availability is None or not availability.get("complete"):
+            return None
+        return {
+            datetime.fromisoformat(bucket["start"]): bucket["row_count"]
+            for bucket in availability.get("buckets", [])
+        }
+
+    def transform_data(self, raw_data: list[dict] | pd.DataFrame) -> pd.DataFrame:
+        if len(raw_data) == 0:
             logger.warning("Nenhum dado bruto para processar")
             return pd.DataFrame()
 
@@ -154,14 +533,21 @@ class DataETL:
         )
         return transformed_data
 
-    def load_data(self, session: SessionLocal, transformed_data: pd.DataFrame):
+    def load_data(
+        self,
+        session: SessionLocal,
+        transformed_data: pd.DataFrame,
+        asset: str = DEFAULT_ASSET_NAME,
+    ) -> tuple[int, int]:
+        """Grava os dados agregados do ativo e retorna (inseridos, atualizados)."""
         if transformed_data.empty:
             logger.warning("Nenhum dado agregado para salvar")
-            return
+            return 0, 0
 
         logger.info("Iniciando gravação dos dados no banco")
         signal_names = [col for col in transformed_data.columns if col != "ts"]
-        signal_map = self._get_signals_map(session)
+        asset_id = self.get_asset_id(session, asset)
+        signal_map = self._get_signals_map(session, asset_id, signal_names)
         data_points_to_add = []
 
         for _, row in transformed_data.iterrows():
@@ -175,31 +561,100 @@ class DataETL:
                         )
                     )
 
+        # Chaves já presentes antes do merge distinguem inserções de atualizações
+        timestamps = pd.to_datetime(transformed_data["ts"])
+        existing_keys = self.data_service.get_existing_keys(
+            session,
+            {signal_map[signal_name] for signal_name in signal_names},
+            timestamps.min().to_pydatetime(),
+            timestamps.max().to_pydatetime(),
+        )
+        updated = sum(
+            1
+            for data_point in data_points_to_add
+            if (data_point.signal_id, pd.Timestamp(data_point.ts).to_pydatetime())
+            in existing_keys
+        )
+
         success = self.data_service.bulk_insert_data_points(session, data_points_to_add)
         if success:
             logger.info(f"{len(data_points_to_add)} pontos de dados salvos no banco")
-        else:
-            logger.error("Falha ao salvar os dados")
+            return len(data_points_to_add) - updated, updated
 
+        logger.error("Falha ao salvar os dados")
+        return 0, 0
 
-def main():
+    def load_data_daily(
+        self,
+        session: SessionLocal,
+        transformed_data: pd.DataFrame,
+        asset: str = DEFAULT_ASSET_NAME,
+    ) -> tuple[int, int]:
+        """Grava os agregados no formato compacto (data_daily) e retorna
+        (vetores diários inseridos, atualizados)."""
+        if transformed_data.empty:
+            logger.warning("Nenhum dado agregado para salvar")
+            return 0, 0
+
+        signal_names = [col for col in transformed_data.columns if col != "ts"]
+        asset_id = self.get_asset_id(session, asset)
+        signal_map = self._get_signals_map(session, asset_id, signal_names)
+
+        long_data = transformed_data.melt(
+            id_vars="ts", var_name="signal", value_name="value"
+        ).dropna(subset=["value"])
+        if long_data.empty:
+            logger.warning("Nenhum valor agregado para salvar")
+            return 0, 0
+
+        keys, matrix = pack_daily(
+            long_data["signal"].map(signal_map).to_numpy(),
+            long_data["ts"],
+            long_data["value"].to_numpy(),
+        )
+        logger.info(f"{len(long_data)} valores em {len(keys)} vetores diários")
+        return self.data_daily_service.upsert_days(session, keys, matrix)
 
-    import argparse
+    def load_raw_data(
+        self,
+        session: SessionLocal,
+        raw_data: list[dict] | pd.DataFrame,
+        fields: list[str],
+        asset: str = DEFAULT_ASSET_NAME,
+    ) -> tuple[int, int]:
+        """Agrega e grava os dados brutos no PostgreSQL (estratégia "elt")."""
+        if len(raw_data) == 0:
+            logger.warning("Nenhum dado bruto para processar")
+            return 0, 0
+
+        signal_names = [
+            f"{field}_{aggregation}" for field in fields for aggregation in AGGREGATIONS
+        ]
+        asset_id = self.get_asset_id(session, asset)
+        signal_map = self._get_signals_map(session, asset_id, signal_names)
+        missing = [name for name in signal_names if name not in signal_map]
+        if missing:
+            logger.warning(f"Sinais inexistentes, valores ignorados: {missing}")
+
+        logger.info("Copiando dados brutos para agregação no banco")
+        return self.elt_loader.load(session, raw_data, asset_id)
+
+
+def main():
 
     parser = argparse.ArgumentParser(description="ETL para dados de vento")
 
     parser.add_argument(
         "--start-ts",
         type=str,
-        required=True,
-        help="Data/hora de início (formato: YYYY-MM-DD ou YYYY-MM-DDTHH:MM:SS)",
+        help="Data/hora de início (formato: YYYY-MM-DD ou YYYY-MM-DDTHH:MM[:SS]); "
+        "a janela é alinhada a intervalos de 10 minutos",
     )
 
     parser.add_argument(
         "--end-ts",
         type=str,
-        required=True,
-        help="Data/hora de fim (formato: YYYY-MM-DD ou YYYY-MM-DDTHH:MM:SS)",
+        help="Data/hora de fim (formato: YYYY-MM-DD ou YYYY-MM-DDTHH:MM[:SS])",
     )
 
     parser.add_argument(
@@ -213,14 +668,167 @@ def main():
         "--page-size",
         type=int,
         default=25,
-        help="Tamanho da página para paginação (padrão: 25)",
+        help="Tamanho da página para paginação; com o ajuste automático é o "
+        "tamanho inicial (padrão: 25)",
+    )
+
+    parser.add_argument(
+        "--autotune",
+        action=argparse.BooleanOptionalAction,
+        default=ETL_AUTOTUNE,
+        help="Ajusta o tamanho de página e as requisições simultâneas pelas "
+        "latências da API; --no-autotune busca página a página com --page-size "
+        f"(padrão: {ETL_AUTOTUNE}, variável ETL_AUTOTUNE)",
+    )
+
+    parser.add_argument(
+        "--source",
+        choices=("api", "database"),
+        default=EXTRACT_SOURCE,
+        help="Origem da extração: API HTTP ou leitura direta do banco de origem "
+        f"(padrão: {EXTRACT_SOURCE}, variável EXTRACT_SOURCE)",
+    )
+
+    parser.add_argument(
+        "--load-strategy",
+        choices=("pandas", "elt"),
+        default=LOAD_STRATEGY,
+        help="Agrega no ETL com pandas ou, com elt, copia as linhas brutas para "
+        "uma staging e agrega no PostgreSQL "
+        f"(padrão: {LOAD_STRATEGY}, variável LOAD_STRATEGY)",
+    )
+
+    parser.add_argument(
+        "--storage",
+        choices=("long", "daily"),
+        default=STORAGE_FORMAT,
+        help="Grava uma linha por valor (long) ou um vetor de 144 intervalos por "
+        f"sinal e dia (daily) (padrão: {STORAGE_FORMAT}, variável STORAGE_FORMAT)",
+    )
+
+    parser.add_argument(
+        "--chunk-hours",
+        type=float,
+        default=TRANSFORM_CHUNK_HOURS,
+        help="Extrai e agrega a janela em partes de N horas, com memória limitada "
+        "por --memory-budget-mb; 0 processa a janela inteira de uma vez "
+        f"(padrão: {TRANSFORM_CHUNK_HOURS:g}, variável TRANSFORM_CHUNK_HOURS)",
+    )
+
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=ETL_MEMORY_BUDGET_MB,
+        help="Orçamento de memória da transformação em blocos "
+        f"(padrão: {ETL_MEMORY_BUDGET_MB:g}, variável ETL_MEMORY_BUDGET_MB)",
+    )
+
+    parser.add_argument(
+        "--assets",
+        type=str,
+        default=ETL_ASSETS,
+        help="Ativos separados por vírgula ou 'all' para todos os da origem "
+        f"(padrão: {ETL_ASSETS}, variável ETL_ASSETS)",
+    )
+
+    parser.add_argument(
+        "--asset-workers",
+        type=int,
+        default=ETL_ASSET_WORKERS,
+        help="Ativos processados em paralelo, cada um no seu pipeline "
+        f"(padrão: {ETL_ASSET_WORKERS}, variável ETL_ASSET_WORKERS)",
+    )
+
+    parser.add_argument(
+        "--report-file",
+        type=str,
+        help="Arquivo para gravar também o relatório da execução em JSON",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Perfila a execução com cProfile e grava o resultado em --profile-dir",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=PROFILE_DIR,
+        help=f"Diretório dos perfis gravados com --profile (padrão: {PROFILE_DIR})",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Executa continuamente, processando a cada ciclo os intervalos de "
+        "10 minutos fechados desde o último gravado no destino",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DAEMON_INTERVAL_SECONDS,
+        help="Segundos entre o início de ciclos no modo --daemon "
+        f"(padrão: {DAEMON_INTERVAL_SECONDS})",
+    )
+
+    parser.add_argument(
+        "--follow-changes",
+        action="store_true",
+        help="No modo --daemon, acompanha também o feed /changes da API e "
+        "reprocessa os intervalos já gravados que foram corrigidos na origem",
+    )
+
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Compara origem e destino na janela por intervalos de --bucket-hours "
+        "(pontos e somas calculados nos bancos) e lista os divergentes; requer "
+        "DB_*_SOURCE",
+    )
+
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Com --reconcile, reprocessa só os intervalos divergentes",
+    )
+
+    parser.add_argument(
+        "--bucket-hours",
+        type=int,
+        default=RECONCILE_BUCKET_HOURS,
+        help="Horas por intervalo da reconciliação "
+        f"(padrão: {RECONCILE_BUCKET_HOURS}, variável RECONCILE_BUCKET_HOURS)",
     )
 
     args = parser.parse_args()
 
+    if args.repair and not args.reconcile:
+        parser.error("--repair requer --reconcile")
+    if args.reconcile and args.daemon:
+        parser.error("--reconcile não pode ser usado com --daemon")
+    if args.follow_changes and (not args.daemon or args.source != "api"):
+        parser.error("--follow-changes requer --daemon e --source api")
+    if args.bucket_hours <= 0:
+        parser.error("--bucket-hours deve ser maior que zero")
+    if args.storage == "daily" and args.load_strategy == "elt":
+        parser.error("--storage daily requer --load-strategy pandas")
+    if args.chunk_hours and args.load_strategy == "elt":
+        parser.error("--chunk-hours requer --load-strategy pandas")
+
+    if args.daemon:
+        from daemon import EtlDaemon
+
+        EtlDaemon(args).serve()
+        return
+
+    if not args.start_ts or not args.end_ts:
+        parser.error("--start-ts e --end-ts são obrigatórios fora do modo --daemon")
+
     try:
-        start_ts = datetime.strptime(args.start_ts, "%Y-%m-%d")
-        end_ts = datetime.strptime(args.end_ts, "%Y-%m-%d")
+        start_ts = datetime.fromisoformat(args.start_ts)
+        end_ts = datetime.fromisoformat(args.end_ts)
 
     except ValueError as e:
         logger.error(
@@ -228,40 +836,305 @@ def main():
         )
         return
 
+    if start_ts.tzinfo or end_ts.tzinfo:
+        logger.error("Informe datas sem fuso horário, no mesmo horário da API")
+        return
+
+    aligned = align_window(start_ts, end_ts)
+    if aligned != (start_ts, end_ts):
+        logger.info(
+            "Janela ajustada para intervalos de 10 minutos: "
+            f"{aligned[0].isoformat()} até {aligned[1].isoformat()}"
+        )
+    start_ts, end_ts = aligned
+
+    if start_ts >= end_ts:
+        logger.error("--start-ts deve ser anterior a --end-ts")
+        return
+
+    profiler = (
+        profile_run(args.profile_dir, "etl", {"arguments": vars(args)})
+        if args.profile
+        else nullcontext()
+    )
+    etl_processor = DataETL(source=args.source, autotune=args.autotune)
+    assets = etl_processor.resolve_assets(args.assets)
+    if not assets:
+        logger.error("Nenhum ativo para processar")
+        return
+
+    if args.reconcile:
+        from reconcile import run_reconcile
+
+        with profiler:
+            remaining = run_reconcile(args, start_ts, end_ts, assets, etl_processor)
+        if any(remaining.values()):
+            raise SystemExit(1)
+        return
+
+    with profiler:
+        run_assets(args, start_ts, end_ts, assets, etl_processor)
+
+
+def map_assets(function, assets: List[str], workers: int) -> list:
+    """Aplica ``function`` a cada ativo, até ``workers`` ativos em paralelo."""
+    if workers <= 1 or len(assets) <= 1:
+        return [function(asset) for asset in assets]
+
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(assets)), thread_name_prefix="etl-asset"
+    ) as executor:
+        return list(executor.map(function, assets))
+
+
+def run_assets(
+    args,
+    start_ts: datetime,
+    end_ts: datetime,
+    assets: List[str],
+    etl_processor: DataETL | None = None,
+) -> Dict[str, RunReport]:
+    """Executa a mesma janela para cada ativo, um pipeline por ativo."""
+    etl_processor = etl_processor or DataETL(
+        source=args.source, autotune=args.autotune
+    )
+    # Cada relatório vai para a tabela etl_run; o arquivo recebe todos juntos,
+    # sempre indexados pelo ativo (mesmo quando há um só)
+    asset_args = argparse.Namespace(**{**vars(args), "report_file": None})
+
+    def run_asset(asset: str) -> RunReport:
+        return run_etl(asset_args, start_ts, end_ts, etl_processor, asset)
+
+    reports = dict(zip(assets, map_assets(run_asset, assets, args.asset_workers)))
+
+    failed = [asset for asset, report in reports.items() if report.status != "success"]
+    logger.info(
+        f"{len(assets) - len(failed)} de {len(assets)} ativos processados com sucesso"
+    )
+    if failed:
+        logger.error(f"Ativos com falha: {failed}")
+
+    if args.report_file:
+        with open(args.report_file, "w", encoding="utf-8") as output_file:
+            json.dump(
+                {asset: report.to_dict() for asset, report in reports.items()},
+                output_file,
+                default=str,
+            )
+    return reports
+
+
+def run_etl(
+    args,
+    start_ts: datetime,
+    end_ts: datetime,
+    etl_processor: DataETL | None = None,
+    asset: str = DEFAULT_ASSET_NAME,
+) -> RunReport:
+
+    report = RunReport(
+        parameters={
+            "asset": asset,
+            "start_ts": start_ts.isoformat(),
+            "end_ts": end_ts.isoformat(),
+            "fields": args.fields,
+            "page_size": args.page_size,
+            "autotune": args.autotune,
+            "source": args.source,
+            "load_strategy": args.load_strategy,
+            "storage": args.storage,
+            "chunk_hours": args.chunk_hours,
+        },
+        top_allocations=RUN_REPORT_TOP_ALLOCATIONS,
+    )
+    report.start()
+    session = SessionLocal()
+
     try:
-        etl_processor = DataETL()
-        session = SessionLocal()
-        logger.info(f"Iniciando ETL - Período: {start_ts.date()} até {end_ts.date()}")
+        etl_processor = etl_processor or DataETL(
+            source=args.source, autotune=args.autotune
+        )
+        etl_processor.run_report = report
+        logger.info(f"Iniciando ETL do ativo {asset}: {start_ts} até {end_ts}")
         logger.info(f"Campos solicitados: {args.fields}")
 
-        raw_data = etl_processor.extract_data(
-            start_ts=start_ts,
-            end_ts=end_ts,
-            fields=args.fields.split(","),
-            page_size=args.page_size,
-        )
+        # Janela sem registros na origem: nada a extrair nem a gravar
+        if etl_processor.window_is_empty(start_ts, end_ts, asset):
+            logger.info(f"Nenhum registro do ativo {asset} na origem nesta janela")
+            etl_processor.last_extract_ok = True
+            report.finish()
+            return report
+
+        if args.chunk_hours:
+            report.finish(
+                status=run_chunked(
+                    args, etl_processor, session, report, start_ts, end_ts, asset
+                )
+            )
+            return report
+
+        with report.stage("extract") as stage:
+            raw_data = etl_processor.extract(
+                start_ts=start_ts,
+                end_ts=end_ts,
+                fields=args.fields.split(","),
+                page_size=args.page_size,
+                asset=asset,
+            )
+            stage.rows = len(raw_data)
+            stage.bytes = (
+                int(raw_data.memory_usage(deep=True).sum())
+                if isinstance(raw_data, pd.DataFrame)
+                else report.http_bytes
+            )
 
         logger.info(f"Dados extraídos: {len(raw_data)} registros")
 
-        if raw_data:
+        if len(raw_data):
             logger.debug(f"Primeiros registros: {raw_data[:3]}")
 
-        transformed_data = etl_processor.transform_data(raw_data)
+        # Interrompido antes da carga, nada é gravado: o próximo ciclo refaz
+        # a janela a partir do que já está no destino
+        if etl_processor.stop_requested():
+            report.finish(status="interrupted")
+            return report
+
+        if args.load_strategy == "elt":
+            # Transformação e carga num passo só, dentro do banco
+            with report.stage("load") as stage:
+                inserted, updated = etl_processor.load_raw_data(
+                    session, raw_data, args.fields.split(","), asset
+                )
+                stage.rows = inserted + updated
+        else:
+            with report.stage("transform") as stage:
+                transformed_data = etl_processor.transform_data(raw_data)
+                stage.rows = len(transformed_data)
+                stage.bytes = int(transformed_data.memory_usage(deep=True).sum())
+
+            if not transformed_data.empty:
+                logger.debug(f"Dados transformados: {transformed_data.head()}")
 
-        if not transformed_data.empty:
-            logger.debug(f"Dados transformados: {transformed_data.head()}")
+            load = (
+                etl_processor.load_data_daily
+                if args.storage == "daily"
+                else etl_processor.load_data
+            )
+            with report.stage("load") as stage:
+                inserted, updated = load(session, transformed_data, asset)
+                stage.rows = inserted + updated
+                stage.bytes = int(transformed_data.memory_usage(deep=True).sum())
+        report.record_load(inserted, updated)
 
-        etl_processor.load_data(session, transformed_data)
+        report.finish()
 
     except Exception as e:
 
-        logger.error(f"Erro durante execução do ETL: {e}")
+        logger.error(f"Erro durante execução do ETL do ativo {asset}: {e}")
         session.rollback()
-        return
+        report.finish(status="failed", error=str(e))
 
     finally:
+        save_run_report(session, report, args.report_file)
         session.close()
 
+    return report
+
+
+def run_chunked(
+    args,
+    etl_processor: DataETL,
+    session,
+    report: RunReport,
+    start_ts: datetime,
+    end_ts: datetime,
+    asset: str,
+) -> str:
+    """Extrai e agrega a janela em partes de ``args.chunk_hours`` horas.
+
+    Com o resumo de disponibilidade da API as partes também são limitadas
+    pelo orçamento de memória: cada uma tem no máximo as linhas estimadas que
+    cabem nele com folga para uma cópia (a ordenação na agregação). Os
+    agregados ficam no ``SpillBuffer`` e só são gravados depois que todas as
+    partes foram extraídas, então uma falha ou interrupção no meio não deixa
+    a janela parcialmente carregada. Retorna o status da execução.
+    """
+    fields = args.fields.split(",")
+    memory_budget = int(args.memory_budget_mb * 1024 * 1024)
+    transformer = ChunkedTransformer(fields, TRANSFORM_CHUNK_ROWS, memory_budget)
+    buffer = SpillBuffer(memory_budget, TRANSFORM_SPILL_DIR or None)
+    typed = etl_processor.columnar or etl_processor.source == "database"
+    max_rows = max(1, memory_budget // (2 * raw_row_bytes(fields, typed)))
+    windows = split_window_by_rows(
+        start_ts,
+        end_ts,
+        timedelta(hours=args.chunk_hours),
+        etl_processor.source_row_counts(start_ts, end_ts, asset) or {},
+        max_rows,
+    )
+
+    try:
+        for window_start, window_end in windows:
+            with report.stage("extract") as stage:
+                raw_data = etl_processor.extract(
+                    start_ts=window_start,
+                    end_ts=window_end,
+                    fields=fields,
+                    page_size=args.page_size,
+                    asset=asset,
+                )
+                stage.rows += len(raw_data)
+
+            if etl_processor.stop_requested():
+                return "interrupted"
+            if not etl_processor.last_extract_ok:
+                raise RuntimeError(
+                    f"Falha na extração de {window_start} até {window_end}"
+                )
+
+            with report.stage("transform") as stage:
+                aggregated = transformer.feed(raw_data)
+                del raw_data
+                buffer.append(aggregated)
+                stage.rows += len(aggregated)
+
+        with report.stage("transform") as stage:
+            aggregated = transformer.finish()
+            buffer.append(aggregated)
+            stage.rows += len(aggregated)
+        logger.info(
+            f"{buffer.rows} intervalos agregados em {len(windows)} partes "
+            f"({buffer.spilled_files} arquivos em disco)"
+        )
+
+        load = (
+            etl_processor.load_data_daily
+            if args.storage == "daily"
+            else etl_processor.load_data
+        )
+        with report.stage("load") as stage:
+            for aggregated in buffer:
+                inserted, updated = load(session, aggregated, asset)
+                report.record_load(inserted, updated)
+                stage.rows += inserted + updated
+    finally:
+        buffer.close()
+
+    return "success"
+
+
+def save_run_report(session, report: RunReport, report_file: str | None = None):
+
+    report_json = report.to_json()
+    logger.info(f"Relatório da execução: {report_json}")
+
+    if report_file:
+        with open(report_file, "w", encoding="utf-8") as output_file:
+            output_file.write(report_json)
+
+    if EtlRunService().save_report(session, report) is None:
+        logger.error("Não foi possível gravar o relatório na tabela etl_run")
+
 
 if __name__ == "__main__":
     main()
@@ -1,30 +1,71 @@
 from sqlalchemy import (
+    DDL,
+    JSON,
     TIMESTAMP,
     CheckConstraint,
     Column,
+    Date,
     Float,
     ForeignKey,
     Integer,
     String,
+    UniqueConstraint,
     and_,
     cast,
+    event,
     func,
+    select,
 )
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 
 from db import Base
+from settings import DEFAULT_ASSET_NAME
+
+
+class Asset(Base):
+    __tablename__ = "asset"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False, index=True, unique=True)
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+    signals = relationship("Signal", back_populates="asset")
+
+
+# Sinais criados sem ativo (instalações de um único ativo) caem no padrão
+DEFAULT_ASSET_ID = (
+    select(Asset.id).where(Asset.name == DEFAULT_ASSET_NAME).scalar_subquery()
+)
+
+
+@event.listens_for(Asset.__table__, "after_create")
+def create_default_asset(target, connection, **kw):
+    connection.execute(target.insert().values(name=DEFAULT_ASSET_NAME))
 
 
 class Signal(Base):
     __tablename__ = "signal"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(255), nullable=False, index=True, unique=True)
+    asset_id = Column(
+        Integer,
+        ForeignKey("asset.id"),
+        nullable=False,
+        index=True,
+        default=DEFAULT_ASSET_ID,
+    )
+    name = Column(String(255), nullable=False, index=True)
 
+    asset = relationship("Asset", back_populates="signals")
     data_points = relationship(
         "Data", back_populates="signal", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        UniqueConstraint("asset_id", "name", name="uq_signal_asset_id_name"),
+    )
+
 
 class Data(Base):
     __tablename__ = "data"
@@ -45,3 +86,68 @@ class Data(Base):
             name="ts_must_be_exact_10_min_interval",
         ),
     )
+
+
+class DataDaily(Base):
+    """Formato compacto opcional: os 144 valores de 10 minutos de um sinal num
+    dia, em ``slots`` (float8[] no PostgreSQL; slot i = dia + i * 10 min)."""
+
+    __tablename__ = "data_daily"
+
+    signal_id = Column(Integer, ForeignKey("signal.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    slots = Column(JSON().with_variant(ARRAY(Float), "postgresql"), nullable=False)
+    updated_at = Column(
+        TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+# Expõe data_daily no formato longo de data (uma linha por valor)
+DATA_DAILY_LONG_VIEW = DDL(
+    """
+CREATE OR REPLACE VIEW data_daily_long AS
+SELECT
+    d.signal_id,
+    d.day + (v.slot - 1) * interval '10 minutes' AS ts,
+    v.value,
+    d.updated_at AS created_at
+FROM data_daily d
+CROSS JOIN LATERAL unnest(d.slots) WITH ORDINALITY AS v (value, slot)
+WHERE v.value IS NOT NULL
+"""
+)
+
+event.listen(
+    DataDaily.__table__,
+    "after_create",
+    DATA_DAILY_LONG_VIEW.execute_if(dialect="postgresql"),
+)
+event.listen(
+    DataDaily.__table__,
+    "before_drop",
+    DDL("DROP VIEW IF EXISTS data_daily_long").execute_if(dialect="postgresql"),
+)
+
+
+class EtlRun(Base):
+    __tablename__ = "etl_run"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(TIMESTAMP, nullable=False, index=True)
+    finished_at = Column(TIMESTAMP)
+    status = Column(String(20), nullable=False)
+    report = Column(JSON, nullable=False)
+
+
+class EtlWatermark(Base):
+    """Fim da última janela processada com sucesso, por ativo."""
+
+    __tablename__ = "etl_watermark"
+
+    asset_id = Column(Integer, ForeignKey("asset.id"), primary_key=True)
+    last_ts = Column(TIMESTAMP, nullable=False)
+    # Posição no feed /changes da API (modo --daemon --follow-changes)
+    changes_cursor = Column(String(255))
+    updated_at = Column(
+        TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+
+import models.data  # Importa os modelos para registrar no Base
+from db import Base, SessionLocal, engine
+from settings import DEFAULT_ASSET_NAME
+
+# Migra bancos criados antes da dimensão de ativo: os sinais existentes
+# passam a pertencer ao ativo padrão e o nome deixa de ser único globalmente.
+MIGRATION_SQL = """
+INSERT INTO asset (name) VALUES (:asset) ON CONFLICT (name) DO NOTHING;
+
+ALTER TABLE signal ADD COLUMN IF NOT EXISTS asset_id integer REFERENCES asset (id);
+UPDATE signal SET asset_id = (SELECT id FROM asset WHERE name = :asset)
+WHERE asset_id IS NULL;
+ALTER TABLE signal ALTER COLUMN asset_id SET NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_signal_asset_id ON signal (asset_id);
+
+DROP INDEX IF EXISTS ix_signal_name;
+CREATE INDEX ix_signal_name ON signal (name);
+ALTER TABLE signal DROP CONSTRAINT IF EXISTS uq_signal_asset_id_name;
+ALTER TABLE signal ADD CONSTRAINT uq_signal_asset_id_name UNIQUE (asset_id, name);
+"""
+
+
+def migrate_assets():
+
+    if engine.dialect.name != "postgresql":
+        print("A migração de ativos requer PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        # Cria asset e etl_watermark (as tabelas existentes não são alteradas)
+        Base.metadata.create_all(bind=engine)
+
+        session.execute(text(MIGRATION_SQL), {"asset": DEFAULT_ASSET_NAME})
+        session.commit()
+
+        print(f"Sucesso! Sinais existentes atribuídos ao ativo '{DEFAULT_ASSET_NAME}'")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_assets()
@@ -0,0 +1,38 @@
+from sqlalchemy import text
+
+from db import SessionLocal, engine
+
+# Adiciona o cursor do feed /changes (modo --daemon --follow-changes) a
+# bancos criados antes dele; os watermarks existentes ficam sem cursor e o
+# daemon o posiciona no fim do feed no primeiro ciclo.
+MIGRATION_SQL = """
+ALTER TABLE etl_watermark ADD COLUMN IF NOT EXISTS changes_cursor varchar(255);
+"""
+
+
+def migrate_changes_cursor():
+
+    if engine.dialect.name != "postgresql":
+        print("A migração do cursor de alterações requer PostgreSQL")
+        return
+
+    session = SessionLocal()
+
+    try:
+        session.execute(text(MIGRATION_SQL))
+        session.commit()
+
+        print("Sucesso! Coluna changes_cursor adicionada a etl_watermark")
+
+    except Exception as e:
+        print(f"Ocorreu um erro: {e}")
+
+        session.rollback()
+
+    finally:
+
+        session.close()
+
+
+if __name__ == "__main__":
+    migrate_changes_cursor()
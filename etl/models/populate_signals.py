@@ -1,4 +1,8 @@
-from services import SignalService
+import argparse
+
+from db import SessionLocal
+from services import AssetService, SignalService
+from settings import DEFAULT_ASSET_NAME
 
 # Sinais base - apenas os nomes principais
 base_signals = ["wind_speed", "power", "ambient_temperature"]
@@ -12,28 +16,35 @@ for base in base_signals:
     for suffix in suffixes:
         all_signals.append(f"{base}_{suffix}")
 
+parser = argparse.ArgumentParser(description="Cria os sinais de cada ativo.")
+parser.add_argument(
+    "--assets",
+    type=str,
+    default=DEFAULT_ASSET_NAME,
+    help=f"Ativos separados por vírgula (padrão: {DEFAULT_ASSET_NAME})",
+)
+args = parser.parse_args()
+
+asset_service = AssetService()
 signal_service = SignalService()
-session = signal_service.get_session()
+session = SessionLocal()
 
 try:
-    # Busca sinais existentes usando o serviço
-    existing_signals = set(signal_service.get_all_names(session))
-
-    # Identifica apenas os sinais que precisam ser adicionados
-    new_signals = [name for name in all_signals if name not in existing_signals]
-
-    # Adiciona todos os novos sinais de uma vez usando o serviço
-    if new_signals:
-        signals_data = [{"name": name} for name in new_signals]
-        created_signals = signal_service.create_many(session, signals_data)
-        if created_signals:
+    for asset in [name.strip() for name in args.assets.split(",") if name.strip()]:
+        asset_id = asset_service.get_or_create_id(session, asset)
+        if asset_id is None:
+            print(f"Erro ao criar o ativo {asset}")
+            continue
+
+        # Cria apenas os sinais que ainda não existem no ativo
+        new_signals = signal_service.create_missing(session, asset_id, all_signals)
+        if new_signals:
             print(
-                f"{len(new_signals)} novos sinais adicionados: {', '.join(new_signals)}"
+                f"{asset}: {len(new_signals)} novos sinais adicionados: "
+                f"{', '.join(new_signals)}"
             )
         else:
-            print("Erro ao criar sinais")
-    else:
-        print("Todos os sinais já existem")
+            print(f"{asset}: todos os sinais já existem")
 
     print(f"Processo concluído!")
 
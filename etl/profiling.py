@@ -0,0 +1,64 @@
+import cProfile
+import io
+import json
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from settings import get_logger
+
+logger = get_logger(__name__)
+
+STATS_LIMIT = 50
+
+
+def write_profile(
+    profiler: cProfile.Profile, directory: str, name: str, metadata: Dict[str, Any]
+) -> Path:
+    """Grava o perfil em .prof (pstats), .txt (resumo legível) e .json (metadados)."""
+    output_dir = Path(directory)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    base = output_dir / f"{timestamp}-{re.sub(r'[^A-Za-z0-9_-]+', '_', name)}"
+
+    profiler.dump_stats(base.with_suffix(".prof"))
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LIMIT)
+    base.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+
+    base.with_suffix(".json").write_text(
+        json.dumps(metadata, indent=2, default=str), encoding="utf-8"
+    )
+    return base.with_suffix(".prof")
+
+
+@contextmanager
+def profile_run(directory: str, name: str, metadata: Dict[str, Any]) -> Iterator[None]:
+    """Executa o bloco sob cProfile e grava o resultado em ``directory``.
+
+    Abra o .prof com ``python -m pstats`` ou snakeviz; o .json guarda os
+    parâmetros da execução e a duração.
+    """
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        metadata = {
+            **metadata,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        try:
+            path = write_profile(profiler, directory, name, metadata)
+            logger.info(f"Perfil da execução gravado em {path}")
+        except OSError as e:
+            logger.error(f"Não foi possível gravar o perfil da execução: {e}")
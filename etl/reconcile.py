@@ -0,0 +1,368 @@
+import argparse
+import json
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from elt import AGGREGATIONS
+from extractors import SOURCE_TABLE
+from main import DataETL, map_assets, run_etl
+from settings import (
+    DATABASE_URL_SOURCE,
+    RECONCILE_BUCKET_HOURS,
+    RECONCILE_TOLERANCE,
+    get_logger,
+)
+from windows import BUCKET
+
+logger = get_logger(__name__)
+
+# (intervalo, sinal) -> (pontos, soma, soma ponderada)
+Checksums = Dict[Tuple[datetime, str], Tuple[int, float, float]]
+
+# Resumo por intervalo de :bucket e sinal dos pontos de 10 minutos em points.
+# A soma ponderada pela posição do ponto no intervalo (1, 2, ...) acusa
+# valores trocados de lugar, que a soma simples não vê.
+CHECKSUM_SQL = """
+WITH {points}
+SELECT
+    date_bin(:bucket, p.ts, timestamp '2000-01-01') AS bucket,
+    p.signal,
+    count(*) AS points,
+    sum(p.value) AS total,
+    sum(
+        p.value * (
+            extract(
+                epoch FROM p.ts - date_bin(:bucket, p.ts, timestamp '2000-01-01')
+            ) / 600 + 1
+        )::float8
+    ) AS weighted
+FROM points p
+GROUP BY 1, 2
+"""
+
+# Na origem os agregados são recalculados como no AGGREGATE_SQL do elt
+# (intervalos (T, T + 10 min] rotulados T); só os resumos saem do banco.
+SOURCE_POINTS = """
+raw AS (
+    SELECT
+        date_bin(
+            interval '10 minutes',
+            d.ts - interval '1 microsecond',
+            timestamp '2000-01-01'
+        ) AS ts,
+        f.field,
+        f.value
+    FROM {table} d
+    CROSS JOIN LATERAL (VALUES {fields}) AS f (field, value)
+    WHERE d.asset_id = (SELECT id FROM asset WHERE name = :asset)
+        AND d.ts > :start_ts
+        AND d.ts <= :end_ts
+        AND f.value IS NOT NULL
+),
+aggregated AS (
+    SELECT
+        ts,
+        field,
+        avg(value) AS mean,
+        min(value) AS min,
+        max(value) AS max,
+        stddev_samp(value) AS std
+    FROM raw
+    GROUP BY 1, 2
+),
+points AS (
+    SELECT a.ts, a.field || '_' || v.aggregation AS signal, v.value
+    FROM aggregated a
+    CROSS JOIN LATERAL (
+        VALUES ('mean', a.mean), ('min', a.min), ('max', a.max), ('std', a.std)
+    ) AS v (aggregation, value)
+    WHERE v.value IS NOT NULL
+)
+"""
+
+TARGET_POINTS = """
+points AS (
+    SELECT d.ts, s.name AS signal, d.value
+    FROM {table} d
+    JOIN signal s ON s.id = d.signal_id
+    JOIN asset a ON a.id = s.asset_id
+    WHERE a.name = :asset
+        AND s.name = ANY(:signals)
+        AND d.ts >= :start_ts
+        AND d.ts < :end_ts
+        AND d.value IS NOT NULL
+)
+"""
+
+
+@dataclass
+class BucketMismatch:
+    start: datetime
+    end: datetime
+    signals: List[str]
+    source_points: int
+    target_points: int
+
+    def to_dict(self) -> Dict:
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "signals": self.signals,
+            "source_points": self.source_points,
+            "target_points": self.target_points,
+        }
+
+
+def _matches(source, target, tolerance: float) -> bool:
+    if source is None or target is None:
+        return source == target
+    if source[0] != target[0]:
+        return False
+    return all(
+        math.isclose(a, b, rel_tol=tolerance, abs_tol=tolerance)
+        for a, b in zip(source[1:], target[1:])
+    )
+
+
+def compare_checksums(
+    source: Checksums,
+    target: Checksums,
+    bucket: timedelta,
+    start_ts: datetime,
+    end_ts: datetime,
+    tolerance: float = RECONCILE_TOLERANCE,
+) -> List[BucketMismatch]:
+    """Intervalos com algum sinal divergente, limitados à janela [início, fim)."""
+    divergent: Dict[datetime, List[str]] = {}
+    for key in source.keys() | target.keys():
+        if not _matches(source.get(key), target.get(key), tolerance):
+            divergent.setdefault(key[0], []).append(key[1])
+
+    def points(checksums: Checksums, bucket_start: datetime) -> int:
+        return sum(
+            value[0] for (start, _), value in checksums.items() if start == bucket_start
+        )
+
+    return [
+        BucketMismatch(
+            start=max(bucket_start, start_ts),
+            end=min(bucket_start + bucket, end_ts),
+            signals=sorted(signals),
+            source_points=points(source, bucket_start),
+            target_points=points(target, bucket_start),
+        )
+        for bucket_start, signals in sorted(divergent.items())
+    ]
+
+
+def merge_windows(mismatches: List[BucketMismatch]) -> List[Tuple[datetime, datetime]]:
+    """Junta intervalos divergentes consecutivos em janelas para reprocessar."""
+    windows: List[Tuple[datetime, datetime]] = []
+    for mismatch in mismatches:
+        if windows and windows[-1][1] == mismatch.start:
+            windows[-1] = (windows[-1][0], mismatch.end)
+        else:
+            windows.append((mismatch.start, mismatch.end))
+    return windows
+
+
+class Reconciler:
+    """Compara origem e destino por intervalos de ``bucket`` sem trafegar linhas.
+
+    Cada lado é resumido no próprio banco por um único comando SQL: na origem
+    os agregados de 10 minutos são recalculados a partir das leituras brutas e
+    no destino são lidos de data (ou de data_daily_long com ``storage``
+    "daily"). Só os resumos, um por intervalo e sinal, chegam ao ETL. Requer
+    PostgreSQL 14 ou superior (``date_bin``) nos dois bancos.
+    """
+
+    def __init__(
+        self,
+        database_url: Optional[str] = DATABASE_URL_SOURCE,
+        bucket: timedelta = timedelta(hours=RECONCILE_BUCKET_HOURS),
+        tolerance: float = RECONCILE_TOLERANCE,
+        storage: str = "long",
+    ):
+        if not database_url:
+            raise ValueError("Configure DB_*_SOURCE ou DATABASE_URL_SOURCE")
+        if bucket <= timedelta(0) or bucket % BUCKET:
+            raise ValueError(f"Intervalo de reconciliação inválido: {bucket}")
+
+        self.engine: Engine = create_engine(database_url, pool_pre_ping=True)
+        self.bucket = bucket
+        self.tolerance = tolerance
+        self.target_table = "data_daily_long" if storage == "daily" else "data"
+
+    def source_checksums(
+        self, asset: str, start_ts: datetime, end_ts: datetime, fields: List[str]
+    ) -> Checksums:
+        if self.engine.dialect.name != "postgresql":
+            raise ValueError("A reconciliação requer PostgreSQL na origem")
+
+        columns = {
+            source_column["name"]
+            for source_column in inspect(self.engine).get_columns(SOURCE_TABLE)
+        }
+        unknown = set(fields) - columns
+        if unknown:
+            raise ValueError(f"Campos inexistentes na tabela de origem: {unknown}")
+
+        # Os nomes foram conferidos com as colunas da tabela
+        values = ", ".join(f"('{field}', d.{field}::float8)" for field in fields)
+        points = SOURCE_POINTS.format(table=SOURCE_TABLE, fields=values)
+        with self.engine.connect() as connection:
+            return self._checksums(
+                connection,
+                points,
+                {"asset": asset, "start_ts": start_ts, "end_ts": end_ts},
+            )
+
+    def target_checksums(
+        self,
+        session: Session,
+        asset: str,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: List[str],
+    ) -> Checksums:
+        if session.bind.dialect.name != "postgresql":
+            raise ValueError("A reconciliação requer PostgreSQL no destino")
+
+        signals = [f"{field}_{agg}" for field in fields for agg in AGGREGATIONS]
+        return self._checksums(
+            session.connection(),
+            TARGET_POINTS.format(table=self.target_table),
+            {
+                "asset": asset,
+                "signals": signals,
+                "start_ts": start_ts,
+                "end_ts": end_ts,
+            },
+        )
+
+    def _checksums(self, connection, points: str, params: Dict) -> Checksums:
+        rows = connection.execute(
+            text(CHECKSUM_SQL.format(points=points)), {**params, "bucket": self.bucket}
+        )
+        return {
+            (row.bucket, row.signal): (row.points, row.total, row.weighted)
+            for row in rows
+        }
+
+    def reconcile(
+        self,
+        session: Session,
+        asset: str,
+        start_ts: datetime,
+        end_ts: datetime,
+        fields: List[str],
+    ) -> List[BucketMismatch]:
+        """Intervalos da janela (início, fim] com divergência entre os lados."""
+        started = time.perf_counter()
+        source = self.source_checksums(asset, start_ts, end_ts, fields)
+        target = self.target_checksums(session, asset, start_ts, end_ts, fields)
+        mismatches = compare_checksums(
+            source, target, self.bucket, start_ts, end_ts, self.tolerance
+        )
+        logger.info(
+            f"Reconciliação do ativo {asset}: {len(mismatches)} intervalos "
+            f"divergentes ({len(source)} resumos na origem, {len(target)} no "
+            f"destino) em {time.perf_counter() - started:.2f}s"
+        )
+        return mismatches
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+def run_reconcile(
+    args,
+    start_ts: datetime,
+    end_ts: datetime,
+    assets: List[str],
+    etl_processor: Optional[DataETL] = None,
+    reconciler: Optional[Reconciler] = None,
+) -> Dict[str, List[BucketMismatch]]:
+    """Reconcilia a janela de cada ativo e, com ``args.repair``, reprocessa só
+    os intervalos divergentes. Retorna as divergências que restaram."""
+    fields = args.fields.split(",")
+    reconciler = reconciler or Reconciler(
+        bucket=timedelta(hours=args.bucket_hours), storage=args.storage
+    )
+    etl_processor = etl_processor or DataETL(
+        source=args.source, autotune=args.autotune
+    )
+    # O relatório de cada reprocessamento vai para a tabela etl_run
+    repair_args = argparse.Namespace(**{**vars(args), "report_file": None})
+
+    def check(asset: str, start: datetime, end: datetime) -> List[BucketMismatch]:
+        session = SessionLocal()
+        try:
+            return reconciler.reconcile(session, asset, start, end, fields)
+        finally:
+            session.close()
+
+    def reconcile_asset(asset: str) -> Dict:
+        mismatches = check(asset, start_ts, end_ts)
+        for mismatch in mismatches:
+            logger.warning(
+                f"Ativo {asset}: {mismatch.start} até {mismatch.end} divergente "
+                f"({mismatch.source_points} pontos na origem, "
+                f"{mismatch.target_points} no destino; sinais {mismatch.signals})"
+            )
+        result = {"mismatches": mismatches, "repaired": [], "remaining": mismatches}
+        if not args.repair or not mismatches:
+            return result
+
+        repaired = result["repaired"]
+        remaining = result["remaining"] = []
+        for window_start, window_end in merge_windows(mismatches):
+            report = run_etl(
+                repair_args, window_start, window_end, etl_processor, asset
+            )
+            repaired.append(
+                {
+                    "start": window_start.isoformat(),
+                    "end": window_end.isoformat(),
+                    "status": report.status,
+                }
+            )
+            remaining.extend(check(asset, window_start, window_end))
+        if remaining:
+            # Pontos sem correspondente na origem não são removidos pela carga
+            logger.error(
+                f"Ativo {asset}: {len(remaining)} intervalos continuam divergentes "
+                "após o reprocessamento"
+            )
+        return result
+
+    try:
+        results = dict(
+            zip(assets, map_assets(reconcile_asset, assets, args.asset_workers))
+        )
+    finally:
+        reconciler.close()
+
+    if args.report_file:
+        with open(args.report_file, "w", encoding="utf-8") as output_file:
+            json.dump(
+                {
+                    asset: {
+                        "mismatches": [m.to_dict() for m in result["mismatches"]],
+                        "repaired": result["repaired"],
+                        "remaining": [m.to_dict() for m in result["remaining"]],
+                    }
+                    for asset, result in results.items()
+                },
+                output_file,
+            )
+
+    return {asset: result["remaining"] for asset, result in results.items()}
@@ -0,0 +1,167 @@
+import json
+import math
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - indisponível no Windows
+    resource = None
+
+
+@dataclass
+class StageStats:
+    wall_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if not self.wall_seconds:
+            return None
+        return round(self.rows / self.wall_seconds, 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "wall_seconds": round(self.wall_seconds, 6),
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Percentil pelo método nearest-rank (q entre 0 e 100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KiB e macOS em bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunReport:
+    """Relatório estruturado de uma execução do ETL.
+
+    Acumula tempo, linhas e bytes por etapa, latência das requisições HTTP,
+    uso de memória e linhas inseridas/atualizadas; ``to_dict`` gera o JSON
+    que é registrado no log e gravado na tabela etl_run.
+    """
+
+    def __init__(
+        self,
+        parameters: Optional[Dict[str, Any]] = None,
+        top_allocations: int = 0,
+    ):
+        self.parameters = parameters or {}
+        self.top_allocations = top_allocations
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.stages: Dict[str, StageStats] = {}
+        self.http_latencies: List[float] = []
+        self.http_bytes = 0
+        self._http_lock = threading.Lock()
+        self.rows_inserted = 0
+        self.rows_updated = 0
+        self.allocations: List[Dict[str, Any]] = []
+        self.traced_peak_bytes: Optional[int] = None
+        self._started_tracing = False
+        self._start_counter = 0.0
+        self.wall_seconds = 0.0
+
+    def start(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self._start_counter = time.perf_counter()
+        if self.top_allocations > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def finish(self, status: str = "success", error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = datetime.now(timezone.utc)
+        self.wall_seconds = time.perf_counter() - self._start_counter
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            self.traced_peak_bytes = tracemalloc.get_traced_memory()[1]
+            self.allocations = [
+                {
+                    "location": str(stat.traceback[0]),
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[: self.top_allocations]
+            ]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        stats = self.stages.setdefault(name, StageStats())
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.wall_seconds += time.perf_counter() - start
+
+    def record_http(self, seconds: float, num_bytes: int) -> None:
+        # Chamado também pelas threads da busca paralela de páginas
+        with self._http_lock:
+            self.http_latencies.append(seconds)
+            self.http_bytes += num_bytes
+
+    def record_load(self, inserted: int, updated: int) -> None:
+        self.rows_inserted += inserted
+        self.rows_updated += updated
+
+    def to_dict(self) -> Dict[str, Any]:
+        latencies_ms = [latency * 1000 for latency in self.http_latencies]
+
+        def _ms(q: float) -> Optional[float]:
+            value = percentile(latencies_ms, q)
+            return round(value, 3) if value is not None else None
+
+        return {
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "parameters": self.parameters,
+            "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+            "http": {
+                "requests": len(latencies_ms),
+                "bytes": self.http_bytes,
+                "latency_ms": {
+                    "p50": _ms(50),
+                    "p90": _ms(90),
+                    "p99": _ms(99),
+                    "max": _ms(100),
+                },
+            },
+            "rows": {"inserted": self.rows_inserted, "updated": self.rows_updated},
+            "memory": {
+                "peak_rss_bytes": peak_rss_bytes(),
+                "traced_peak_bytes": self.traced_peak_bytes,
+                "top_allocations": self.allocations,
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), default=str)
@@ -5,8 +5,20 @@ Este módulo fornece uma camada de abstração entre a aplicação e o banco de
 organizando as operações CRUD e lógicas de negócio relacionadas aos dados.
 """
 
+from .asset_service import AssetService
 from .base import BaseService
+from .data_daily_service import DataDailyService
 from .data_service import DataService
+from .etl_run_service import EtlRunService
 from .signal_service import SignalService
+from .watermark_service import WatermarkService
 
-__all__ = ["BaseService", "SignalService", "DataService"]
+__all__ = [
+    "BaseService",
+    "AssetService",
+    "SignalService",
+    "DataService",
+    "DataDailyService",
+    "EtlRunService",
+    "WatermarkService",
+]
@@ -0,0 +1,47 @@
+from typing import List, Optional
+
+from models.data import Asset as AssetModel
+from services.base import BaseService
+from settings import get_logger
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+
+class AssetService(BaseService[AssetModel]):
+
+    def __init__(self):
+        super().__init__(AssetModel)
+
+    def get_id(self, session: Session, name: str) -> Optional[int]:
+
+        return session.query(AssetModel.id).filter(AssetModel.name == name).scalar()
+
+    def get_or_create_id(self, session: Session, name: str) -> Optional[int]:
+
+        asset_id = self.get_id(session, name)
+        if asset_id is not None:
+            return asset_id
+
+        try:
+            asset = AssetModel(name=name)
+            session.add(asset)
+            session.commit()
+            logger.info(f"Ativo criado: {name}")
+            return asset.id
+        except IntegrityError:
+            # Criado por outro pipeline entre a consulta e o INSERT
+            session.rollback()
+            return self.get_id(session, name)
+
+    def get_all_names(self, session: Session) -> List[str]:
+
+        try:
+            return [
+                name
+                for (name,) in session.query(AssetModel.name).order_by(AssetModel.name)
+            ]
+        except Exception as e:
+            logger.error(f"Erro ao buscar nomes dos ativos: {e}")
+            return []
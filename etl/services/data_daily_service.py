@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from compact import SLOTS, merge_slots, to_db_rows, unpack_daily
+from models.data import DataDaily as DataDailyModel
+from services.base import BaseService
+from settings import get_logger
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+
+class DataDailyService(BaseService[DataDailyModel]):
+
+    def __init__(self):
+        super().__init__(DataDailyModel)
+
+    def _query_days(
+        self, session: Session, signal_ids: Iterable[int], start_day, end_day
+    ):
+        return session.query(
+            DataDailyModel.signal_id, DataDailyModel.day, DataDailyModel.slots
+        ).filter(
+            DataDailyModel.signal_id.in_([int(signal_id) for signal_id in signal_ids]),
+            DataDailyModel.day >= start_day,
+            DataDailyModel.day <= end_day,
+        )
+
+    def upsert_days(
+        self, session: Session, keys: pd.DataFrame, matrix: np.ndarray
+    ) -> Tuple[int, int]:
+        """Grava os vetores diários de ``keys``/``matrix`` (de ``pack_daily``)
+        mesclando com os slots já gravados; retorna (inseridos, atualizados)."""
+
+        days = keys["day"].dt.date
+        existing = {
+            (signal_id, day): slots
+            for signal_id, day, slots in self._query_days(
+                session, keys["signal_id"].unique(), days.min(), days.max()
+            )
+        }
+
+        merged = matrix.copy()
+        updated = 0
+        for row, key in enumerate(zip(keys["signal_id"].tolist(), days)):
+            if key in existing:
+                merged[row] = merge_slots(
+                    matrix[row], np.array(existing[key], dtype="float64")
+                )
+                updated += 1
+
+        rows = [
+            {"signal_id": signal_id, "day": day, "slots": slots}
+            for (signal_id, day), slots in zip(
+                zip(keys["signal_id"].tolist(), days), to_db_rows(merged)
+            )
+        ]
+        try:
+            # Um único INSERT ... ON CONFLICT (executado em lotes) no lugar de
+            # um merge (SELECT + INSERT/UPDATE) por sinal e dia
+            insert = (
+                postgresql_insert
+                if session.get_bind().dialect.name == "postgresql"
+                else sqlite_insert
+            )
+            statement = insert(DataDailyModel)
+            statement = statement.on_conflict_do_update(
+                index_elements=[DataDailyModel.signal_id, DataDailyModel.day],
+                set_={"slots": statement.excluded.slots, "updated_at": func.now()},
+            )
+            session.execute(statement, rows)
+            session.commit()
+        except Exception as e:
+            logger.error(f"Erro ao gravar dados no formato diário: {e}")
+            session.rollback()
+            return 0, 0
+
+        values = int(np.count_nonzero(~np.isnan(matrix)))
+        logger.info(f"{len(keys)} vetores diários gravados ({values} valores)")
+        return len(keys) - updated, updated
+
+    def get_frame(
+        self,
+        session: Session,
+        signal_ids: Iterable[int],
+        start_ts: datetime,
+        end_ts: datetime,
+    ) -> pd.DataFrame:
+        """Lê a janela [início, fim] no formato longo (signal_id, ts, value)."""
+
+        rows = self._query_days(
+            session, signal_ids, start_ts.date(), end_ts.date()
+        ).all()
+        if not rows:
+            return unpack_daily(np.array([], dtype="int64"), [], np.empty((0, SLOTS)))
+
+        signal_id_values, days, slots = zip(*rows)
+        frame = unpack_daily(
+            np.array(signal_id_values),
+            [pd.Timestamp(day) for day in days],
+            np.array(slots, dtype="float64"),
+        )
+        return frame[(frame["ts"] >= start_ts) & (frame["ts"] <= end_ts)].reset_index(
+            drop=True
+        )
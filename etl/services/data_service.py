@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from models.data import Data as DataModel
+from models.data import Signal as SignalModel
 from services.base import BaseService
 from settings import get_logger
 
@@ -34,6 +35,34 @@ class DataService(BaseService[DataModel]):
             session.rollback()
             return False
 
+    def get_existing_keys(
+        self,
+        session: Session,
+        signal_ids: Iterable[int],
+        start_ts: datetime,
+        end_ts: datetime,
+    ) -> Set[Tuple[int, datetime]]:
+
+        rows = (
+            session.query(DataModel.signal_id, DataModel.ts)
+            .filter(
+                DataModel.signal_id.in_(list(signal_ids)),
+                DataModel.ts >= start_ts,
+                DataModel.ts <= end_ts,
+            )
+            .all()
+        )
+        return {(signal_id, ts) for signal_id, ts in rows}
+
+    def get_latest_ts(
+        self, session: Session, asset_id: Optional[int] = None
+    ) -> Optional[datetime]:
+
+        query = session.query(func.max(DataModel.ts))
+        if asset_id is not None:
+            query = query.join(SignalModel).filter(SignalModel.asset_id == asset_id)
+        return query.scalar()
+
     def create_data_point(
         self, session: Session, signal_id: int, timestamp: datetime, value: float
     ) -> Optional[DataModel]:
@@ -0,0 +1,42 @@
+from typing import List, Optional
+
+from models.data import EtlRun as EtlRunModel
+from run_report import RunReport
+from services.base import BaseService
+from settings import get_logger
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+
+class EtlRunService(BaseService[EtlRunModel]):
+
+    def __init__(self):
+        super().__init__(EtlRunModel)
+
+    def save_report(
+        self, session: Session, report: RunReport
+    ) -> Optional[EtlRunModel]:
+
+        return self.create(
+            session,
+            started_at=report.started_at.replace(tzinfo=None),
+            finished_at=(
+                report.finished_at.replace(tzinfo=None) if report.finished_at else None
+            ),
+            status=report.status,
+            report=report.to_dict(),
+        )
+
+    def get_recent(self, session: Session, limit: int = 20) -> List[EtlRunModel]:
+
+        try:
+            return (
+                session.query(EtlRunModel)
+                .order_by(EtlRunModel.started_at.desc())
+                .limit(limit)
+                .all()
+            )
+        except Exception as e:
+            logger.error(f"Erro ao buscar execuções do ETL: {e}")
+            return []
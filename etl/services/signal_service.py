@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from models.data import Signal as SignalModel
 from services.base import BaseService
@@ -13,11 +13,15 @@ class SignalService(BaseService[SignalModel]):
     def __init__(self):
         super().__init__(SignalModel)
 
-    def get_signals_map(self, session: Session) -> Dict[str, int]:
+    def get_signals_map(
+        self, session: Session, asset_id: Optional[int] = None
+    ) -> Dict[str, int]:
 
         try:
-            signals = session.query(SignalModel).all()
-            return {signal.name: signal.id for signal in signals}
+            query = session.query(SignalModel)
+            if asset_id is not None:
+                query = query.filter(SignalModel.asset_id == asset_id)
+            return {signal.name: signal.id for signal in query.all()}
         except Exception as e:
             logger.error(f"Erro ao criar mapa de sinais: {e}")
             return {}
@@ -30,3 +34,26 @@ class SignalService(BaseService[SignalModel]):
         except Exception as e:
             logger.error(f"Erro ao buscar nomes dos sinais: {e}")
             return []
+
+    def create_missing(
+        self, session: Session, asset_id: int, names: Iterable[str]
+    ) -> List[str]:
+        """Cria os sinais do ativo que ainda não existem e retorna seus nomes."""
+
+        existing = self.get_signals_map(session, asset_id)
+        missing = sorted(set(names) - set(existing))
+        if not missing:
+            return []
+
+        try:
+            session.add_all(
+                [SignalModel(asset_id=asset_id, name=name) for name in missing]
+            )
+            session.commit()
+            logger.info(f"Sinais criados para o ativo {asset_id}: {missing}")
+            return missing
+        except Exception as e:
+            # Outro pipeline pode ter criado os mesmos sinais ao mesmo tempo
+            logger.warning(f"Erro ao criar sinais do ativo {asset_id}: {e}")
+            session.rollback()
+            return []
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+
+from models.data import EtlWatermark as EtlWatermarkModel
+from services.base import BaseService
+from settings import get_logger
+from sqlalchemy.orm import Session
+
+logger = get_logger(__name__)
+
+
+class WatermarkService(BaseService[EtlWatermarkModel]):
+
+    def __init__(self):
+        super().__init__(EtlWatermarkModel)
+
+    def get(self, session: Session, asset_id: int) -> Optional[datetime]:
+
+        return (
+            session.query(EtlWatermarkModel.last_ts)
+            .filter(EtlWatermarkModel.asset_id == asset_id)
+            .scalar()
+        )
+
+    def advance(self, session: Session, asset_id: int, last_ts: datetime) -> bool:
+        """Move o watermark do ativo para ``last_ts``; nunca o faz retroceder."""
+
+        try:
+            watermark = session.get(EtlWatermarkModel, asset_id)
+            if watermark is None:
+                session.add(EtlWatermarkModel(asset_id=asset_id, last_ts=last_ts))
+            elif last_ts > watermark.last_ts:
+                watermark.last_ts = last_ts
+            session.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao gravar o watermark do ativo {asset_id}: {e}")
+            session.rollback()
+            return False
+
+    def get_cursor(self, session: Session, asset_id: int) -> Optional[str]:
+
+        return (
+            session.query(EtlWatermarkModel.changes_cursor)
+            .filter(EtlWatermarkModel.asset_id == asset_id)
+            .scalar()
+        )
+
+    def save_cursor(self, session: Session, asset_id: int, cursor: str) -> bool:
+        """Grava a posição do ativo no feed de alterações.
+
+        Só atualiza watermarks existentes: antes da primeira janela processada
+        não há o que corrigir no destino.
+        """
+
+        try:
+            watermark = session.get(EtlWatermarkModel, asset_id)
+            if watermark is None:
+                return False
+            watermark.changes_cursor = cursor
+            session.commit()
+            return True
+        except Exception as e:
+            logger.error(
+                f"Erro ao gravar o cursor de alterações do ativo {asset_id}: {e}"
+            )
+            session.rollback()
+            return False
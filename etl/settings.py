@@ -16,9 +16,128 @@ DB_PASSWORD_TARGET = os.getenv("DB_PASSWORD_TARGET")
 DATABASE_URL_TARGET = f"postgresql+psycopg2://{DB_USER_TARGET}:{DB_PASSWORD_TARGET}@{DB_HOST_TARGET}:{DB_PORT_TARGET}/{DB_NAME_TARGET}"
 
 
+# Origem da extração: "api" (HTTP, padrão) ou "database" (leitura direta da
+# tabela data da API, para quando o ETL roda na mesma rede do banco de origem)
+EXTRACT_SOURCE = os.getenv("EXTRACT_SOURCE", "api").lower()
+
+# Banco de origem, usado só com EXTRACT_SOURCE=database
+DB_HOST_SOURCE = os.getenv("DB_HOST_SOURCE")
+DB_PORT_SOURCE = int(os.getenv("DB_PORT_SOURCE", "5432"))
+DB_NAME_SOURCE = os.getenv("DB_NAME_SOURCE")
+DB_USER_SOURCE = os.getenv("DB_USER_SOURCE")
+DB_PASSWORD_SOURCE = os.getenv("DB_PASSWORD_SOURCE")
+
+DATABASE_URL_SOURCE = os.getenv("DATABASE_URL_SOURCE") or (
+    f"postgresql+psycopg2://{DB_USER_SOURCE}:{DB_PASSWORD_SOURCE}"
+    f"@{DB_HOST_SOURCE}:{DB_PORT_SOURCE}/{DB_NAME_SOURCE}"
+    if DB_HOST_SOURCE
+    else None
+)
+
+# Leitura direta: "copy" usa COPY TO STDOUT (somente PostgreSQL); "cursor"
+# usa um cursor no servidor lido em lotes de EXTRACT_DB_BATCH_SIZE linhas
+EXTRACT_DB_METHOD = os.getenv("EXTRACT_DB_METHOD", "copy").lower()
+EXTRACT_DB_BATCH_SIZE = int(os.getenv("EXTRACT_DB_BATCH_SIZE", "50000"))
+
+# Estratégia de carga: "pandas" (agrega no ETL, padrão) ou "elt" (copia as
+# linhas brutas para uma staging e agrega no PostgreSQL, em blocos de
+# ELT_COPY_CHUNK_ROWS linhas por COPY)
+LOAD_STRATEGY = os.getenv("LOAD_STRATEGY", "pandas").lower()
+ELT_COPY_CHUNK_ROWS = int(os.getenv("ELT_COPY_CHUNK_ROWS", "100000"))
+
+# Formato de gravação dos agregados: "long" (uma linha por valor em data,
+# padrão) ou "daily" (um float8[] de 144 intervalos por sinal e dia em
+# data_daily, lido no formato longo pela view data_daily_long)
+STORAGE_FORMAT = os.getenv("STORAGE_FORMAT", "long").lower()
+
+# Transformação em blocos (--chunk-hours): a janela é extraída em partes de
+# TRANSFORM_CHUNK_HOURS horas (0 desliga) e agregada em blocos de até
+# TRANSFORM_CHUNK_ROWS linhas. ETL_MEMORY_BUDGET_MB limita cada bloco bruto
+# (as partes são divididas pelo resumo de disponibilidade da API para caber
+# nele) e os agregados mantidos em memória até a carga; acima disso eles vão
+# para arquivos em TRANSFORM_SPILL_DIR (vazio: a execução falha).
+TRANSFORM_CHUNK_HOURS = float(os.getenv("TRANSFORM_CHUNK_HOURS", "0"))
+TRANSFORM_CHUNK_ROWS = int(os.getenv("TRANSFORM_CHUNK_ROWS", "100000"))
+ETL_MEMORY_BUDGET_MB = float(os.getenv("ETL_MEMORY_BUDGET_MB", "512"))
+TRANSFORM_SPILL_DIR = os.getenv("TRANSFORM_SPILL_DIR", ".cache/spill")
+
+# Decodifica as páginas da API direto em colunas tipadas (datetime64 para ts e
+# EXTRACT_FLOAT_DTYPE, float64 ou float32, para os campos) em vez de acumular
+# a lista de registros
+EXTRACT_COLUMNAR = os.getenv("EXTRACT_COLUMNAR", "true").lower() in ("1", "true")
+EXTRACT_FLOAT_DTYPE = os.getenv("EXTRACT_FLOAT_DTYPE", "float64")
+
 API_BASE_URL = os.getenv("API_BASE_URL")
 API_KEY = os.getenv("API_KEY")
 
+# Cache local das respostas da API (requisições condicionais com ETag).
+# Desabilitado por padrão: as entradas não expiram, então habilite só em
+# reprocessamentos repetidos da mesma janela (ex.: .cache/http).
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "")
+
+# Codificações anunciadas no Accept-Encoding. Por padrão o httpx anuncia todas
+# as que consegue decodificar (gzip, deflate e, com o extra "compression",
+# br e zstd).
+HTTP_ACCEPT_ENCODING = os.getenv("HTTP_ACCEPT_ENCODING")
+
+# Relatório de execução: quantidade de alocações (tracemalloc) listadas no
+# relatório. Desligado (0) por padrão, já que o tracemalloc deixa a execução
+# bem mais lenta; habilite (ex.: 10) ao investigar o uso de memória.
+RUN_REPORT_TOP_ALLOCATIONS = int(os.getenv("RUN_REPORT_TOP_ALLOCATIONS", "0"))
+
+# Diretório padrão dos perfis gravados com --profile
+PROFILE_DIR = os.getenv("PROFILE_DIR", ".cache/profiles")
+
+# Modo --daemon: intervalo entre ciclos, espera após o fim de um intervalo de
+# 10 minutos antes de considerá-lo fechado, maior janela por ciclo (em atraso)
+# e quanto buscar na primeira execução com o destino vazio
+DAEMON_INTERVAL_SECONDS = float(os.getenv("DAEMON_INTERVAL_SECONDS", "60"))
+DAEMON_LAG_SECONDS = float(os.getenv("DAEMON_LAG_SECONDS", "60"))
+DAEMON_MAX_WINDOW_HOURS = float(os.getenv("DAEMON_MAX_WINDOW_HOURS", "24"))
+DAEMON_INITIAL_LOOKBACK_HOURS = float(
+    os.getenv("DAEMON_INITIAL_LOOKBACK_HOURS", "24")
+)
+
+# Registros por página do feed /changes lido com --daemon --follow-changes
+DAEMON_CHANGES_LIMIT = int(os.getenv("DAEMON_CHANGES_LIMIT", "1000"))
+
+# Ativos processados por execução, separados por vírgula, ou "all" para todos
+# os ativos da origem. Cada ativo roda num pipeline próprio, até
+# ETL_ASSET_WORKERS em paralelo, compartilhando o cliente HTTP e o pool do
+# banco de destino. DEFAULT_ASSET_NAME é o ativo dos sinais criados sem ativo.
+DEFAULT_ASSET_NAME = os.getenv("DEFAULT_ASSET_NAME", "default")
+ETL_ASSETS = os.getenv("ETL_ASSETS", DEFAULT_ASSET_NAME)
+ETL_ASSET_WORKERS = int(os.getenv("ETL_ASSET_WORKERS", "4"))
+
+# Ajuste automático da extração pela API (AIMD): o tamanho de página e as
+# requisições simultâneas crescem aos poucos enquanto as respostas chegam em
+# até ETL_TARGET_LATENCY_SECONDS e caem pela metade com respostas lentas,
+# 429/5xx ou timeouts, sempre entre os limites abaixo (a API aceita páginas
+# de até 1000 registros). A janela é extraída em partes de ETL_SEGMENT_HOURS
+# horas, cada uma com um tamanho de página fixo; cada página é repetida até
+# ETL_TUNING_MAX_RETRIES vezes, depois do Retry-After da resposta ou, sem ele,
+# de uma espera exponencial aleatória a partir de ETL_RETRY_BACKOFF_SECONDS
+# (limitada a ETL_RETRY_BACKOFF_MAX_SECONDS).
+ETL_AUTOTUNE = os.getenv("ETL_AUTOTUNE", "true").lower() in ("1", "true")
+ETL_PAGE_SIZE_MIN = int(os.getenv("ETL_PAGE_SIZE_MIN", "25"))
+ETL_PAGE_SIZE_MAX = int(os.getenv("ETL_PAGE_SIZE_MAX", "1000"))
+ETL_PAGE_SIZE_STEP = int(os.getenv("ETL_PAGE_SIZE_STEP", "100"))
+ETL_MAX_CONCURRENCY = int(os.getenv("ETL_MAX_CONCURRENCY", "4"))
+ETL_TARGET_LATENCY_SECONDS = float(os.getenv("ETL_TARGET_LATENCY_SECONDS", "1.0"))
+ETL_SEGMENT_HOURS = float(os.getenv("ETL_SEGMENT_HOURS", "6"))
+ETL_TUNING_MAX_RETRIES = int(os.getenv("ETL_TUNING_MAX_RETRIES", "3"))
+ETL_RETRY_BACKOFF_SECONDS = float(os.getenv("ETL_RETRY_BACKOFF_SECONDS", "0.5"))
+ETL_RETRY_BACKOFF_MAX_SECONDS = float(
+    os.getenv("ETL_RETRY_BACKOFF_MAX_SECONDS", "30")
+)
+
+# Reconciliação (--reconcile): origem e destino são resumidos em intervalos de
+# RECONCILE_BUCKET_HOURS horas (quantidade de pontos e somas por sinal),
+# calculados nos próprios bancos. Somas com diferença relativa acima de
+# RECONCILE_TOLERANCE marcam o intervalo como divergente.
+RECONCILE_BUCKET_HOURS = int(os.getenv("RECONCILE_BUCKET_HOURS", "24"))
+RECONCILE_TOLERANCE = float(os.getenv("RECONCILE_TOLERANCE", "1e-6"))
+
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
 LOG_FORMAT = os.getenv(
     "LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
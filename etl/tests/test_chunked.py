@@ -0,0 +1,219 @@
+from argparse import Namespace
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from chunked import ChunkedTransformer, MemoryBudgetError, SpillBuffer
+from main import DataETL, run_etl
+from windows import split_window, split_window_by_rows
+
+FIELDS = ["wind_speed", "power"]
+
+
+@pytest.fixture
+def raw_frame():
+    rng = np.random.default_rng(42)
+    frame = pd.DataFrame(
+        {
+            "ts": pd.date_range("2024-01-01 00:00:37", periods=3000, freq="37s"),
+            "wind_speed": rng.normal(10, 2, 3000),
+            "power": rng.normal(1000, 100, 3000),
+        }
+    )
+    frame.loc[rng.choice(3000, 300, replace=False), "power"] = np.nan
+    return frame
+
+
+class TestChunkedTransformer:
+
+    @pytest.mark.unit
+    def test_matches_transform_data(self, raw_frame):
+        expected = DataETL().transform_data(raw_frame)
+        expected = expected.dropna(how="all", subset=expected.columns[1:])
+
+        transformer = ChunkedTransformer(FIELDS, chunk_rows=333, memory_budget=10**9)
+        parts = [
+            transformer.feed(raw_frame.iloc[start : start + 1234])
+            for start in range(0, len(raw_frame), 1234)
+        ]
+        result = pd.concat([*parts, transformer.finish()], ignore_index=True)
+
+        pd.testing.assert_frame_equal(
+            result, expected.reset_index(drop=True), check_dtype=False, rtol=1e-9
+        )
+
+    @pytest.mark.unit
+    def test_rejects_out_of_order_chunks(self, raw_frame):
+        transformer = ChunkedTransformer(FIELDS, chunk_rows=100, memory_budget=10**9)
+        transformer.feed(raw_frame.iloc[1000:1100])
+
+        with pytest.raises(ValueError):
+            transformer.feed(raw_frame.iloc[:100])
+
+    @pytest.mark.unit
+    def test_chunk_over_budget(self, raw_frame):
+        transformer = ChunkedTransformer(FIELDS, chunk_rows=100, memory_budget=1024)
+
+        with pytest.raises(MemoryBudgetError):
+            transformer.feed(raw_frame)
+
+
+class TestSpillBuffer:
+
+    @pytest.mark.unit
+    def test_spills_to_disk_in_order(self, tmp_path):
+        buffer = SpillBuffer(memory_budget=2000, spill_dir=str(tmp_path))
+        frames = [
+            pd.DataFrame({"value": np.arange(i * 100, (i + 1) * 100)}) for i in range(5)
+        ]
+
+        for frame in frames:
+            buffer.append(frame)
+
+        assert buffer.spilled_files > 0
+        pd.testing.assert_frame_equal(
+            pd.concat(list(buffer), ignore_index=True),
+            pd.concat(frames, ignore_index=True),
+        )
+
+        buffer.close()
+        assert not any(tmp_path.iterdir())
+
+    @pytest.mark.unit
+    def test_without_spill_dir_fails(self):
+        buffer = SpillBuffer(memory_budget=100)
+
+        with pytest.raises(MemoryBudgetError):
+            buffer.append(pd.DataFrame({"value": np.arange(100)}))
+
+
+class TestRunChunked:
+
+    def _args(self, chunk_hours, memory_budget_mb=64):
+        return Namespace(
+            fields="wind_speed,power",
+            page_size=25,
+            autotune=False,
+            source="api",
+            load_strategy="pandas",
+            storage="long",
+            chunk_hours=chunk_hours,
+            memory_budget_mb=memory_budget_mb,
+            report_file=None,
+        )
+
+    @pytest.mark.unit
+    def test_extracts_by_window_and_loads_once(self, raw_frame):
+        etl_processor = DataETL()
+
+        def extract(start_ts, end_ts, fields, page_size, asset):
+            etl_processor.last_extract_ok = True
+            ts = raw_frame["ts"]
+            return raw_frame[(ts > start_ts) & (ts <= end_ts)]
+
+        with patch.object(etl_processor, "extract", side_effect=extract), patch.object(
+            etl_processor, "load_data", return_value=(10, 0)
+        ) as mock_load, patch("main.SessionLocal"), patch("main.save_run_report"):
+            report = run_etl(
+                self._args(chunk_hours=2),
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 3),
+                etl_processor,
+            )
+
+        assert report.status == "success"
+        assert report.stages["extract"].rows == len(raw_frame)
+        assert mock_load.call_count == 1
+        assert report.rows_inserted == 10
+
+    @pytest.mark.unit
+    def test_parts_sized_by_memory_budget(self, raw_frame, tmp_path):
+        etl_processor = DataETL(columnar=True)
+        hourly_rows = raw_frame["ts"].dt.floor("h").value_counts().to_dict()
+        part_rows = []
+
+        def extract(start_ts, end_ts, fields, page_size, asset):
+            etl_processor.last_extract_ok = True
+            ts = raw_frame["ts"]
+            part = raw_frame[(ts > start_ts) & (ts <= end_ts)]
+            part_rows.append(len(part))
+            return part
+
+        # 48 KB: até 1000 linhas de 24 bytes por parte, com folga para uma cópia
+        with patch.object(etl_processor, "extract", side_effect=extract), patch.object(
+            etl_processor, "source_row_counts", return_value=hourly_rows
+        ), patch.object(etl_processor, "load_data", return_value=(10, 0)), patch(
+            "main.TRANSFORM_SPILL_DIR", str(tmp_path)
+        ), patch("main.SessionLocal"), patch("main.save_run_report"):
+            report = run_etl(
+                self._args(chunk_hours=48, memory_budget_mb=48000 / 2**20),
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 3),
+                etl_processor,
+            )
+
+        assert report.status == "success"
+        assert report.stages["extract"].rows == len(raw_frame)
+        assert len(part_rows) == 3
+        assert max(part_rows) <= 1000
+
+    @pytest.mark.unit
+    def test_failed_window_loads_nothing(self):
+        etl_processor = DataETL()
+        etl_processor.extract = Mock(return_value=[])
+
+        with patch.object(etl_processor, "load_data") as mock_load, patch(
+            "main.SessionLocal"
+        ), patch("main.save_run_report"):
+            report = run_etl(
+                self._args(chunk_hours=1),
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 1, 3),
+                etl_processor,
+            )
+
+        assert report.status == "failed"
+        assert etl_processor.extract.call_count == 1
+        mock_load.assert_not_called()
+
+
+class TestSplitWindow:
+
+    @pytest.mark.unit
+    def test_split_window(self):
+        windows = split_window(
+            datetime(2024, 1, 1), datetime(2024, 1, 1, 2, 30), pd.Timedelta(hours=1)
+        )
+
+        assert windows == [
+            (datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 1)),
+            (datetime(2024, 1, 1, 1), datetime(2024, 1, 1, 2)),
+            (datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 2, 30)),
+        ]
+
+    @pytest.mark.unit
+    def test_split_window_by_rows(self):
+        hourly_rows = {datetime(2024, 1, 1, 0): 600, datetime(2024, 1, 1, 2): 100}
+
+        windows = split_window_by_rows(
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 1, 4),
+            pd.Timedelta(hours=2),
+            hourly_rows,
+            max_rows=250,
+        )
+
+        assert windows == [
+            (datetime(2024, 1, 1, 0), datetime(2024, 1, 1, 0, 25)),
+            (datetime(2024, 1, 1, 0, 25), datetime(2024, 1, 1, 0, 50)),
+            (datetime(2024, 1, 1, 0, 50), datetime(2024, 1, 1, 2)),
+            (datetime(2024, 1, 1, 2), datetime(2024, 1, 1, 4)),
+        ]
+        # Sem contagens, como split_window
+        assert split_window_by_rows(
+            datetime(2024, 1, 1), datetime(2024, 1, 1, 4), pd.Timedelta(hours=2), {}, 1
+        ) == split_window(
+            datetime(2024, 1, 1), datetime(2024, 1, 1, 4), pd.Timedelta(hours=2)
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from columnar import ColumnarBuffer
+from main import DataETL
+
+
+def _page(start, rows):
+    return [
+        {
+            "ts": (datetime(2024, 1, 1) + pd.Timedelta(minutes=start + i)).isoformat(),
+            "wind_speed": float(start + i),
+            **({"power": None} if i % 3 == 0 else {"power": 2.0 * (start + i)}),
+        }
+        for i in range(rows)
+    ]
+
+
+class TestColumnarBuffer:
+
+    @pytest.mark.unit
+    def test_decodes_pages_into_typed_columns(self):
+        buffer = ColumnarBuffer(
+            ["wind_speed", "power", "ambient_temperature"], capacity=4
+        )
+
+        buffer.append(_page(0, 3))
+        buffer.append(_page(3, 7))
+        frame = buffer.to_frame()
+
+        assert len(frame) == 10
+        assert buffer.capacity == 10
+        assert frame["ts"].dtype == "datetime64[ns]"
+        assert frame["ts"].iloc[-1] == pd.Timestamp("2024-01-01 00:09")
+        assert frame["wind_speed"].tolist() == [float(i) for i in range(10)]
+        assert frame["power"].isna().sum() == 4
+        assert frame["ambient_temperature"].isna().all()
+
+    @pytest.mark.unit
+    def test_frame_shares_buffers(self):
+        buffer = ColumnarBuffer(["wind_speed"], dtype="float32")
+        buffer.append(_page(0, 5))
+
+        frame = buffer.to_frame()
+
+        assert frame["wind_speed"].dtype == np.float32
+        assert np.shares_memory(
+            frame["wind_speed"].to_numpy(), buffer._values["wind_speed"]
+        )
+
+    @pytest.mark.unit
+    def test_timezone_converted_to_utc(self):
+        buffer = ColumnarBuffer(["power"])
+        buffer.append([{"ts": "2024-01-01T10:00:00-03:00", "power": 1.0}])
+
+        assert buffer.to_frame()["ts"].iloc[0] == pd.Timestamp("2024-01-01 13:00")
+
+    @pytest.mark.unit
+    def test_extract_data_columnar_matches_records(self):
+        etl_processor = DataETL()
+        pages = [_page(0, 25), _page(25, 25), _page(50, 10)]
+
+        def get(url, params=None, headers=None):
+            response = Mock(status_code=200, headers={}, num_bytes_downloaded=0)
+            response.json.return_value = {
+                "data": pages[params["page"] - 1],
+                "paging": {"total_pages": len(pages)},
+            }
+            return response
+
+        window = (datetime(2024, 1, 1), datetime(2024, 1, 2), ["wind_speed", "power"])
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor.client, "get", side_effect=get
+        ):
+            records = etl_processor.extract_data(*window)
+            frame = etl_processor.extract_data(*window, columnar=True)
+
+        assert isinstance(frame, pd.DataFrame)
+        pd.testing.assert_frame_equal(
+            etl_processor.transform_data(frame),
+            etl_processor.transform_data(records),
+            check_dtype=False,
+            check_freq=False,
+        )
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from compact import SLOTS, merge_slots, pack_daily, to_db_rows, unpack_daily
+from main import DataETL
+from models.data import DataDaily
+from services import DataDailyService
+
+
+class TestCompact:
+
+    @pytest.mark.unit
+    def test_pack_unpack_round_trip(self):
+        points = pd.DataFrame(
+            {
+                "signal_id": [1, 1, 2, 1],
+                "ts": pd.to_datetime(
+                    [
+                        "2024-01-01 00:00",
+                        "2024-01-01 23:50",
+                        "2024-01-01 00:10",
+                        "2024-01-02 12:00",
+                    ]
+                ),
+                "value": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+
+        keys, matrix = pack_daily(
+            points["signal_id"].to_numpy(), points["ts"], points["value"].to_numpy()
+        )
+
+        assert matrix.shape == (3, SLOTS)
+        assert keys.to_dict("list")["signal_id"] == [1, 2, 1]
+        assert matrix[0, 0] == 1.0 and matrix[0, 143] == 2.0
+        assert np.count_nonzero(~np.isnan(matrix)) == 4
+
+        unpacked = unpack_daily(keys["signal_id"].to_numpy(), keys["day"], matrix)
+        pd.testing.assert_frame_equal(
+            unpacked.sort_values(["signal_id", "ts"]).reset_index(drop=True),
+            points.sort_values(["signal_id", "ts"]).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    @pytest.mark.unit
+    def test_pack_rejects_unaligned_ts(self):
+        with pytest.raises(ValueError):
+            pack_daily(np.array([1]), ["2024-01-01 00:05"], np.array([1.0]))
+
+    @pytest.mark.unit
+    def test_merge_keeps_existing_slots(self):
+        new = np.array([np.nan, 2.0, np.nan])
+        existing = np.array([1.0, 9.0, np.nan])
+
+        merged = merge_slots(new, existing)
+
+        assert to_db_rows(merged) == [1.0, 2.0, None]
+
+
+class TestLoadDataDaily:
+
+    @pytest.mark.unit
+    def test_load_and_read_back(
+        self, test_session, sample_transformed_data, sample_signals
+    ):
+        test_session.query(DataDaily).delete()
+        test_session.commit()
+        etl_processor = DataETL()
+        simple_df = sample_transformed_data[["ts", "wind_speed_mean"]].copy()
+
+        assert etl_processor.load_data_daily(test_session, simple_df) == (1, 0)
+
+        later = pd.DataFrame(
+            {"ts": [datetime(2024, 1, 1, 10, 20)], "wind_speed_mean": [13.0]}
+        )
+        assert etl_processor.load_data_daily(test_session, later) == (0, 1)
+
+        frame = DataDailyService().get_frame(
+            test_session,
+            [sample_signals[0].id],
+            datetime(2024, 1, 1, 10, 0),
+            datetime(2024, 1, 1, 10, 10),
+        )
+        assert frame["value"].tolist() == [15.5, 14.8]
+        assert test_session.query(DataDaily).count() == 1
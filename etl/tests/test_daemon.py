@@ -0,0 +1,305 @@
+from argparse import Namespace
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from daemon import EtlDaemon
+from run_report import RunReport, StageStats
+from windows import align_window, changed_windows, floor_bucket, next_window
+
+LAG = timedelta(minutes=1)
+MAX_WINDOW = timedelta(hours=24)
+LOOKBACK = timedelta(hours=1)
+
+
+def _args(assets="default"):
+    return Namespace(
+        interval=60,
+        assets=assets,
+        asset_workers=4,
+        source="api",
+        load_strategy="pandas",
+        storage="long",
+        chunk_hours=0,
+        memory_budget_mb=512,
+        fields="wind_speed",
+        page_size=25,
+        autotune=False,
+        report_file=None,
+        profile=False,
+        profile_dir=".cache/profiles",
+        follow_changes=False,
+    )
+
+
+def _report(status: str, extracted_rows: int) -> RunReport:
+    report = RunReport(top_allocations=0)
+    report.status = status
+    report.stages["extract"] = StageStats(rows=extracted_rows)
+    return report
+
+
+class TestWindows:
+
+    @pytest.mark.unit
+    def test_floor_bucket(self):
+        assert floor_bucket(datetime(2024, 1, 1, 10, 27, 59, 5)) == datetime(
+            2024, 1, 1, 10, 20
+        )
+
+    @pytest.mark.unit
+    def test_align_window_covers_whole_buckets(self):
+        assert align_window(
+            datetime(2024, 1, 1, 10, 27), datetime(2024, 1, 1, 10, 41, 30)
+        ) == (datetime(2024, 1, 1, 10, 20), datetime(2024, 1, 1, 10, 50))
+        assert align_window(datetime(2024, 1, 1), datetime(2024, 1, 2)) == (
+            datetime(2024, 1, 1),
+            datetime(2024, 1, 2),
+        )
+
+    @pytest.mark.unit
+    def test_next_window_after_watermark(self):
+        window = next_window(
+            datetime(2024, 1, 1, 10, 0),
+            datetime(2024, 1, 1, 10, 35, 30),
+            LAG,
+            MAX_WINDOW,
+            LOOKBACK,
+        )
+
+        assert window == (datetime(2024, 1, 1, 10, 10), datetime(2024, 1, 1, 10, 30))
+
+    @pytest.mark.unit
+    def test_next_window_waits_for_lag(self):
+        window = next_window(
+            datetime(2024, 1, 1, 10, 20),
+            datetime(2024, 1, 1, 10, 30, 30),
+            LAG,
+            MAX_WINDOW,
+            LOOKBACK,
+        )
+
+        assert window is None
+
+    @pytest.mark.unit
+    def test_next_window_empty_target_and_catch_up(self):
+        now = datetime(2024, 1, 10, 12, 5)
+
+        assert next_window(None, now, LAG, MAX_WINDOW, LOOKBACK) == (
+            datetime(2024, 1, 10, 11, 0),
+            datetime(2024, 1, 10, 12, 0),
+        )
+        assert next_window(
+            datetime(2024, 1, 1), now, LAG, MAX_WINDOW, LOOKBACK
+        ) == (datetime(2024, 1, 1, 0, 10), datetime(2024, 1, 2, 0, 10))
+
+
+    @pytest.mark.unit
+    def test_changed_windows_merges_processed_buckets(self):
+        timestamps = [
+            datetime(2024, 1, 1, 10, 12),
+            datetime(2024, 1, 1, 9, 55),
+            datetime(2024, 1, 1, 10, 10),
+            datetime(2024, 1, 1, 11, 0),
+            datetime(2024, 1, 1, 10, 45),
+        ]
+
+        assert changed_windows(timestamps, until=datetime(2024, 1, 1, 11, 0)) == [
+            (datetime(2024, 1, 1, 9, 50), datetime(2024, 1, 1, 10, 20)),
+            (datetime(2024, 1, 1, 10, 40), datetime(2024, 1, 1, 11, 0)),
+        ]
+        assert changed_windows(timestamps, until=datetime(2024, 1, 1, 10, 0)) == [
+            (datetime(2024, 1, 1, 9, 50), datetime(2024, 1, 1, 10, 0)),
+        ]
+
+
+class TestEtlDaemon:
+
+    @pytest.fixture
+    def watermarks(self):
+        return {}
+
+    @pytest.fixture
+    def cursors(self):
+        return {}
+
+    @pytest.fixture
+    def daemon(self, watermarks, cursors):
+        etl_processor = Mock(last_extract_ok=True)
+        etl_processor.resolve_assets.side_effect = lambda assets: assets.split(",")
+        etl_processor.get_asset_id.side_effect = lambda session, asset: asset
+        daemon = EtlDaemon(
+            _args(),
+            etl_processor=etl_processor,
+            clock=lambda: datetime(2024, 1, 1, 10, 35),
+        )
+        daemon.watermark_service = Mock()
+        daemon.watermark_service.get.side_effect = (
+            lambda session, asset_id: watermarks.get(asset_id)
+        )
+        daemon.watermark_service.advance.side_effect = (
+            lambda session, asset_id, last_ts: watermarks.__setitem__(asset_id, last_ts)
+        )
+        daemon.watermark_service.get_cursor.side_effect = (
+            lambda session, asset_id: cursors.get(asset_id)
+        )
+        daemon.watermark_service.save_cursor.side_effect = (
+            lambda session, asset_id, cursor: cursors.__setitem__(asset_id, cursor)
+        )
+        return daemon
+
+    @pytest.mark.unit
+    def test_run_cycle_processes_closed_buckets(self, daemon, watermarks):
+        with patch.object(
+            daemon.data_service,
+            "get_latest_ts",
+            return_value=datetime(2024, 1, 1, 10, 0),
+        ), patch("daemon.SessionLocal"), patch(
+            "daemon.run_etl", return_value=_report("success", 20)
+        ) as mock_run:
+            daemon.run_cycle()
+
+        _, start_ts, end_ts, etl_processor = mock_run.call_args.args
+        assert (start_ts, end_ts) == (
+            datetime(2024, 1, 1, 10, 10),
+            datetime(2024, 1, 1, 10, 30),
+        )
+        assert etl_processor is daemon.etl_processor
+        assert mock_run.call_args.kwargs["asset"] == "default"
+        assert watermarks == {"default": datetime(2024, 1, 1, 10, 30)}
+        assert not daemon.behind
+
+    @pytest.mark.unit
+    def test_empty_source_window_advances(self, daemon):
+        with patch.object(
+            daemon.data_service,
+            "get_latest_ts",
+            return_value=datetime(2024, 1, 1, 10, 0),
+        ), patch("daemon.SessionLocal"), patch(
+            "daemon.run_etl", return_value=_report("success", 0)
+        ) as mock_run:
+            daemon.run_cycle()
+            daemon.clock = lambda: datetime(2024, 1, 1, 10, 45)
+            daemon.run_cycle()
+
+        _, start_ts, end_ts, _ = mock_run.call_args.args
+        assert (start_ts, end_ts) == (
+            datetime(2024, 1, 1, 10, 30),
+            datetime(2024, 1, 1, 10, 40),
+        )
+
+    @pytest.mark.unit
+    def test_assets_keep_separate_watermarks(self, daemon, watermarks):
+        daemon.args.assets = "wtg-01,wtg-02"
+        watermarks["wtg-02"] = datetime(2024, 1, 1, 10, 20)
+
+        with patch.object(
+            daemon.data_service, "get_latest_ts", return_value=None
+        ), patch("daemon.SessionLocal"), patch(
+            "daemon.run_etl", return_value=_report("success", 5)
+        ) as mock_run:
+            reports = daemon.run_cycle()
+
+        windows = {
+            call.kwargs["asset"]: call.args[1:3] for call in mock_run.call_args_list
+        }
+        assert set(reports) == {"wtg-01", "wtg-02"}
+        assert windows["wtg-01"] == (
+            datetime(2023, 12, 31, 10, 30),
+            datetime(2024, 1, 1, 10, 30),
+        )
+        assert windows["wtg-02"] == (
+            datetime(2024, 1, 1, 10, 20),
+            datetime(2024, 1, 1, 10, 30),
+        )
+
+    @pytest.mark.unit
+    def test_serve_stops_on_request(self, daemon):
+        def cycle():
+            daemon.request_stop()
+
+        with patch.object(daemon, "run_cycle", side_effect=cycle) as mock_cycle, patch(
+            "daemon.signal.signal"
+        ), patch("daemon.engine"):
+            daemon.serve()
+
+        assert mock_cycle.call_count == 1
+        daemon.etl_processor.client.close.assert_called_once()
+
+    @pytest.mark.unit
+    def test_follow_changes_reprocesses_corrected_buckets(
+        self, daemon, watermarks, cursors
+    ):
+        daemon.args.follow_changes = True
+        watermarks["default"] = datetime(2024, 1, 1, 10, 30)
+        cursors["default"] = "c1"
+        daemon.etl_processor.extract_changes.side_effect = [
+            {
+                "data": [{"ts": "2024-01-01T10:05:00"}, {"ts": "2024-01-01T10:12:00"}],
+                "next_cursor": "c2",
+                "has_more": True,
+            },
+            # 10:45 ainda não foi processado: entra na próxima janela
+            {
+                "data": [{"ts": "2024-01-01T09:55:00"}, {"ts": "2024-01-01T10:45:00"}],
+                "next_cursor": "c3",
+                "has_more": False,
+            },
+        ]
+
+        with patch.object(
+            daemon.data_service,
+            "get_latest_ts",
+            return_value=datetime(2024, 1, 1, 10, 20),
+        ), patch("daemon.SessionLocal"), patch(
+            "daemon.run_etl", return_value=_report("success", 20)
+        ) as mock_run:
+            reports = daemon.run_cycle()
+
+        assert reports == {}
+        assert [call.args[1:3] for call in mock_run.call_args_list] == [
+            (datetime(2024, 1, 1, 9, 50), datetime(2024, 1, 1, 10, 20))
+        ]
+        first_call = daemon.etl_processor.extract_changes.call_args_list[0]
+        assert first_call.args[0] == "c1"
+        assert cursors == {"default": "c3"}
+
+    @pytest.mark.unit
+    def test_follow_changes_without_cursor_only_positions_it(
+        self, daemon, watermarks, cursors
+    ):
+        daemon.args.follow_changes = True
+        watermarks["default"] = datetime(2024, 1, 1, 10, 30)
+        daemon.etl_processor.extract_changes.return_value = {
+            "data": [{"ts": "2024-01-01T10:05:00"}],
+            "next_cursor": "c1",
+            "has_more": False,
+        }
+
+        with patch.object(
+            daemon.data_service, "get_latest_ts", return_value=None
+        ), patch("daemon.SessionLocal"), patch("daemon.run_etl") as mock_run:
+            daemon.run_cycle()
+
+        mock_run.assert_not_called()
+        assert cursors == {"default": "c1"}
+
+    @pytest.mark.unit
+    def test_follow_changes_keeps_cursor_on_failure(self, daemon, watermarks, cursors):
+        daemon.args.follow_changes = True
+        watermarks["default"] = datetime(2024, 1, 1, 10, 30)
+        cursors["default"] = "c1"
+        daemon.etl_processor.extract_changes.return_value = {
+            "data": [{"ts": "2024-01-01T10:05:00"}],
+            "next_cursor": "c2",
+            "has_more": False,
+        }
+
+        with patch.object(
+            daemon.data_service, "get_latest_ts", return_value=None
+        ), patch("daemon.SessionLocal"), patch(
+            "daemon.run_etl", return_value=_report("failed", 0)
+        ):
+            daemon.run_cycle()
+
+        assert cursors == {"default": "c1"}
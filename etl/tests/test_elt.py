@@ -0,0 +1,121 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from db import Base
+from elt import AGGREGATIONS, EltLoader, iter_long_chunks
+from main import DataETL
+from models.data import Asset, Data, Signal
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+FIELDS = ("wind_speed", "power")
+
+
+class TestElt:
+
+    @pytest.mark.unit
+    def test_iter_long_chunks_drops_missing_values(self):
+        raw_data = [
+            {"ts": "2024-01-01T00:01:00", "wind_speed": 1.0, "power": 10.0},
+            {"ts": "2024-01-01T00:02:00", "wind_speed": 2.0},
+            {"ts": "2024-01-01T00:03:00", "wind_speed": None, "power": 30.0},
+        ]
+
+        chunks = list(iter_long_chunks(raw_data, chunk_rows=2))
+
+        assert [len(chunk) for chunk in chunks] == [3, 1]
+        assert list(chunks[0].columns) == ["ts", "field", "value"]
+        assert chunks[1].iloc[0].to_dict() == {
+            "ts": "2024-01-01T00:03:00",
+            "field": "power",
+            "value": 30.0,
+        }
+
+    @pytest.mark.unit
+    def test_iter_long_chunks_accepts_dataframe(self):
+        frame = pd.DataFrame(
+            {"ts": pd.date_range("2024-01-01", periods=5, freq="min"), "power": 1.0}
+        )
+
+        assert sum(len(chunk) for chunk in iter_long_chunks(frame, 2)) == 5
+
+    @pytest.mark.unit
+    def test_requires_postgresql(self, test_session):
+        with pytest.raises(ValueError):
+            EltLoader().load(
+                test_session, [{"ts": "2024-01-01T00:01:00", "power": 1}], asset_id=1
+            )
+
+
+@pytest.mark.database
+@pytest.mark.skipif(
+    not os.getenv("DATABASE_URL"), reason="requer DATABASE_URL de um PostgreSQL"
+)
+class TestEltPostgres:
+
+    @pytest.fixture
+    def pg_session(self):
+        # Tudo roda numa transação desfeita no fim; o commit do EltLoader só
+        # libera um savepoint
+        engine = create_engine(os.environ["DATABASE_URL"])
+        connection = engine.connect()
+        transaction = connection.begin()
+        Base.metadata.create_all(connection)
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            yield session
+        finally:
+            session.close()
+            transaction.rollback()
+            connection.close()
+            engine.dispose()
+
+    def test_matches_transform_data(self, pg_session):
+        rows = [
+            # Limites exatos: 10:00 fecha o intervalo 09:50, 10:10 o de 10:00
+            (datetime(2024, 1, 1, 10, 0), 4.0, 400.0),
+            (datetime(2024, 1, 1, 10, 0, 1), 5.0, 500.0),
+            (datetime(2024, 1, 1, 10, 4), 7.5, None),
+            (datetime(2024, 1, 1, 10, 10), 6.0, 650.0),
+            (datetime(2024, 1, 1, 10, 10, 0, 1), 8.0, 800.0),
+            # Um único ponto no intervalo: std nulo, não gravado
+            (datetime(2024, 1, 1, 10, 35), 9.0, 900.0),
+        ]
+        raw_data = [
+            {"ts": ts, "wind_speed": wind_speed, "power": power}
+            for ts, wind_speed, power in rows
+        ]
+
+        asset = Asset(name="elt-equivalence")
+        pg_session.add(asset)
+        pg_session.flush()
+        pg_session.add_all(
+            Signal(asset_id=asset.id, name=f"{field}_{aggregation}")
+            for field in FIELDS
+            for aggregation in AGGREGATIONS
+        )
+        pg_session.flush()
+
+        EltLoader(chunk_rows=2).load(pg_session, raw_data, asset_id=asset.id)
+
+        loaded = {
+            (name, ts): value
+            for name, ts, value in pg_session.query(Signal.name, Data.ts, Data.value)
+            .join(Data, Data.signal_id == Signal.id)
+            .filter(Signal.asset_id == asset.id)
+        }
+        transformed = DataETL().transform_data(raw_data).set_index("ts")
+        expected = {
+            (name, ts.to_pydatetime()): value
+            for (ts, name), value in transformed.stack().items()
+            if pd.notna(value)
+        }
+
+        assert loaded == pytest.approx(expected)
+        assert loaded[("wind_speed_max", datetime(2024, 1, 1, 9, 50))] == 4.0
+        assert loaded[("wind_speed_max", datetime(2024, 1, 1, 10, 0))] == 7.5
+        assert loaded[("wind_speed_min", datetime(2024, 1, 1, 10, 10))] == 8.0
+        assert loaded[("wind_speed_mean", datetime(2024, 1, 1, 10, 30))] == 9.0
+        assert ("wind_speed_std", datetime(2024, 1, 1, 10, 30)) not in loaded
@@ -1,3 +1,5 @@
+import json
+import threading
 from datetime import datetime
 from unittest.mock import Mock, patch
 
@@ -30,6 +32,13 @@ class TestETL:
         assert "wind_speed_mean" in result.columns
         assert "power_mean" in result.columns
 
+    @pytest.mark.unit
+    def test_transform_data_accepts_dataframe(self, etl_processor, sample_raw_data):
+        from_records = etl_processor.transform_data(sample_raw_data)
+        from_frame = etl_processor.transform_data(pd.DataFrame(sample_raw_data))
+
+        pd.testing.assert_frame_equal(from_records, from_frame)
+
     @pytest.mark.unit
     def test_load_data_success(
         self, etl_processor, test_session, sample_transformed_data, sample_signals
@@ -43,6 +52,20 @@ class TestETL:
         saved_data = test_session.query(Data).all()
         assert len(saved_data) > 0
 
+    @pytest.mark.unit
+    def test_load_data_counts_inserted_and_updated(
+        self, etl_processor, test_session, sample_transformed_data, sample_signals
+    ):
+        test_session.query(Data).delete()
+        test_session.commit()
+        simple_df = sample_transformed_data[["ts", "wind_speed_mean"]].copy()
+
+        first = etl_processor.load_data(test_session, simple_df)
+        second = etl_processor.load_data(test_session, simple_df)
+
+        assert first == (2, 0)
+        assert second == (0, 2)
+
     @pytest.mark.unit
     def test_extract_available_fields_no_api_key(self, etl_processor):
         with patch.object(etl_processor, "api_key", None):
@@ -90,3 +113,301 @@ class TestETL:
         if etl_processor.api_key:
             assert "Authorization" in etl_processor.client.headers
             assert etl_processor.client.headers["Authorization"].startswith("Bearer ")
+
+    @pytest.mark.unit
+    def test_extract_reuses_local_copy_on_304(self, etl_processor, tmp_path):
+        from http_cache import ResponseCache
+
+        etl_processor.response_cache = ResponseCache(str(tmp_path))
+        body = {
+            "data": [{"ts": "2024-01-01T10:00:00", "wind_speed": 15.5}],
+            "paging": {"total_pages": 1},
+        }
+
+        first_response = Mock(status_code=200, headers={"ETag": '"abc"'})
+        first_response.json.return_value = body
+        not_modified = Mock(status_code=304, headers={"ETag": '"abc"'})
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor.client, "get", side_effect=[first_response, not_modified]
+        ) as mock_get:
+            first = etl_processor.extract_data(
+                datetime(2024, 1, 1), datetime(2024, 1, 2), ["wind_speed"]
+            )
+            second = etl_processor.extract_data(
+                datetime(2024, 1, 1), datetime(2024, 1, 2), ["wind_speed"]
+            )
+
+        assert first == second == body["data"]
+        conditional_headers = mock_get.call_args_list[1].kwargs["headers"]
+        assert conditional_headers == {"If-None-Match": '"abc"'}
+
+    @pytest.mark.unit
+    def test_signals_map_is_cached(self, etl_processor, test_session, sample_signals):
+        asset_id = etl_processor.get_asset_id(test_session, "default")
+        with patch.object(
+            etl_processor.signal_service,
+            "get_signals_map",
+            wraps=etl_processor.signal_service.get_signals_map,
+        ) as mock_get:
+            etl_processor._get_signals_map(test_session, asset_id, ["wind_speed_mean"])
+            etl_processor._get_signals_map(test_session, asset_id, ["power_mean"])
+            assert mock_get.call_count == 1
+
+            signals_map = etl_processor._get_signals_map(
+                test_session, asset_id, ["unknown_mean"]
+            )
+            assert mock_get.call_count > 1
+            assert "unknown_mean" in signals_map
+
+    @pytest.mark.unit
+    def test_load_data_scopes_signals_by_asset(
+        self, etl_processor, test_session, sample_transformed_data, sample_signals
+    ):
+        test_session.query(Data).delete()
+        test_session.commit()
+        simple_df = sample_transformed_data[["ts", "wind_speed_mean"]].copy()
+
+        assert etl_processor.load_data(test_session, simple_df) == (2, 0)
+        assert etl_processor.load_data(test_session, simple_df, "wtg-02") == (2, 0)
+
+        asset_ids = {
+            signal.asset_id
+            for signal in test_session.query(Signal).join(Data).distinct()
+        }
+        assert asset_ids == {
+            etl_processor.get_asset_id(test_session, "default"),
+            etl_processor.get_asset_id(test_session, "wtg-02"),
+        }
+
+    @pytest.mark.unit
+    def test_extract_data_filters_asset(self, etl_processor):
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"data": [], "paging": {"total_pages": 1}}
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor.client, "get", return_value=response
+        ) as mock_get:
+            etl_processor.extract(
+                datetime(2024, 1, 1), datetime(2024, 1, 2), ["power"], asset="wtg-02"
+            )
+
+        assert mock_get.call_args.kwargs["params"]["asset"] == "wtg-02"
+
+    @pytest.mark.unit
+    def test_resolve_assets(self, etl_processor):
+        assert etl_processor.resolve_assets(" wtg-01, wtg-02,") == ["wtg-01", "wtg-02"]
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor, "_get_json", return_value=[{"id": 1, "name": "wtg-01"}]
+        ):
+            assert etl_processor.resolve_assets("all") == ["wtg-01"]
+
+    @pytest.mark.unit
+    def test_extract_changes(self, etl_processor):
+        page = {"data": [], "next_cursor": "c2", "has_more": False}
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor, "_get_json", return_value=page
+        ) as mock_get_json:
+            assert etl_processor.extract_changes("c1", "power", 500, "wtg-01") == page
+
+        assert mock_get_json.call_args.args[0].endswith("/changes")
+        assert mock_get_json.call_args.kwargs["params"] == {
+            "limit": 500,
+            "cursor": "c1",
+            "fields": "power",
+            "asset": "wtg-01",
+        }
+
+        with patch.object(etl_processor, "api_key", None):
+            assert etl_processor.extract_changes("c1") is None
+
+    @pytest.mark.unit
+    def test_run_assets_runs_each_asset(self, tmp_path):
+        from argparse import Namespace
+
+        from main import run_assets
+        from run_report import RunReport
+
+        args = Namespace(asset_workers=3, report_file=str(tmp_path / "report.json"))
+        threads = set()
+
+        def fake_run(run_args, start_ts, end_ts, etl_processor, asset):
+            threads.add(threading.current_thread().name)
+            assert run_args.report_file is None
+            report = RunReport(parameters={"asset": asset}, top_allocations=0)
+            report.status = "success" if asset != "wtg-03" else "failed"
+            return report
+
+        with patch("main.run_etl", side_effect=fake_run):
+            reports = run_assets(
+                args,
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 2),
+                ["wtg-01", "wtg-02", "wtg-03"],
+                etl_processor=Mock(),
+            )
+
+        assert list(reports) == ["wtg-01", "wtg-02", "wtg-03"]
+        assert reports["wtg-03"].status == "failed"
+        assert all(name.startswith("etl-asset") for name in threads)
+        assert set(json.loads((tmp_path / "report.json").read_text())) == set(reports)
+
+    @pytest.mark.unit
+    def test_run_assets_report_file_is_keyed_by_asset(self, tmp_path):
+        from argparse import Namespace
+
+        from main import run_assets
+        from run_report import RunReport
+
+        args = Namespace(asset_workers=1, report_file=str(tmp_path / "report.json"))
+        report = RunReport(parameters={"asset": "wtg-01"}, top_allocations=0)
+
+        with patch("main.run_etl", return_value=report):
+            run_assets(
+                args,
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 2),
+                ["wtg-01"],
+                etl_processor=Mock(),
+            )
+
+        saved = json.loads((tmp_path / "report.json").read_text())
+        assert list(saved) == ["wtg-01"]
+        assert saved["wtg-01"]["parameters"] == {"asset": "wtg-01"}
+
+    @pytest.mark.unit
+    def test_last_extract_ok_is_per_thread(self, etl_processor):
+        etl_processor.last_extract_ok = True
+        seen = []
+
+        thread = threading.Thread(
+            target=lambda: seen.append(etl_processor.last_extract_ok)
+        )
+        thread.start()
+        thread.join()
+
+        assert seen == [False]
+        assert etl_processor.last_extract_ok
+
+    @pytest.mark.unit
+    def test_extract_data_keeps_exact_window(self, etl_processor):
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {"data": [], "paging": {"total_pages": 1}}
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor.client, "get", return_value=response
+        ) as mock_get:
+            etl_processor.extract_data(
+                datetime(2024, 1, 1, 10, 10), datetime(2024, 1, 1, 10, 30), ["power"]
+            )
+
+        params = mock_get.call_args.kwargs["params"]
+        assert params["start_ts"] == "2024-01-01T10:10:00"
+        assert params["end_ts"] == "2024-01-01T10:30:00"
+        assert etl_processor.last_extract_ok
+
+    @pytest.mark.unit
+    def test_run_etl_skips_windows_without_source_rows(self, etl_processor):
+        from argparse import Namespace
+
+        from main import run_etl
+
+        args = Namespace(
+            fields="power",
+            page_size=25,
+            autotune=False,
+            source="api",
+            load_strategy="pandas",
+            storage="long",
+            chunk_hours=0,
+            report_file=None,
+        )
+        availability = {"buckets": [], "complete": True}
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor, "_get_json", return_value=availability
+        ) as mock_get_json, patch.object(etl_processor, "extract") as mock_extract:
+            with patch("main.save_run_report"):
+                report = run_etl(
+                    args,
+                    datetime(2024, 1, 1, 10, 10),
+                    datetime(2024, 1, 1, 10, 30),
+                    etl_processor,
+                    asset="wtg-02",
+                )
+
+        mock_extract.assert_not_called()
+        assert report.status == "success"
+        assert mock_get_json.call_args.kwargs["params"]["asset"] == "wtg-02"
+        assert etl_processor.last_extract_ok
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "availability", [{"buckets": []}, {"buckets": [], "complete": False}]
+    )
+    def test_run_etl_extracts_when_summary_is_incomplete(
+        self, etl_processor, availability
+    ):
+        from argparse import Namespace
+
+        from main import run_etl
+
+        args = Namespace(
+            fields="power",
+            page_size=25,
+            autotune=False,
+            source="api",
+            load_strategy="pandas",
+            storage="long",
+            chunk_hours=0,
+            report_file=None,
+        )
+        records = [{"ts": "2024-01-01T10:15:00", "power": 900.0}]
+
+        # Resumo sem horas, mas sem garantia de cobrir a origem: extrai mesmo assim
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor, "_get_json", return_value=availability
+        ), patch.object(
+            etl_processor, "extract", return_value=records
+        ) as mock_extract, patch.object(
+            etl_processor, "load_data", return_value=(1, 0)
+        ), patch(
+            "main.SessionLocal"
+        ), patch(
+            "main.save_run_report"
+        ):
+            report = run_etl(
+                args,
+                datetime(2024, 1, 1, 10, 10),
+                datetime(2024, 1, 1, 10, 30),
+                etl_processor,
+                asset="wtg-02",
+            )
+
+        mock_extract.assert_called_once()
+        assert report.status == "success"
+        assert report.rows_inserted == 1
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "start, end, expected",
+        [
+            ("2024-01-01", "2024-01-02", (datetime(2024, 1, 1), datetime(2024, 1, 2))),
+            (
+                "2024-01-01T10:05",
+                "2024-01-01T10:30:00",
+                (datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 10, 30)),
+            ),
+        ],
+    )
+    def test_main_parses_minute_windows(self, start, end, expected):
+        from main import main
+
+        argv = ["main.py", "--start-ts", start, "--end-ts", end]
+        with patch("sys.argv", argv), patch("main.run_assets") as mock_run:
+            main()
+
+        assert mock_run.call_args.args[1:3] == expected
+        assert mock_run.call_args.args[3] == ["default"]
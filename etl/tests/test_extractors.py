@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from extractors import DatabaseExtractor
+from main import DataETL
+from sqlalchemy import (
+    TIMESTAMP,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+)
+
+
+@pytest.fixture
+def source_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'source.db'}"
+    engine = create_engine(url)
+    metadata = MetaData()
+    asset = Table(
+        "asset",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String, nullable=False),
+    )
+    data = Table(
+        "data",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("asset_id", Integer, nullable=False),
+        Column("ts", TIMESTAMP, nullable=False),
+        Column("wind_speed", Float),
+        Column("power", Float),
+    )
+    metadata.create_all(engine)
+
+    start = datetime(2024, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(asset.insert(), [{"id": 1, "name": "wtg-01"}])
+        connection.execute(asset.insert(), [{"id": 2, "name": "wtg-02"}])
+        connection.execute(
+            data.insert(),
+            [
+                {
+                    "asset_id": 1,
+                    "ts": start + timedelta(minutes=minute),
+                    "wind_speed": float(minute),
+                    "power": None if minute % 7 == 0 else minute * 2.0,
+                }
+                for minute in range(60)
+            ],
+        )
+    engine.dispose()
+    return url
+
+
+class TestDatabaseExtractor:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("method", ["cursor", "copy"])
+    def test_extract_window(self, source_url, method):
+        extractor = DatabaseExtractor(source_url, method=method, batch_size=7)
+
+        frame = extractor.extract(
+            datetime(2024, 1, 1, 0, 10),
+            datetime(2024, 1, 1, 0, 30),
+            ["wind_speed", "power"],
+        )
+
+        assert list(frame.columns) == ["ts", "wind_speed", "power"]
+        assert len(frame) == 20
+        assert frame["ts"].iloc[0] == pd.Timestamp("2024-01-01 00:11")
+        assert frame["ts"].iloc[-1] == pd.Timestamp("2024-01-01 00:30")
+        assert frame["power"].isna().sum() == 3
+
+    @pytest.mark.unit
+    def test_filter_by_asset(self, source_url):
+        extractor = DatabaseExtractor(source_url, method="cursor")
+        window = (datetime(2024, 1, 1), datetime(2024, 1, 2), ["power"])
+
+        assert extractor.extract_assets() == ["wtg-01", "wtg-02"]
+        assert len(extractor.extract(*window, asset="wtg-01")) == 59
+        assert extractor.extract(*window, asset="wtg-02").empty
+
+    @pytest.mark.unit
+    def test_unknown_field(self, source_url):
+        extractor = DatabaseExtractor(source_url, method="cursor")
+
+        assert (
+            extractor.extract(
+                datetime(2024, 1, 1), datetime(2024, 1, 2), ["wind_speed; drop"]
+            )
+            is None
+        )
+
+    @pytest.mark.unit
+    def test_requires_source_url(self):
+        with pytest.raises(ValueError):
+            DatabaseExtractor(None)
+
+    @pytest.mark.unit
+    def test_same_transform_as_api_records(self, source_url):
+        extractor = DatabaseExtractor(source_url, method="cursor")
+        etl_processor = DataETL()
+        start_ts, end_ts = datetime(2024, 1, 1), datetime(2024, 1, 1, 0, 50)
+
+        frame = extractor.extract(start_ts, end_ts, ["wind_speed", "power"])
+        records = [
+            {
+                key: value
+                for key, value in {
+                    "ts": row.ts.isoformat(),
+                    "wind_speed": row.wind_speed,
+                    "power": row.power,
+                }.items()
+                if pd.notna(value)
+            }
+            for row in frame.itertuples()
+        ]
+
+        pd.testing.assert_frame_equal(
+            etl_processor.transform_data(frame),
+            etl_processor.transform_data(records),
+        )
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+from profiling import profile_run
+
+
+class TestProfileRun:
+
+    @pytest.mark.unit
+    def test_writes_profile_with_metadata(self, tmp_path):
+        with profile_run(str(tmp_path), "etl", {"arguments": {"page_size": 25}}):
+            sum(range(1000))
+
+        assert len(list(tmp_path.glob("*.prof"))) == 1
+        assert "cumulative" in next(tmp_path.glob("*.txt")).read_text()
+        metadata = json.loads(next(tmp_path.glob("*.json")).read_text())
+        assert metadata["arguments"] == {"page_size": 25}
+        assert metadata["duration_ms"] >= 0
+
+    @pytest.mark.unit
+    def test_writes_profile_when_run_fails(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with profile_run(str(tmp_path), "etl", {}):
+                raise RuntimeError("boom")
+
+        assert len(list(tmp_path.glob("*.prof"))) == 1
@@ -0,0 +1,159 @@
+import json
+from argparse import Namespace
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from reconcile import (
+    BucketMismatch,
+    Reconciler,
+    compare_checksums,
+    merge_windows,
+    run_reconcile,
+)
+from run_report import RunReport
+
+DAY = timedelta(days=1)
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 4)
+
+
+def _args(repair=False, report_file=None):
+    return Namespace(
+        fields="wind_speed",
+        bucket_hours=24,
+        repair=repair,
+        asset_workers=1,
+        source="api",
+        load_strategy="pandas",
+        storage="long",
+        chunk_hours=0,
+        memory_budget_mb=512,
+        page_size=25,
+        autotune=False,
+        report_file=report_file,
+    )
+
+
+def _mismatch(day: int) -> BucketMismatch:
+    return BucketMismatch(
+        start=START + day * DAY,
+        end=START + (day + 1) * DAY,
+        signals=["wind_speed_mean"],
+        source_points=144,
+        target_points=143,
+    )
+
+
+class TestCompareChecksums:
+
+    @pytest.mark.unit
+    def test_reports_divergent_buckets(self):
+        source = {
+            (START, "wind_speed_mean"): (144, 1000.0, 72000.0),
+            (START + DAY, "wind_speed_mean"): (144, 1000.0, 72000.0),
+            (START + DAY, "wind_speed_max"): (144, 2000.0, 140000.0),
+            (START + 2 * DAY, "wind_speed_mean"): (144, 1000.0, 72000.0),
+        }
+        target = {
+            # Diferença dentro da tolerância
+            (START, "wind_speed_mean"): (144, 1000.0 + 1e-9, 72000.0),
+            # Mesma soma com valores em outras posições
+            (START + DAY, "wind_speed_mean"): (144, 1000.0, 71000.0),
+            (START + DAY, "wind_speed_max"): (144, 2000.0, 140000.0),
+            (START + 2 * DAY, "wind_speed_mean"): (143, 990.0, 71000.0),
+            (START + 2 * DAY, "wind_speed_min"): (10, 1.0, 1.0),
+        }
+
+        mismatches = compare_checksums(source, target, DAY, START, END)
+
+        assert [(m.start, m.signals) for m in mismatches] == [
+            (START + DAY, ["wind_speed_mean"]),
+            (START + 2 * DAY, ["wind_speed_mean", "wind_speed_min"]),
+        ]
+        assert (mismatches[1].source_points, mismatches[1].target_points) == (144, 153)
+
+    @pytest.mark.unit
+    def test_buckets_are_clipped_to_the_window(self):
+        source = {(START, "power_mean"): (6, 60.0, 21.0)}
+
+        (mismatch,) = compare_checksums(
+            source, {}, DAY, START + timedelta(hours=12), START + timedelta(hours=13)
+        )
+
+        assert (mismatch.start, mismatch.end) == (
+            START + timedelta(hours=12),
+            START + timedelta(hours=13),
+        )
+
+    @pytest.mark.unit
+    def test_merge_windows_joins_consecutive_buckets(self):
+        assert merge_windows([_mismatch(0), _mismatch(1), _mismatch(3)]) == [
+            (START, START + 2 * DAY),
+            (START + 3 * DAY, START + 4 * DAY),
+        ]
+
+
+class TestReconciler:
+
+    @pytest.mark.unit
+    def test_requires_postgresql(self, test_session):
+        reconciler = Reconciler("sqlite://")
+
+        with pytest.raises(ValueError):
+            reconciler.source_checksums("default", START, END, ["wind_speed"])
+        with pytest.raises(ValueError):
+            reconciler.target_checksums(
+                test_session, "default", START, END, ["wind_speed"]
+            )
+
+    @pytest.mark.unit
+    def test_rejects_buckets_not_aligned_to_10_minutes(self):
+        with pytest.raises(ValueError):
+            Reconciler("sqlite://", bucket=timedelta(minutes=15))
+
+    @pytest.mark.unit
+    def test_repair_reprocesses_only_divergent_windows(self, tmp_path):
+        reconciler = Mock()
+        reconciler.reconcile.side_effect = [
+            [_mismatch(0), _mismatch(1), _mismatch(2)],
+            [],
+        ]
+        report = RunReport(top_allocations=0)
+        report.status = "success"
+        report_file = tmp_path / "reconcile.json"
+
+        with patch("reconcile.run_etl", return_value=report) as run_etl:
+            remaining = run_reconcile(
+                _args(repair=True, report_file=str(report_file)),
+                START,
+                END,
+                ["default"],
+                etl_processor=Mock(),
+                reconciler=reconciler,
+            )
+
+        assert remaining == {"default": []}
+        run_etl.assert_called_once()
+        assert run_etl.call_args.args[1:3] == (START, START + 3 * DAY)
+        assert run_etl.call_args.args[0].report_file is None
+        # Só a janela reprocessada é conferida de novo
+        assert reconciler.reconcile.call_args.args[2:4] == (START, START + 3 * DAY)
+
+        saved = json.loads(report_file.read_text())["default"]
+        assert len(saved["mismatches"]) == 3
+        assert saved["repaired"][0]["status"] == "success"
+        assert saved["remaining"] == []
+
+    @pytest.mark.unit
+    def test_without_repair_only_reports(self):
+        reconciler = Mock()
+        reconciler.reconcile.return_value = [_mismatch(1)]
+
+        with patch("reconcile.run_etl") as run_etl:
+            remaining = run_reconcile(
+                _args(), START, END, ["default"], Mock(), reconciler
+            )
+
+        run_etl.assert_not_called()
+        assert remaining == {"default": [_mismatch(1)]}
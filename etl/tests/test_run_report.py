@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from models.data import EtlRun
+from run_report import RunReport, percentile
+from services import EtlRunService
+
+
+class TestRunReport:
+
+    @pytest.mark.unit
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile(values, 100) == 100.0
+        assert percentile([], 50) is None
+
+    @pytest.mark.unit
+    def test_stages_and_http(self):
+        report = RunReport(top_allocations=3)
+        report.start()
+
+        with report.stage("extract") as stage:
+            stage.rows = 10
+            stage.bytes = 2048
+        report.record_http(0.010, 1024)
+        report.record_http(0.030, 1024)
+        report.record_load(inserted=7, updated=3)
+        report.finish()
+
+        result = report.to_dict()
+
+        assert result["status"] == "success"
+        assert result["stages"]["extract"]["rows"] == 10
+        assert result["stages"]["extract"]["rows_per_second"] is not None
+        assert result["http"]["requests"] == 2
+        assert result["http"]["bytes"] == 2048
+        assert result["http"]["latency_ms"]["max"] == 30.0
+        assert result["rows"] == {"inserted": 7, "updated": 3}
+        assert len(result["memory"]["top_allocations"]) <= 3
+        json.loads(report.to_json())
+
+    @pytest.mark.unit
+    def test_tracemalloc_disabled(self):
+        report = RunReport(top_allocations=0)
+        report.start()
+        report.finish(status="failed", error="boom")
+
+        result = report.to_dict()
+
+        assert result["status"] == "failed"
+        assert result["error"] == "boom"
+        assert result["memory"]["top_allocations"] == []
+
+    @pytest.mark.database
+    def test_save_report(self, test_session):
+        report = RunReport(parameters={"page_size": 25}, top_allocations=0)
+        report.start()
+        report.finish()
+
+        saved = EtlRunService().save_report(test_session, report)
+
+        assert saved is not None
+        stored = test_session.query(EtlRun).filter(EtlRun.id == saved.id).one()
+        assert stored.status == "success"
+        assert stored.report["parameters"] == {"page_size": 25}
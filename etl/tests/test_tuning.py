@@ -0,0 +1,266 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import httpx
+import pandas as pd
+import pytest
+from main import DataETL
+from tuning import AimdTuner, fetch_pages, retry_delay
+from windows import split_window
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 2)
+
+# 1 registro por minuto na janela (START, END]
+RECORDS = [
+    {"ts": (START + timedelta(minutes=i)).isoformat(), "power": float(i)}
+    for i in range(1, 24 * 60 + 1)
+]
+
+
+def _api_get(url, params=None, headers=None):
+    """Simula a paginação por offset da API sobre RECORDS."""
+    start = datetime.fromisoformat(params["start_ts"])
+    end = datetime.fromisoformat(params["end_ts"])
+    window = [
+        record
+        for record in RECORDS
+        if start < datetime.fromisoformat(record["ts"]) <= end
+    ]
+    size = params["page_size"]
+    offset = (params["page"] - 1) * size
+    response = Mock(status_code=200, headers={}, num_bytes_downloaded=0)
+    response.json.return_value = {
+        "data": window[offset : offset + size],
+        "paging": {"total_pages": -(-len(window) // size)},
+    }
+    return response
+
+
+def _status_error(status_code: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://x")
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return httpx.HTTPStatusError("erro", request=request, response=response)
+
+
+class TestAimdTuner:
+
+    @pytest.mark.unit
+    def test_additive_increase_after_round_of_successes(self):
+        tuner = AimdTuner(100, page_step=50, max_concurrency=4, target_latency=1.0)
+
+        tuner.observe(0.1)
+        assert (tuner.page_size, tuner.concurrency) == (150, 2)
+
+        # Com 2 requisições simultâneas a rodada tem 2 respostas
+        tuner.observe(0.1)
+        assert (tuner.page_size, tuner.concurrency) == (150, 2)
+        tuner.observe(0.1)
+        assert (tuner.page_size, tuner.concurrency) == (200, 3)
+
+    @pytest.mark.unit
+    def test_increase_stays_within_bounds(self):
+        tuner = AimdTuner(900, max_page_size=1000, page_step=100, max_concurrency=2)
+
+        for _ in range(20):
+            tuner.observe(0.0)
+
+        assert (tuner.page_size, tuner.concurrency) == (1000, 2)
+
+    @pytest.mark.unit
+    def test_multiplicative_decrease_on_slow_response_or_error(self):
+        tuner = AimdTuner(800, min_page_size=150, max_concurrency=8)
+        tuner.concurrency = 8
+
+        tuner.observe(5.0)
+        assert (tuner.page_size, tuner.concurrency) == (400, 4)
+
+        tuner.observe(0.0, ok=False)
+        assert (tuner.page_size, tuner.concurrency) == (200, 2)
+
+        tuner.observe(0.0, ok=False)
+        tuner.observe(0.0, ok=False)
+        assert (tuner.page_size, tuner.concurrency) == (150, 1)
+        assert tuner.decreases == 3
+
+    @pytest.mark.unit
+    def test_initial_page_size_clamped(self):
+        assert AimdTuner(5000, max_page_size=1000).page_size == 1000
+        assert AimdTuner(1, min_page_size=25).page_size == 25
+
+
+class TestFetchPages:
+
+    @staticmethod
+    def _fetch(start, end, page, size):
+        return _api_get(
+            None,
+            params={
+                "start_ts": start.isoformat(),
+                "end_ts": end.isoformat(),
+                "page": page,
+                "page_size": size,
+            },
+        ).json()
+
+    @pytest.mark.unit
+    def test_pages_returned_in_order(self):
+        tuner = AimdTuner(50, page_step=100, max_concurrency=4)
+        segments = split_window(START, END, timedelta(hours=6))
+
+        pages = fetch_pages(self._fetch, segments, tuner)
+
+        assert [record for page in pages for record in page] == RECORDS
+        assert tuner.increases > 0
+
+    @pytest.mark.unit
+    def test_in_flight_requests_bounded_by_concurrency(self):
+        tuner = AimdTuner(25, max_concurrency=3)
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def fetch(*args):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            try:
+                return self._fetch(*args)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        pages = fetch_pages(fetch, [(START, END)], tuner)
+
+        assert len(pages) == -(-len(RECORDS) // 25)
+        assert peak[0] <= 3
+
+    @pytest.mark.unit
+    def test_concurrency_shared_between_calls(self):
+        # Um fetch_pages por ativo, em paralelo, com o mesmo tuner
+        tuner = AimdTuner(25, max_concurrency=2)
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def fetch(*args):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.001)
+            try:
+                return self._fetch(*args)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        threads = [
+            threading.Thread(target=fetch_pages, args=(fetch, [(START, END)], tuner))
+            for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] <= 2
+        assert tuner.in_flight == 0
+
+    @pytest.mark.unit
+    def test_overload_retried_with_less_load(self):
+        tuner = AimdTuner(400, max_concurrency=4)
+        tuner.concurrency = 4
+        failures = iter([_status_error(503)])
+
+        def fetch(*args):
+            if args[2] == 2:
+                error = next(failures, None)
+                if error:
+                    raise error
+            return self._fetch(*args)
+
+        pages = fetch_pages(fetch, [(START, END)], tuner)
+
+        assert [record for page in pages for record in page] == RECORDS
+        assert tuner.decreases >= 1
+
+    @pytest.mark.unit
+    def test_retries_exhausted_or_not_retryable_raise(self):
+        def overloaded(*args):
+            raise _status_error(429)
+
+        def not_found(*args):
+            raise _status_error(404)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_pages(
+                overloaded, [(START, END)], AimdTuner(25), max_retries=2, backoff=0.01
+            )
+        with pytest.raises(httpx.HTTPStatusError):
+            fetch_pages(not_found, [(START, END)], AimdTuner(25))
+
+    @pytest.mark.unit
+    def test_retry_waits_for_retry_after(self):
+        failures = iter(
+            [_status_error(429, {"Retry-After": "0.3"}), _status_error(500)]
+        )
+        attempts = []
+
+        def fetch(*args):
+            attempts.append(time.monotonic())
+            error = next(failures, None)
+            if error:
+                raise error
+            return self._fetch(*args)
+
+        end = START + timedelta(hours=1)
+        pages = fetch_pages(fetch, [(START, end)], AimdTuner(100), backoff=0.01)
+
+        assert [record for page in pages for record in page] == RECORDS[:60]
+        assert attempts[1] - attempts[0] >= 0.3
+
+    @pytest.mark.unit
+    def test_retry_delay_backs_off_without_retry_after(self):
+        assert 2.0 <= retry_delay(_status_error(429, {"Retry-After": "2"}), 0) <= 2.5
+        for attempt in range(10):
+            delay = retry_delay(httpx.ReadTimeout("lento"), attempt, 0.5, 4.0)
+            assert 0 <= delay <= min(0.5 * 2**attempt, 4.0)
+
+    @pytest.mark.unit
+    def test_stop_requested_interrupts(self):
+        with pytest.raises(InterruptedError):
+            fetch_pages(self._fetch, [(START, END)], AimdTuner(25), lambda: True)
+
+
+class TestExtractDataTuned:
+
+    @pytest.mark.unit
+    def test_matches_sequential_extraction(self):
+        etl_processor = DataETL(autotune=True)
+
+        with patch.object(etl_processor, "api_key", "test-key"), patch.object(
+            etl_processor.client, "get", side_effect=_api_get
+        ):
+            records = etl_processor.extract_data(START, END, ["power"], 100)
+            tuned = etl_processor.extract(START, END, ["power"], 100)
+
+        assert etl_processor.last_extract_ok
+        assert isinstance(tuned, pd.DataFrame)
+        pd.testing.assert_frame_equal(
+            etl_processor.transform_data(tuned),
+            etl_processor.transform_data(records),
+            check_dtype=False,
+            check_freq=False,
+        )
+        assert etl_processor.tuner.page_size > 100
+
+    @pytest.mark.unit
+    def test_http_error_returns_empty(self):
+        etl_processor = DataETL(autotune=True, columnar=False)
+
+        with patch.object(etl_processor.client, "get", side_effect=_status_error(401)):
+            assert etl_processor.extract(START, END, ["power"]) == []
+
+        assert not etl_processor.last_extract_ok
@@ -0,0 +1,235 @@
+import heapq
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from settings import (
+    ETL_MAX_CONCURRENCY,
+    ETL_PAGE_SIZE_MAX,
+    ETL_PAGE_SIZE_MIN,
+    ETL_PAGE_SIZE_STEP,
+    ETL_RETRY_BACKOFF_MAX_SECONDS,
+    ETL_RETRY_BACKOFF_SECONDS,
+    ETL_TARGET_LATENCY_SECONDS,
+    ETL_TUNING_MAX_RETRIES,
+    get_logger,
+)
+
+logger = get_logger(__name__)
+
+# Respostas que indicam sobrecarga: a requisição é repetida com menos carga
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+Fetch = Callable[[datetime, datetime, int, int], Dict[str, Any]]
+
+
+def retry_delay(
+    error: httpx.HTTPError,
+    attempt: int,
+    backoff: float = ETL_RETRY_BACKOFF_SECONDS,
+    max_backoff: float = ETL_RETRY_BACKOFF_MAX_SECONDS,
+) -> float:
+    """Segundos de espera antes de repetir a requisição.
+
+    Respeita o Retry-After da resposta (enviado pela limitação da API), com
+    um pequeno jitter para as threads não voltarem juntas; sem ele, usa uma
+    espera exponencial com jitter completo.
+    """
+    retry_after = None
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("Retry-After")
+    try:
+        return float(retry_after) + random.uniform(0, backoff)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(backoff * 2**attempt, max_backoff))
+
+
+class AimdTuner:
+    """Ajusta o tamanho de página e as requisições simultâneas (AIMD).
+
+    Cada resposta dentro de ``target_latency`` conta como sucesso; após uma
+    rodada de sucessos (tantos quanto a concorrência atual) a página cresce
+    ``page_step`` registros e a concorrência uma requisição. Uma resposta
+    lenta, um erro de sobrecarga ou um timeout reduzem os dois pela metade.
+    Os valores ficam sempre dentro dos limites configurados e o ajuste é
+    compartilhado entre threads e execuções; ``acquire``/``release`` limitam
+    a ``concurrency`` o total de requisições em andamento de todos os ativos.
+    """
+
+    def __init__(
+        self,
+        page_size: int,
+        min_page_size: int = ETL_PAGE_SIZE_MIN,
+        max_page_size: int = ETL_PAGE_SIZE_MAX,
+        page_step: int = ETL_PAGE_SIZE_STEP,
+        max_concurrency: int = ETL_MAX_CONCURRENCY,
+        target_latency: float = ETL_TARGET_LATENCY_SECONDS,
+    ):
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.page_step = page_step
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.page_size = min(max(page_size, min_page_size), max_page_size)
+        self.concurrency = 1
+        self.increases = 0
+        self.decreases = 0
+        self.in_flight = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+        self._slots = threading.Condition(self._lock)
+
+    def acquire(self, stop_requested: Callable[[], bool] = lambda: False) -> None:
+        """Espera uma vaga entre as requisições em andamento."""
+        with self._slots:
+            while self.in_flight >= self.concurrency:
+                if stop_requested():
+                    raise InterruptedError("Extração interrompida")
+                self._slots.wait(0.5)
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    def observe(self, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            if not ok or seconds > self.target_latency:
+                self._successes = 0
+                page_size = max(self.page_size // 2, self.min_page_size)
+                concurrency = max(self.concurrency // 2, 1)
+                if (page_size, concurrency) != (self.page_size, self.concurrency):
+                    self.page_size, self.concurrency = page_size, concurrency
+                    self.decreases += 1
+                    logger.info(f"Carga reduzida: {self.describe()}")
+                return
+
+            self._successes += 1
+            if self._successes < self.concurrency:
+                return
+
+            self._successes = 0
+            page_size = min(self.page_size + self.page_step, self.max_page_size)
+            concurrency = min(self.concurrency + 1, self.max_concurrency)
+            if (page_size, concurrency) != (self.page_size, self.concurrency):
+                self.page_size, self.concurrency = page_size, concurrency
+                self.increases += 1
+                self._slots.notify_all()
+                logger.debug(f"Carga aumentada: {self.describe()}")
+
+    def describe(self) -> str:
+        return f"page_size={self.page_size}, concorrência={self.concurrency}"
+
+
+def fetch_pages(
+    fetch: Fetch,
+    segments: List[Tuple[datetime, datetime]],
+    tuner: AimdTuner,
+    stop_requested: Callable[[], bool] = lambda: False,
+    max_retries: int = ETL_TUNING_MAX_RETRIES,
+    backoff: float = ETL_RETRY_BACKOFF_SECONDS,
+) -> List[list]:
+    """Busca todas as páginas das janelas ``segments`` em paralelo.
+
+    A primeira página de cada janela usa o tamanho de página atual do
+    ``tuner`` e revela o total de páginas; as demais são buscadas com o mesmo
+    tamanho, mantendo a paginação por offset consistente. No máximo
+    ``tuner.concurrency`` requisições ficam em andamento, somando as das
+    outras chamadas que compartilham o ``tuner``. Retorna os dados de
+    cada página, na ordem das janelas; erros não recuperáveis são propagados
+    e uma interrupção levanta ``InterruptedError``. Páginas com erro de
+    sobrecarga voltam à fila só depois da espera de ``retry_delay``.
+    """
+    pages: Dict[Tuple[int, int], list] = {}
+    page_counts: Dict[int, int] = {}
+    page_sizes: Dict[int, int] = {}
+    pending = deque((segment, 1, 0) for segment in range(len(segments)))
+    # Repetições aguardando a espera: (horário liberado, janela, página, tentativa)
+    delayed: List[Tuple[float, int, int, int]] = []
+
+    def request(segment: int, page: int) -> Tuple[Dict[str, Any], float]:
+        # A vaga é do tuner: o limite vale para todos os ativos em paralelo
+        tuner.acquire(stop_requested)
+        try:
+            start = time.perf_counter()
+            body = fetch(*segments[segment], page, page_sizes[segment])
+            return body, time.perf_counter() - start
+        finally:
+            tuner.release()
+
+    with ThreadPoolExecutor(
+        max_workers=tuner.max_concurrency, thread_name_prefix="etl-fetch"
+    ) as executor:
+        in_flight = {}
+        try:
+            while pending or in_flight or delayed:
+                if stop_requested():
+                    raise InterruptedError("Extração interrompida")
+
+                now = time.monotonic()
+                while delayed and delayed[0][0] <= now:
+                    _, segment, page, attempt = heapq.heappop(delayed)
+                    pending.appendleft((segment, page, attempt))
+
+                while pending and len(in_flight) < tuner.concurrency:
+                    segment, page, attempt = pending.popleft()
+                    if page == 1:
+                        page_sizes[segment] = tuner.page_size
+                    future = executor.submit(request, segment, page)
+                    in_flight[future] = (segment, page, attempt)
+
+                timeout = max(delayed[0][0] - now, 0) if delayed else None
+                if not in_flight:
+                    # Só há repetições aguardando: espera em partes para
+                    # atender a um pedido de interrupção
+                    time.sleep(min(timeout, 1.0))
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    segment, page, attempt = in_flight.pop(future)
+                    try:
+                        body, seconds = future.result()
+                    except (httpx.HTTPStatusError, httpx.TimeoutException) as e:
+                        retryable = isinstance(e, httpx.TimeoutException) or (
+                            e.response.status_code in RETRYABLE_STATUS
+                        )
+                        if not retryable or attempt >= max_retries:
+                            raise
+                        tuner.observe(0.0, ok=False)
+                        delay = retry_delay(e, attempt, backoff)
+                        logger.warning(
+                            f"Requisição repetida em {delay:.1f}s após {e!r}"
+                        )
+                        heapq.heappush(
+                            delayed,
+                            (time.monotonic() + delay, segment, page, attempt + 1),
+                        )
+                        continue
+
+                    tuner.observe(seconds)
+                    pages[(segment, page)] = body.get("data", [])
+                    if page == 1:
+                        page_counts[segment] = body.get("paging", {}).get(
+                            "total_pages", 1
+                        )
+                        pending.extend(
+                            (segment, next_page, 0)
+                            for next_page in range(2, page_counts[segment] + 1)
+                        )
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    return [
+        pages[(segment, page)]
+        for segment in range(len(segments))
+        for page in range(1, max(page_counts[segment], 1) + 1)
+    ]
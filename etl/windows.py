@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Os dados agregados são gravados em intervalos de 10 minutos. A janela
+# (início, fim] da API com limites alinhados produz exatamente os intervalos
+# rotulados de início até fim - 10 min (resample com closed="right").
+BUCKET = timedelta(minutes=10)
+HOUR = timedelta(hours=1)
+
+
+def floor_bucket(ts: datetime) -> datetime:
+    """Arredonda ``ts`` para baixo até o limite de 10 minutos."""
+    return ts.replace(minute=ts.minute - ts.minute % 10, second=0, microsecond=0)
+
+
+def ceil_bucket(ts: datetime) -> datetime:
+    """Arredonda ``ts`` para cima até o limite de 10 minutos."""
+    floored = floor_bucket(ts)
+    return floored if floored == ts else floored + BUCKET
+
+
+def align_window(start_ts: datetime, end_ts: datetime) -> Tuple[datetime, datetime]:
+    """Expande a janela para limites de 10 minutos, cobrindo intervalos inteiros."""
+    return floor_bucket(start_ts), ceil_bucket(end_ts)
+
+
+def split_window(
+    start_ts: datetime, end_ts: datetime, step: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """Divide (início, fim] em janelas consecutivas de até ``step``."""
+    windows = []
+    while start_ts < end_ts:
+        windows.append((start_ts, min(start_ts + step, end_ts)))
+        start_ts = windows[-1][1]
+    return windows
+
+
+def split_window_by_rows(
+    start_ts: datetime,
+    end_ts: datetime,
+    step: timedelta,
+    hourly_rows: Dict[datetime, int],
+    max_rows: int,
+) -> List[Tuple[datetime, datetime]]:
+    """Divide (início, fim] em janelas de até ``step`` com no máximo
+    ``max_rows`` registros estimados cada.
+
+    ``hourly_rows`` traz os registros da origem por hora (rótulo no início da
+    hora), considerados espalhados por igual dentro dela; horas ausentes
+    contam como vazias, então sem contagens o resultado é o de
+    ``split_window``.
+    """
+    windows = []
+    for window_start, window_end in split_window(start_ts, end_ts, step):
+        part_start, part_rows, cursor = window_start, 0.0, window_start
+        while cursor < window_end:
+            hour = cursor.replace(minute=0, second=0, microsecond=0)
+            segment_end = min(hour + HOUR, window_end)
+            rate = hourly_rows.get(hour, 0) / HOUR.total_seconds()
+            rows = rate * (segment_end - cursor).total_seconds()
+            if part_rows + rows <= max_rows:
+                part_rows += rows
+                cursor = segment_end
+                continue
+
+            # Corta a parte no ponto em que atinge max_rows
+            cut = cursor + timedelta(seconds=(max_rows - part_rows) / rate)
+            cut = max(cut, cursor + timedelta(microseconds=1))
+            windows.append((part_start, cut))
+            part_start, part_rows, cursor = cut, 0.0, cut
+        if part_start < window_end:
+            windows.append((part_start, window_end))
+    return windows
+
+
+def changed_windows(
+    timestamps: Iterable[datetime], until: datetime
+) -> List[Tuple[datetime, datetime]]:
+    """Janelas (início, fim] que cobrem os intervalos de 10 minutos com
+    registros alterados em ``timestamps``, só até ``until``.
+
+    Intervalos consecutivos são unidos numa única janela; os que terminam
+    depois de ``until`` ainda não foram processados e ficam de fora.
+    """
+    ends = sorted({ceil_bucket(ts) for ts in timestamps})
+    windows: List[Tuple[datetime, datetime]] = []
+    for end in ends:
+        if end > until:
+            break
+        if windows and windows[-1][1] == end - BUCKET:
+            windows[-1] = (windows[-1][0], end)
+        else:
+            windows.append((end - BUCKET, end))
+    return windows
+
+
+def next_window(
+    watermark: Optional[datetime],
+    now: datetime,
+    lag: timedelta,
+    max_window: timedelta,
+    initial_lookback: timedelta,
+) -> Optional[Tuple[datetime, datetime]]:
+    """Calcula a próxima janela com intervalos de 10 minutos já fechados.
+
+    ``watermark`` é o rótulo do último intervalo gravado no destino (ou None
+    se o destino estiver vazio). Um intervalo só é considerado fechado depois
+    de ``lag`` do seu fim, para tolerar atrasos na origem. Retorna None se
+    nenhum intervalo novo fechou.
+    """
+    end = floor_bucket(now - lag)
+    if watermark is None:
+        start = end - initial_lookback
+    else:
+        start = floor_bucket(watermark) + BUCKET
+
+    if start >= end:
+        return None
+
+    # Em atraso, processa a janela em partes e alcança nos próximos ciclos
+    return start, min(end, start + max_window)